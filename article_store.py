@@ -0,0 +1,205 @@
+import csv
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+from cache_paths import cache_path
+
+# 링크 비교 시 무시하는 추적용 쿼리 파라미터
+TRACKING_PARAMS = {"utm_source", "utm_medium", "utm_campaign", "utm_term", "utm_content",
+                   "gclid", "fbclid", "ocid", "cmpid", "ref"}
+
+
+def canonical_link(link):
+    """스킴/호스트 소문자, 추적 파라미터·프래그먼트·끝 슬래시 제거한 비교용 링크"""
+    if not link:
+        return ""
+    parts = urlsplit(link.strip())
+    query = urlencode(sorted((k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+                             if k.lower() not in TRACKING_PARAMS))
+    path = parts.path.rstrip("/") or "/"
+    return urlunsplit((parts.scheme.lower() or "https", parts.netloc.lower(), path, query, ""))
+
+
+def _sha1(path):
+    digest = hashlib.sha1()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class ArticleStore:
+    """모든 수집기가 공유하는 기사 저장소 (SQLite)
+
+    - canonical_link 유니크 인덱스로 중복 확인이 O(1) 조회
+    - published 인덱스로 최신순 내보내기
+    - upsert_many()는 한 트랜잭션으로 묶어 저장
+    - 기존 CSV/XLSX 파일은 export_file()로 만들어지는 결과물 (import_csv()는 저장소에 없는 행만 되가져옴)
+    - 내보내기는 별도 읽기 연결(WAL)로 흘려 읽으므로 같은 프로세스의 다른 수집기 저장을 막지 않음
+    """
+
+    CORE_FIELDS = ("source", "link", "title", "title_ko", "published", "collected")
+
+    def __init__(self, path=None):
+        self.path = path or cache_path("articles.sqlite3")
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript("""
+            CREATE TABLE IF NOT EXISTS articles (
+                id INTEGER PRIMARY KEY,
+                canonical_link TEXT NOT NULL,
+                source TEXT, link TEXT, title TEXT, title_ko TEXT,
+                published TEXT, collected TEXT, extra TEXT
+            );
+            CREATE UNIQUE INDEX IF NOT EXISTS idx_articles_link ON articles(canonical_link);
+            CREATE INDEX IF NOT EXISTS idx_articles_published ON articles(published);
+            CREATE INDEX IF NOT EXISTS idx_articles_source ON articles(source, published);
+            CREATE TABLE IF NOT EXISTS exports (file TEXT PRIMARY KEY, sha1 TEXT);
+        """)
+        self._db.commit()
+
+    def exists(self, link):
+        with self._lock:
+            row = self._db.execute("SELECT 1 FROM articles WHERE canonical_link = ?",
+                                   (canonical_link(link),)).fetchone()
+        return row is not None
+
+    def known_links(self, links):
+        """주어진 링크 중 이미 저장된 것의 집합 (인덱스 조회만 수행)"""
+        return {link for link in links if self.exists(link)}
+
+    def count(self, source=None):
+        with self._lock:
+            if source is None:
+                return self._db.execute("SELECT COUNT(*) FROM articles").fetchone()[0]
+            return self._db.execute("SELECT COUNT(*) FROM articles WHERE source = ?", (source,)).fetchone()[0]
+
+    def upsert_many(self, articles):
+        """기사 dict 목록을 한 트랜잭션으로 저장 (같은 링크는 내용이 바뀐 경우만 갱신) → (신규 건수, 갱신 건수)"""
+        new = updated = 0
+        with self._lock, self._db:
+            for article in articles:
+                key = canonical_link(article.get("link"))
+                if not key:
+                    continue
+                extra = {k: v for k, v in article.items() if k not in self.CORE_FIELDS}
+                values = [article.get(f) for f in self.CORE_FIELDS] + [json.dumps(extra, ensure_ascii=False)]
+                cur = self._db.execute("""
+                    INSERT OR IGNORE INTO articles (source, link, title, title_ko, published, collected, extra, canonical_link)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                """, values + [key])
+                if cur.rowcount:
+                    new += 1
+                    continue
+                cur = self._db.execute("""
+                    UPDATE articles SET source = ?, link = ?, title = ?, title_ko = ?,
+                           published = ?, collected = ?, extra = ?
+                    WHERE canonical_link = ? AND NOT (source IS ? AND link IS ? AND title IS ? AND title_ko IS ?
+                                                      AND published IS ? AND collected IS ? AND extra IS ?)
+                """, values + [key] + values)
+                updated += cur.rowcount
+        return new, updated
+
+    def insert_new(self, articles):
+        """이미 있는 링크는 건드리지 않고 새 기사만 추가. 신규 건수를 반환"""
+        new = 0
+        with self._lock, self._db:
+            for article in articles:
+                key = canonical_link(article.get("link"))
+                if not key:
+                    continue
+                extra = {k: v for k, v in article.items() if k not in self.CORE_FIELDS}
+                cur = self._db.execute("""
+                    INSERT OR IGNORE INTO articles (source, link, title, title_ko, published, collected, extra, canonical_link)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                """, [article.get(f) for f in self.CORE_FIELDS] + [json.dumps(extra, ensure_ascii=False), key])
+                new += cur.rowcount
+        return new
+
+    def iter_articles(self, source=None, newest_first=True):
+        """저장된 기사를 발행일 순으로 (읽기 전용 연결 하나로 읽으므로 도중에 저장돼도 결과가 섞이지 않음)"""
+        order = "DESC" if newest_first else "ASC"
+        sql = "SELECT source, link, title, title_ko, published, collected, extra FROM articles"
+        params = ()
+        if source is not None:
+            sql += " WHERE source = ?"
+            params = (source,)
+        sql += f" ORDER BY published {order}, id {order}"
+        db = sqlite3.connect(self.path)
+        try:
+            for row in db.execute(sql, params):
+                article = dict(zip(self.CORE_FIELDS, row[:6]))
+                article.update(json.loads(row[6] or "{}"))
+                yield article
+        finally:
+            db.close()
+
+    def latest(self, source=None):
+        """가장 최근에 발행된 기사 (없으면 None)"""
+        return next(self.iter_articles(source=source), None)
+
+    def export_rows(self, columns, source=None):
+        """{내보낼 열 이름: 저장 필드} 매핑대로 행 dict를 생성"""
+        for article in self.iter_articles(source=source):
+            yield {col: article.get(field) for col, field in columns.items()}
+
+    def export_file(self, file_name, columns, source=None):
+        """저장소에서 바로 흘려 보내며 기록 (행 전체를 메모리에 올리지 않음) → 기록한 행 수
+
+        형식은 확장자로 정해지고, 기록한 파일의 지문을 남겨 import_csv()가 같은 파일을 다시 읽지 않게 함
+        """
+        from exporters import export
+        count = export(file_name, self.export_rows(columns, source), columns)
+        self._remember(file_name, _sha1(file_name))
+        return count
+
+    def import_csv(self, file_name, columns, source, transform=None):
+        """내보낸 CSV에 있고 저장소에 없는 행을 가져옴 → 가져온 건수
+
+        캐시가 비었거나(CI 첫 실행) 다른 실행이 CSV를 갱신한 경우 대비 - 마지막으로 내보내거나 가져온 파일과
+        지문이 같으면 읽지 않음. 파일은 최신순이므로 뒤에서부터 넣어야 내보낼 때 같은 순서가 유지됨.
+        transform(기사 dict)은 고친 dict 또는 건너뛸 때 None을 돌려줌.
+        """
+        if not os.path.exists(file_name):
+            return 0
+        digest = _sha1(file_name)
+        with self._lock:
+            row = self._db.execute("SELECT sha1 FROM exports WHERE file = ?", (os.path.abspath(file_name),)).fetchone()
+        if row and row[0] == digest:
+            return 0
+        articles = []
+        with open(file_name, newline='', encoding='utf-8-sig') as f:
+            for row in csv.DictReader(f):
+                article = {"source": source}
+                article.update({field: row.get(col) for col, field in columns.items()})
+                article = transform(article) if transform else article
+                if article:
+                    articles.append(article)
+        new = self.insert_new(articles[::-1])
+        self._remember(file_name, digest)
+        return new
+
+    def _remember(self, file_name, digest):
+        with self._lock, self._db:
+            self._db.execute("INSERT OR REPLACE INTO exports (file, sha1) VALUES (?, ?)",
+                             (os.path.abspath(file_name), digest))
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+_shared = None
+_shared_lock = threading.Lock()
+
+def get_article_store():
+    """프로세스 전체에서 하나의 기사 저장소를 공유"""
+    global _shared
+    with _shared_lock:
+        if _shared is None:
+            _shared = ArticleStore()
+        return _shared
@@ -0,0 +1,774 @@
+"""네트워크 없이 수집기 성능을 재는 벤치마크
+
+- 로컬 대역 서버(StandInServer)가 Google News RSS, Federal Register API/원문, Cellar SPARQL,
+  일본 디지털청 목록, OpenAI RSS, 번역/링크 해독 응답을 흉내 냄 (지연/오류 주입 가능)
+- 수집기는 시나리오마다 별도 프로세스에서 실행하고, 공유 HTTP 클라이언트의 요청을 대역 서버로 돌림
+- 시나리오별 벽시계 시간, 요청 수, 최대 RSS, 단계별 누적 시간을 출력하고 JSONL로 누적 저장해
+  이전 실행과 비교
+
+    python benchmark.py                         # 기본 규모로 전체 시나리오
+    python benchmark.py --large                 # 기관 2,000개 / 관보 100,000건 / 일본 1,000페이지
+    python benchmark.py --scenario ict_policy --scale ict_policy=500 --latency 80 --error-rate 0.02
+"""
+import argparse
+import json
+import math
+import os
+import random
+import re
+import resource
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import zlib
+from bisect import bisect_left
+from collections import namedtuple
+from datetime import date, datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+from instrumentation import METRICS, stage
+
+RESULT_MARKER = "BENCH_RESULT "
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+
+Scenario = namedtuple("Scenario", "runner default_scale large_scale description")
+
+ICT_PHRASES = ["AI semiconductor strategy", "6G network roadmap", "cybersecurity framework for cloud",
+               "quantum computing investment", "data center and AI infrastructure", "digital platform regulation"]
+FR_AGENCIES = ["Commerce Department", "Federal Communications Commission", "Energy Department",
+               "Homeland Security Department", "Treasury Department", "Executive Office of the President"]
+FR_TYPES = [("PRESDOCU", "Presidential Document"), ("RULE", "Rule"), ("PRORULE", "Proposed Rule"), ("NOTICE", "Notice")]
+FR_RESULT_LIMIT = 10000
+
+
+# ---------------------------------------------------------------------------
+# 대역 서버
+# ---------------------------------------------------------------------------
+
+def _crc(text):
+    return zlib.crc32(text.encode("utf-8"))
+
+
+class StandInServer(ThreadingHTTPServer):
+    """실제 호스트 대신 응답하는 로컬 HTTP 서버 (경로 첫 부분이 원래 호스트)"""
+
+    daemon_threads = True
+
+    def __init__(self, port=0, latency_ms=0, jitter_ms=0, error_rate=0.0, seed=0, fixtures=None):
+        super().__init__(("127.0.0.1", port), StandInHandler)
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.fixtures = fixtures
+        self.scale = {}
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._fr_cache = {}
+        self.stats = {}
+
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def start(self):
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def total_requests(self):
+        with self._lock:
+            return sum(h["requests"] for h in self.stats.values())
+
+    def record(self, host, status, size):
+        with self._lock:
+            h = self.stats.setdefault(host, {"requests": 0, "errors": 0, "bytes": 0})
+            h["requests"] += 1
+            h["errors"] += status >= 500
+            h["bytes"] += size
+
+    def delay_and_fail(self):
+        """주입할 지연 시간(초)과 오류 여부"""
+        with self._lock:
+            delay = (self.latency_ms + self._rng.uniform(0, self.jitter_ms)) / 1000.0
+            fail = self._rng.random() < self.error_rate
+        return delay, fail
+
+    def fr_documents(self):
+        n = self.scale.get("fr_docs", 5000)
+        if n not in self._fr_cache:
+            self._fr_cache[n] = _synth_fr_documents(n)
+        return self._fr_cache[n]
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        self._handle(b"")
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        self._handle(self.rfile.read(length) if length else b"")
+
+    def _handle(self, body):
+        parts = urlsplit(self.path)
+        host, _, path = parts.path.lstrip("/").partition("/")
+        path = "/" + path
+        query = parse_qs(parts.query, keep_blank_values=True)
+        if body and "application/x-www-form-urlencoded" in (self.headers.get("Content-Type") or ""):
+            for k, v in parse_qs(body.decode("utf-8"), keep_blank_values=True).items():
+                query.setdefault(k, []).extend(v)
+
+        delay, fail = self.server.delay_and_fail()
+        if delay:
+            time.sleep(delay)
+        if fail:
+            return self._send(host, 503, "text/plain", b"injected error")
+        try:
+            status, content_type, payload, headers = self._route(host, path, query, body)
+        except Exception as e:
+            status, content_type, payload, headers = 500, "text/plain", str(e).encode("utf-8"), {}
+        self._send(host, status, content_type, payload, headers)
+
+    def _send(self, host, status, content_type, payload, headers=None):
+        self.server.record(host, status, len(payload))
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(payload)))
+        for k, v in (headers or {}).items():
+            self.send_header(k, v)
+        self.end_headers()
+        if payload and self.command != "HEAD":
+            self.wfile.write(payload)
+
+    def _fixture(self, host, path):
+        if not self.server.fixtures:
+            return None
+        file_path = os.path.join(self.server.fixtures, host, path.lstrip("/"))
+        if os.path.isfile(file_path):
+            with open(file_path, "rb") as f:
+                return f.read()
+        return None
+
+    def _route(self, host, path, query, body):
+        recorded = self._fixture(host, path)
+        if recorded is not None:
+            kind = "application/json" if path.endswith(".json") else "application/xml" if path.endswith((".xml", ".rss")) else "text/html"
+            return 200, kind, recorded, {}
+
+        first = lambda key, default=None: (query.get(key) or [default])[0]
+        if host == "news.google.com" and path == "/__decode":
+            url = first("url", "")
+            return 200, "application/json", json.dumps({"status": True, "decoded_url": f"https://example.org/article/{_crc(url):08x}"}).encode(), {}
+        if host == "news.google.com" and path.startswith("/rss"):
+            return 200, "application/rss+xml", _synth_google_rss(first("q", "")), {}
+        if host == "translate.googleapis.com":
+            text, dest = first("q", ""), first("tl", "ko")
+            return 200, "text/plain; charset=utf-8", "\n".join(f"[{dest}] {line}" for line in text.split("\n")).encode("utf-8"), {}
+        if host == "www.federalregister.gov" and path.startswith("/api/v1/documents"):
+            return 200, "application/json", _fr_api(self.server.fr_documents(), query), {}
+        if host == "www.federalregister.gov" and path.startswith("/documents/full_text/"):
+            return 200, "text/plain; charset=utf-8", _synth_fr_text(path), {}
+        if host == "publications.europa.eu" and path.startswith("/webapi/rdf/sparql"):
+            return 200, "application/sparql-results+json", _sparql(first("query", ""), self.server.scale.get("cellar_rows", 500)), {}
+        if host == "www.whitehouse.gov" and path.startswith("/news"):
+            return 200, "text/html; charset=utf-8", _synth_whitehouse_news(self.server.scale.get("whitehouse_articles", 3)), {}
+        if host == "api-inference.huggingface.co" and path.startswith("/models/"):
+            return 200, "application/json", _hf_generate(json.loads(body.decode("utf-8"))), {}
+        if host == "european-union.europa.eu" and path.startswith("/news-and-events/news-and-stories"):
+            return 200, "text/html; charset=utf-8", _synth_eu_news_page(int(first("page", "0")), self.server.scale.get("eu_news_pages", 60)), {}
+        if host == "www.digital.go.jp" and path.startswith("/news"):
+            return 200, "text/html; charset=utf-8", _synth_japan_page(int(first("page", "1")), self.server.scale.get("japan_pages", 188)), {}
+        if host == "openai.com" and path.endswith("rss.xml"):
+            payload = _synth_openai_rss(self.server.scale.get("openai_items", 15))
+            etag = f'"{_crc(payload.decode("utf-8")):08x}"'
+            if self.headers.get("If-None-Match") == etag:
+                return 304, "application/rss+xml", b"", {"ETag": etag}
+            return 200, "application/rss+xml", payload, {"ETag": etag}
+        return 404, "text/plain", b"no stand-in route", {}
+
+
+def _rss(items):
+    entries = "".join(
+        f"<item><title>{title}</title><link>{link}</link><pubDate>{pub}</pubDate></item>"
+        for title, link, pub in items)
+    return f'<?xml version="1.0" encoding="UTF-8"?><rss version="2.0"><channel><title>stand-in</title>{entries}</channel></rss>'.encode("utf-8")
+
+
+def _synth_google_rss(q):
+    seed = _crc(q)
+    source = (re.search(r"site:(\S+)", q) or re.search(r"(\S+)", q or "x")).group(1)
+    items = []
+    for i in range(5):
+        phrase = ICT_PHRASES[(seed + i) % len(ICT_PHRASES)]
+        day = date(2025, 1, 1) + timedelta(days=(seed + i * 7) % 360)
+        items.append((f"{source} announces {phrase} #{(seed + i) % 997} - {source}",
+                      f"https://news.google.com/rss/articles/CBMi{seed:08x}{i}",
+                      day.strftime("%a, %d %b %Y 09:00:00 GMT")))
+    return _rss(items)
+
+
+def _synth_openai_rss(n):
+    day = date(2026, 1, 31)
+    return _rss((f"Introducing {ICT_PHRASES[i % len(ICT_PHRASES)]} update {i}",
+                 f"https://openai.com/index/stand-in-{i}/",
+                 (day - timedelta(days=i)).strftime("%a, %d %b %Y 10:00:00 GMT")) for i in range(n))
+
+
+def _synth_fr_documents(n):
+    docs = []
+    for i in range(n):
+        day = date(2025, 1, 1) + timedelta(days=i * 365 // max(n, 1))
+        number = f"2025-{i:06d}"
+        code, type_name = FR_TYPES[i % len(FR_TYPES)]
+        docs.append({
+            "title": f"{ICT_PHRASES[i % len(ICT_PHRASES)].title()} notice {i}",
+            "publication_date": day.isoformat(),
+            "type": type_name,
+            "_type_code": code,
+            "_executive_order": code == "PRESDOCU" and i % 3 == 0,
+            "agency_names": [FR_AGENCIES[i % len(FR_AGENCIES)]],
+            "document_number": number,
+            "abstract": f"Measures on {ICT_PHRASES[(i + 1) % len(ICT_PHRASES)]}.",
+            "html_url": f"https://www.federalregister.gov/documents/{day:%Y/%m/%d}/{number}/stand-in",
+            "body_html_url": f"https://www.federalregister.gov/documents/full_text/html/{day:%Y/%m/%d}/{number}.html",
+            "raw_text_url": f"https://www.federalregister.gov/documents/full_text/text/{day:%Y/%m/%d}/{number}.txt",
+        })
+    return {"docs": docs, "dates": [d["publication_date"] for d in docs]}
+
+
+def _fr_api(dataset, query):
+    docs, dates = dataset["docs"], dataset["dates"]
+    first = lambda key, default=None: (query.get(key) or [default])[0]
+    lo = bisect_left(dates, first("conditions[publication_date][gte]", "0000-00-00"))
+    hi = bisect_left(dates, first("conditions[publication_date][lt]", "9999-99-99"))
+    year = first("conditions[publication_date][year]")
+    if year:
+        lo, hi = bisect_left(dates, f"{year}-01-01"), bisect_left(dates, f"{int(year) + 1}-01-01")
+    selected = docs[lo:hi]
+    types = set(query.get("conditions[type][]") or [])
+    if types:
+        selected = [d for d in selected if d["_type_code"] in types]
+    if first("conditions[presidential_document_type]") == "executive_order":
+        selected = [d for d in selected if d["_executive_order"]]
+    if first("order", "newest") != "oldest":
+        selected = selected[::-1]
+
+    per_page = int(first("per_page", "20"))
+    page = int(first("page", "1"))
+    available = selected[:FR_RESULT_LIMIT]   # 실제 API처럼 한 검색 결과는 10,000건까지만
+    fields = query.get("fields[]")
+    results = [{k: v for k, v in d.items() if not k.startswith("_") and (not fields or k in fields)}
+               for d in available[(page - 1) * per_page: page * per_page]]
+    return json.dumps({"count": len(selected), "total_pages": max(1, math.ceil(len(available) / per_page)),
+                       "results": results}).encode("utf-8")
+
+
+def _synth_fr_text(path):
+    seed = _crc(path)
+    paragraphs = [f"Sec. {i}. Policy on {ICT_PHRASES[(seed + i) % len(ICT_PHRASES)]}, including Artificial Intelligence, "
+                  f"5G and cloud native systems. " * 4 for i in range(40)]
+    return "\n\n".join(paragraphs).encode("utf-8")
+
+
+def _sparql(query, total):
+    limit = int((re.search(r"LIMIT\s+(\d+)", query, re.I) or re.search(r"(\d+)", "100")).group(1))
+    offset = int((re.search(r"OFFSET\s+(\d+)", query, re.I) or re.search(r"(\d+)", "0")).group(1))
+    since = re.search(r'>=\s*"(\d{4}-\d{2}-\d{2})"\^\^xsd:date', query)
+    until = re.search(r'<\s*"(\d{4}-\d{2}-\d{2})"\^\^xsd:date', query)
+    rows = []
+    for i in range(total):
+        day = date(2025, 12, 31) - timedelta(days=i * 365 // max(total, 1))
+        if (since and day.isoformat() < since.group(1)) or (until and day.isoformat() >= until.group(1)):
+            continue
+        rows.append((i, day))
+    bindings = []
+    for i, day in rows[offset:offset + limit]:
+        bindings.append({
+            "work": {"type": "uri", "value": f"http://publications.europa.eu/resource/cellar/{i:08x}-0000-0000-0000-{_crc(str(i)):012x}"},
+            "date": {"type": "literal", "datatype": "http://www.w3.org/2001/XMLSchema#date", "value": day.isoformat()},
+            "title": {"type": "literal", "xml:lang": "en", "value": f"Regulation on {ICT_PHRASES[i % len(ICT_PHRASES)]} ({i})"},
+        })
+    return json.dumps({"head": {"vars": ["work", "date", "title"]}, "results": {"bindings": bindings}}).encode("utf-8")
+
+
+def _synth_japan_page(page, total_pages, per_page=20):
+    if page < 1 or page > total_pages:
+        return b"<html><body><main></main></body></html>"
+    newest = total_pages * per_page
+    anchors = []
+    for k in range(per_page):
+        item = newest - (page - 1) * per_page - k
+        day = date(2025, 12, 31) - timedelta(days=item * 365 // newest)
+        anchors.append(f'<li><a href="https://www.digital.go.jp/news/{item:06d}">{day.year}年{day.month}月{day.day}日 '
+                       f'デジタル庁 お知らせ 第{item}号</a></li>')
+    return f"<html><body><main><ul>{''.join(anchors)}</ul></main></body></html>".encode("utf-8")
+
+
+def _synth_whitehouse_news(n):
+    articles = []
+    for i in range(n):
+        day = date(2025, 12, 31) - timedelta(days=i)
+        articles.append(f'<article><h2><a href="https://www.whitehouse.gov/briefings/{i:05d}/">President advances '
+                        f'{ICT_PHRASES[i % len(ICT_PHRASES)]} agenda ({i})</a></h2><time>{day:%B %d, %Y}</time></article>')
+    return f"<html><body><main>{''.join(articles)}</main></body></html>".encode("utf-8")
+
+
+def _hf_generate(payload):
+    """text-generation 대역: 프롬프트의 '내용:' 줄로 JSON 답변 생성 (묶음 요청에서는 일부러 가끔 형식을 깨뜨림)"""
+    prompts = payload.get("inputs")
+    single = isinstance(prompts, str)
+    outputs = []
+    for prompt in [prompts] if single else prompts:
+        text = prompt.rsplit("내용:", 1)[-1].strip()
+        answer = json.dumps({"title_ko": f"[ko] {text}", "summary": [f"{text} 요약 {k}" for k in (1, 2, 3)]},
+                            ensure_ascii=False)
+        if not single and _crc(text) % 7 == 0:
+            answer = "요약: " + answer[:len(answer) // 2]
+        outputs.append([{"generated_text": "다음은 요청하신 결과입니다.\n" + answer}])
+    return json.dumps(outputs[0] if single else outputs, ensure_ascii=False).encode("utf-8")
+
+
+def _synth_eu_news_page(page, total_pages, per_page=10):
+    """EU 뉴스 목록 (0부터 시작하는 page, 메뉴/푸터와 무거운 마크업 포함)"""
+    chrome = "".join(f'<li class="ecl-menu__item"><a class="ecl-link" href="/menu/{k}">Menu entry {k}</a></li>' for k in range(150))
+    blocks = []
+    if 0 <= page < total_pages:
+        newest = total_pages * per_page
+        for k in range(per_page):
+            item = newest - page * per_page - k
+            day = date(2025, 12, 31) - timedelta(days=(item - 1) * 365 // newest)
+            blocks.append(f'<article class="ecl-u-d-flex"><div class="ecl-content-block ecl-content-item__content-block">'
+                          f'<ul class="ecl-content-block__primary-meta-container"><li><time datetime="{day}">{day:%d %B %Y}</time></li></ul>'
+                          f'<h3 class="ecl-content-block__title"><a class="ecl-link" href="/news/{item:06d}_en">'
+                          f'Commission acts on {ICT_PHRASES[item % len(ICT_PHRASES)]} ({item})</a></h3>'
+                          f'<div class="ecl-content-block__description"><p>{"Lorem ipsum dolor sit amet. " * 8}</p></div></div></article>')
+    footer = '<div class="ecl-content-block"><h3><a href="/contact_en">Call us</a></h3></div>'
+    return (f"<html><head><title>News</title></head><body><nav><ul>{chrome}</ul></nav>"
+            f"<main>{''.join(blocks)}</main><footer>{footer}{chrome}</footer></body></html>").encode("utf-8")
+
+
+# ---------------------------------------------------------------------------
+# 자식 프로세스 쪽: 대역 서버 연결, 단계별 계측, 시나리오 실행
+# ---------------------------------------------------------------------------
+
+def _forbid_network():
+    """localhost 이외로의 연결을 막아 실수로 실서버에 요청하지 않게 함"""
+    original = socket.socket.connect
+
+    def connect(self, address):
+        host = address[0] if isinstance(address, tuple) else address
+        if host not in ("127.0.0.1", "::1", "localhost"):
+            raise OSError(f"benchmark: 외부 네트워크 연결 차단 ({host})")
+        return original(self, address)
+    socket.socket.connect = connect
+
+
+def _attach_stand_in(base_url):
+    """공유 HTTP 클라이언트의 모든 요청을 대역 서버로 돌리고 번역/링크 해독도 대역으로 교체"""
+    from types import SimpleNamespace
+    from requests.adapters import HTTPAdapter
+    import gnews_decoder
+    import translation_memory
+    from http_client import get_http_client
+
+    class StandInAdapter(HTTPAdapter):
+        def send(self, request, **kwargs):
+            parts = urlsplit(request.url)
+            request.url = f"{base_url}/{parts.netloc}{parts.path}" + (f"?{parts.query}" if parts.query else "")
+            return super().send(request, **kwargs)
+
+    client = get_http_client()
+    previous = client.session.get_adapter("https://")
+    adapter = StandInAdapter(pool_connections=64, pool_maxsize=64, max_retries=previous.max_retries)
+    client.session.mount("https://", adapter)
+    client.session.mount("http://", adapter)
+
+    class StandInTranslator:
+        def translate(self, text, src="auto", dest="ko"):
+            res = client.post("https://translate.googleapis.com/translate_a/single",
+                              data={"q": text, "sl": src, "tl": dest})
+            res.raise_for_status()
+            return SimpleNamespace(text=res.text)
+
+    def stand_in_decode(url):
+        res = client.get("https://news.google.com/__decode", params={"url": url})
+        res.raise_for_status()
+        return res.json()
+
+    translation_memory._shared = translation_memory.TranslationMemory(translator=StandInTranslator())
+    gnews_decoder._shared = gnews_decoder.LinkDecoder(decoder=stand_in_decode)
+    return client
+
+
+def synth_agencies(n):
+    """실제 50개 기관 뒤에 가짜 기관을 붙여 n개로 확장"""
+    from crawler_script import GOV_AGENCIES
+    agencies = list(GOV_AGENCIES[:n])
+    for i in range(len(agencies), n):
+        country = "대한민국" if i % 10 == 0 else f"국가{i % 40}"
+        agencies.append({"국가": country, "기관": f"Agency-{i}", "도메인": f"agency{i}.gov.example"})
+    return agencies
+
+
+def run_ict_policy(scale):
+    import crawler_script
+    crawler_script.main(agencies=synth_agencies(scale))
+
+
+def run_federal_register(scale):
+    import trump_ict_analyzer_2025 as fr
+    with stage("full_sync"):
+        fr.fetch_us_data(full=True)
+    with stage("incremental_sync"):
+        fr.fetch_us_data()
+
+
+def run_whitehouse_ict(scale):
+    import whitehouse_ict_2025
+    with stage("cold_run"):
+        whitehouse_ict_2025.main()
+    with stage("warm_run"):
+        whitehouse_ict_2025.main()
+
+
+def run_openai(scale):
+    import crawl_openai
+    with stage("cold_run"):
+        crawl_openai.crawl_openai_rss()
+    with stage("warm_run"):
+        crawl_openai.crawl_openai_rss()
+
+
+def run_eu_cellar(scale):
+    import korea_policy_bot
+    with stage("cold_run"):
+        korea_policy_bot.fetch_eu_cellar_final_match()
+    with stage("incremental_run"):
+        korea_policy_bot.fetch_eu_cellar_final_match()
+
+
+def run_whitehouse_ai(scale):
+    import scraper
+    with stage("cold_run"):
+        scraper.run_platform(limit=scale)
+    with stage("warm_run"):
+        scraper.run_platform(limit=scale)
+
+
+def _synth_policy_text(seed, sentences=240):
+    """요약 벤치마크용 행정명령 원문 (조항 제목 + 서로 다른 문장, 줄바꿈으로 끊긴 긴 본문)"""
+    rng = random.Random(seed)
+    verbs = ["shall review", "shall develop", "shall coordinate", "may establish", "shall report on", "shall prioritize"]
+    actors = ["The Secretary of Commerce", "The Director of OSTP", "Each agency head", "The Attorney General",
+              "The Secretary of Energy", "The National Security Advisor"]
+    lines = [f"Executive Order {14000 + seed} of January 20, 2025", ""]
+    for i in range(sentences):
+        if i % 20 == 0:
+            lines += ["", f"Sec. {i // 20 + 1}. {ICT_PHRASES[(seed + i) % len(ICT_PHRASES)].title()}."]
+        topic, other = rng.sample(ICT_PHRASES, 2)
+        sentence = (f"{rng.choice(actors)} {rng.choice(verbs)} federal policy on {topic}, in consultation with "
+                    f"the heads of relevant agencies, including measures related to {other} within {rng.randint(30, 365)} days.")
+        lines += [sentence[:70], sentence[70:]]
+    return "\n".join(lines)
+
+
+def run_extractive_summary(scale):
+    import extractive_summary
+    from fr_text_store import RawTextStore
+    store = RawTextStore()
+    numbers = [f"2025-{i:05d}" for i in range(scale)]
+    with stage("setup"):
+        for i, number in enumerate(numbers):
+            store.put(number, _synth_policy_text(i))
+    started = time.perf_counter()
+    with stage("serial_100"):
+        extractive_summary.summarize_documents(numbers[:100], store, workers=1)
+    serial = 100 / (time.perf_counter() - started)
+    started = time.perf_counter()
+    with stage("pool"):
+        summaries = extractive_summary.summarize_documents(numbers, store)
+    pooled = len(numbers) / (time.perf_counter() - started)
+    assert all(summaries.values()), "요약이 비어 있는 문서가 있습니다"
+    return {"docs_per_s": round(pooled, 1), "docs_per_s_serial": round(serial, 1),
+            "workers": extractive_summary.WORKERS}
+
+
+def run_eu_news(scale):
+    import eu_policy_bot
+    with stage("cold_run"):
+        eu_policy_bot.fetch_2025_news_perfect()
+    with stage("incremental_run"):
+        eu_policy_bot.fetch_2025_news_perfect()
+
+
+def _synth_fr_archive(path, rows):
+    """Federal_Register_2025_Final.csv 모양의 보관 파일 (공동 발행 문서는 부처 이름을 ", "로 이어 붙임)"""
+    import csv
+    rng = random.Random(rows)
+    agencies = FR_AGENCIES + [f"Agency {i}" for i in range(300)]
+    start = date(2025, 1, 1)
+    with open(path, "w", newline="", encoding="utf-8-sig") as f:
+        writer = csv.writer(f)
+        writer.writerow(["발행일", "발행부처", "문서종류", "제목(영문)", "원문링크", "문서번호"])
+        for i in range(rows):
+            day = (start + timedelta(days=rng.randrange(365))).isoformat()
+            names = rng.sample(agencies[:40] if rng.random() < 0.7 else agencies, rng.choice((1, 1, 1, 2, 3)))
+            number = f"2025-{i:06d}"
+            writer.writerow([day, ", ".join(names), rng.choice(FR_TYPES)[1],
+                             f"{ICT_PHRASES[i % len(ICT_PHRASES)].title()} {i}",
+                             f"https://www.federalregister.gov/documents/{day.replace('-', '/')}/{number}/doc-{i}", number])
+
+
+def run_fr_archive(scale):
+    import csv
+    import fr_archive
+    file_name = "Federal_Register_2025_Final.csv"
+    with stage("setup"):
+        _synth_fr_archive(file_name, scale)
+    started = time.perf_counter()
+    with stage("csv_parse"), open(file_name, newline="", encoding="utf-8-sig") as f:
+        rows = list(csv.DictReader(f))
+    csv_parse = time.perf_counter() - started
+    with stage("cold_load"):
+        fr_archive.load_archive(file_name, ".")
+    started = time.perf_counter()
+    with stage("warm_load"):
+        archive = fr_archive.load_archive(file_name, ".")
+    warm_load = time.perf_counter() - started
+    started = time.perf_counter()
+    with stage("filter"):
+        mask = archive.mask(agency="Commerce", doc_type="Rule", since="2025-07-01")
+    filtered = time.perf_counter() - started
+    expected = sum(1 for row in rows if row["발행일"] >= "2025-07-01" and "Rule" in row["문서종류"]
+                   and any("commerce" in name.lower() for name in fr_archive.split_agencies(row["발행부처"])))
+    assert len(archive) == len(rows) and int(mask.sum()) == expected, "캐시 필터 결과가 CSV와 다릅니다"
+    return {"csv_parse_ms": round(csv_parse * 1000, 1), "warm_load_ms": round(warm_load * 1000, 2),
+            "filter_ms": round(filtered * 1000, 2), "matched": expected}
+
+
+class StandInPagePool:
+    """브라우저 대신 대역 서버의 목록 HTML을 받아 앵커를 뽑는 PagePool (인터페이스 동일)"""
+
+    ANCHOR = re.compile(r'<a href="([^"]*/(?:news|press|policies)/[^"]*)">([^<]+)</a>')
+
+    def __init__(self, pool_size=4):
+        import asyncio
+        self.pool_size = max(1, pool_size)
+        self._sem = asyncio.Semaphore(self.pool_size)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        pass
+
+    async def fetch(self, page_numbers, progress_total=None):
+        import asyncio
+        from http_client import get_http_client
+        client = get_http_client()
+
+        async def one(p_num):
+            async with self._sem:
+                res = await asyncio.to_thread(client.get, f"https://www.digital.go.jp/news?page={p_num}")
+            links = [{"title": t.strip(), "href": h} for h, t in self.ANCHOR.findall(res.text) if len(t.strip()) > 15]
+            return p_num, links if res.status_code == 200 and links else None
+
+        results = await asyncio.gather(*(one(p) for p in page_numbers))
+        return {p: links for p, links in results if links is not None}
+
+
+def run_japan_digital(scale):
+    import asyncio
+    import japan_digital_bot
+    japan_digital_bot.PagePool = StandInPagePool
+    with stage("full_crawl"):
+        asyncio.run(japan_digital_bot.crawl_digital_2025_playwright_fixed(start_page=1, end_page=scale))
+    with stage("incremental_crawl"):
+        asyncio.run(japan_digital_bot.crawl_incremental(max_page=scale))
+
+
+SCENARIOS = {
+    "ict_policy":       Scenario(run_ict_policy, 50, 2000, "crawler_script: 기관별 Google News RSS → 번역 → 링크 해독"),
+    "federal_register": Scenario(run_federal_register, 20000, 100000, "trump_ict_analyzer_2025: 관보 전체 + 증분 동기화"),
+    "whitehouse_ict":   Scenario(run_whitehouse_ict, 5000, 100000, "whitehouse_ict_2025: 행정명령 목록 + 원문 저장소"),
+    "japan_digital":    Scenario(run_japan_digital, 188, 1000, "japan_digital_bot: 목록 전체 + 증분 크롤"),
+    "openai":           Scenario(run_openai, 15, 500, "crawl_openai: RSS → 번역 → 저장소/엑셀 (두 번째는 304)"),
+    "eu_cellar":        Scenario(run_eu_cellar, 100, 10000, "korea_policy_bot: Cellar SPARQL"),
+    "whitehouse_ai":    Scenario(run_whitehouse_ai, 3, 200, "scraper: 백악관 뉴스 → 번역/요약 (두 번째는 캐시만)"),
+    "extractive_summary": Scenario(run_extractive_summary, 2000, 20000, "extractive_summary: 관보 원문 추출 요약 (문서/초)"),
+    "eu_news":          Scenario(run_eu_news, 60, 300, "eu_policy_bot: 뉴스 목록 전체 페이지 + 증분"),
+    "fr_archive":       Scenario(run_fr_archive, 50000, 1000000, "fr_archive: 관보 보관 CSV 열 캐시 (CSV 파싱 대비 열기/필터)"),
+}
+# 시나리오 규모가 대역 서버의 어느 데이터 크기에 해당하는지
+SCALE_KEYS = {"federal_register": "fr_docs", "whitehouse_ict": "fr_docs", "japan_digital": "japan_pages",
+              "openai": "openai_items", "eu_cellar": "cellar_rows", "eu_news": "eu_news_pages",
+              "whitehouse_ai": "whitehouse_articles"}
+
+
+def run_child(name, scale, base_url):
+    _forbid_network()
+    client = _attach_stand_in(base_url)
+    METRICS.default_collector = name
+
+    started = time.perf_counter()
+    error = None
+    extra = None
+    try:
+        extra = SCENARIOS[name].runner(scale)
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+    wall = time.perf_counter() - started
+
+    hosts = {host: {k: h[k] for k in ("requests", "not_modified", "bytes")} for host, h in client.hosts.items()}
+    result = {
+        "scenario": name, "scale": scale, "wall_s": round(wall, 3),
+        "requests": sum(h["requests"] for h in client.hosts.values()),
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        "stages": {k: {"seconds": round(v["seconds"], 3), "calls": v["calls"]}
+                   for k, v in METRICS.snapshot()["stages"].get(name, {}).items()},
+        "hosts": hosts, "error": error,
+    }
+    if isinstance(extra, dict):
+        result.update(extra)
+    sys.stdout.flush()
+    print(RESULT_MARKER + json.dumps(result, ensure_ascii=False))
+
+
+# ---------------------------------------------------------------------------
+# 부모 프로세스 쪽: 서버 기동, 시나리오별 자식 실행, 결과 비교/저장
+# ---------------------------------------------------------------------------
+
+def _git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=REPO_DIR, capture_output=True,
+                              text=True, timeout=10).stdout.strip() or None
+    except Exception:
+        return None
+
+
+def _previous_results(path):
+    previous = {}
+    if os.path.exists(path):
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                previous[_config_key(record)] = record
+    return previous
+
+
+def _config_key(record):
+    c = record.get("config", {})
+    return (record.get("scenario"), record.get("scale"), c.get("latency_ms"), c.get("jitter_ms"),
+            c.get("error_rate"), c.get("google_rps"))
+
+
+def run_scenario(server, name, scale, google_rps=None, verbose=False):
+    server.scale = {SCALE_KEYS[name]: scale} if name in SCALE_KEYS else {}
+    before = server.total_requests()
+    with tempfile.TemporaryDirectory(prefix=f"bench_{name}_") as workdir:
+        env = dict(os.environ, NEWSBOT_CACHE_DIR=os.path.join(workdir, "cache"),
+                   PYTHONPATH=os.pathsep.join(filter(None, [REPO_DIR, os.environ.get("PYTHONPATH")])))
+        if google_rps:
+            env["GOOGLE_NEWS_RPS"] = str(google_rps)
+        proc = subprocess.run([sys.executable, os.path.join(REPO_DIR, "benchmark.py"), "--child", name,
+                               "--child-scale", str(scale), "--child-base", server.base_url],
+                              cwd=workdir, env=env, capture_output=True, text=True)
+    if verbose:
+        print(proc.stdout)
+        print(proc.stderr, file=sys.stderr)
+    lines = [l for l in proc.stdout.splitlines() if l.startswith(RESULT_MARKER)]
+    if not lines:
+        tail = (proc.stderr or proc.stdout).strip().splitlines()[-5:]
+        return {"scenario": name, "scale": scale, "error": "자식 프로세스 실패: " + " | ".join(tail)}
+    result = json.loads(lines[-1][len(RESULT_MARKER):])
+    result["server_requests"] = server.total_requests() - before
+    return result
+
+
+def _print_result(result, previous):
+    if result.get("wall_s") is None:
+        print(f"❌ {result['scenario']:<17} 규모 {result['scale']:>7} | {result['error']}")
+        return
+    delta = ""
+    if previous and previous.get("wall_s"):
+        change = (result["wall_s"] - previous["wall_s"]) / previous["wall_s"] * 100
+        delta = f" ({change:+.1f}% vs {previous.get('revision') or '이전'})"
+    print(f"⏱️ {result['scenario']:<17} 규모 {result['scale']:>7} | {result['wall_s']:8.2f}초{delta} | "
+          f"요청 {result['requests']}회 (서버 {result['server_requests']}회) | 최대 RSS {result['peak_rss_mb']} MB")
+    if result.get("docs_per_s"):
+        print(f"      📄 처리량 {result['docs_per_s']:.1f}건/초 (프로세스 {result.get('workers')}개, "
+              f"단일 프로세스 {result.get('docs_per_s_serial', 0):.1f}건/초)")
+    if result.get("csv_parse_ms") is not None:
+        print(f"      🗃️ CSV 파싱 {result['csv_parse_ms']:.1f} ms → 캐시 열기 {result['warm_load_ms']:.2f} ms, "
+              f"필터 {result['filter_ms']:.2f} ms ({result['matched']}건)")
+    for stage, s in sorted(result["stages"].items(), key=lambda kv: -kv[1]["seconds"]):
+        print(f"      - {stage:<18} 누적 {s['seconds']:8.2f}초  ({s['calls']}회)")
+    if result.get("error"):
+        print(f"      ⚠️ {result['error']}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="네트워크 없이 수집기 성능 측정 (로컬 대역 서버)")
+    parser.add_argument("--scenario", action="append", choices=list(SCENARIOS), help="실행할 시나리오 (기본: 전체)")
+    parser.add_argument("--scale", action="append", default=[], metavar="NAME=N", help="시나리오 규모 지정")
+    parser.add_argument("--large", action="store_true", help="대규모 입력 (기관 2,000 / 관보 100,000 / 일본 1,000페이지)")
+    parser.add_argument("--latency", type=float, default=30, help="요청당 지연 (ms)")
+    parser.add_argument("--jitter", type=float, default=20, help="추가 무작위 지연 최대값 (ms)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="503 오류 주입 비율 (0~1)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--fixtures", help="녹화 응답 폴더 (<폴더>/<호스트>/<경로> 파일이 있으면 그대로 응답)")
+    parser.add_argument("--google-rps", type=float, help="news.google.com 초당 요청 예산 덮어쓰기")
+    parser.add_argument("--out", help="결과 누적 JSONL (기본: 캐시 폴더의 benchmark_results.jsonl)")
+    parser.add_argument("--verbose", action="store_true", help="수집기 출력도 함께 표시")
+    parser.add_argument("--list", action="store_true", help="시나리오 목록")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    parser.add_argument("--child-scale", type=int, help=argparse.SUPPRESS)
+    parser.add_argument("--child-base", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        return run_child(args.child, args.child_scale, args.child_base)
+    if args.list:
+        for name, s in SCENARIOS.items():
+            print(f"{name:<17} 기본 {s.default_scale:>6} / 대규모 {s.large_scale:>6}  {s.description}")
+        return
+
+    scales = {name: (s.large_scale if args.large else s.default_scale) for name, s in SCENARIOS.items()}
+    for item in args.scale:
+        name, _, value = item.partition("=")
+        if name not in SCENARIOS or not value.isdigit():
+            parser.error(f"--scale 형식 오류: {item}")
+        scales[name] = int(value)
+
+    from cache_paths import cache_path
+    out = args.out or cache_path("benchmark_results.jsonl")
+    previous = _previous_results(out)
+    config = {"latency_ms": args.latency, "jitter_ms": args.jitter, "error_rate": args.error_rate,
+              "seed": args.seed, "google_rps": args.google_rps}
+    server = StandInServer(latency_ms=args.latency, jitter_ms=args.jitter, error_rate=args.error_rate,
+                           seed=args.seed, fixtures=args.fixtures).start()
+    revision = _git_revision()
+    print(f"🧪 벤치마크 시작 (대역 서버 {server.base_url}, 지연 {args.latency}±{args.jitter}ms, 오류율 {args.error_rate})")
+
+    with open(out, "a", encoding="utf-8") as f:
+        for name in args.scenario or list(SCENARIOS):
+            result = run_scenario(server, name, scales[name], args.google_rps, args.verbose)
+            result.update({"config": config, "revision": revision, "run_at": datetime.now().isoformat(timespec="seconds")})
+            _print_result(result, previous.get(_config_key(result)))
+            f.write(json.dumps(result, ensure_ascii=False) + "\n")
+            f.flush()
+    server.shutdown()
+    print(f"💾 결과 누적 저장: {out}")
+
+
+if __name__ == "__main__":
+    main()
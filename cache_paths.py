@@ -0,0 +1,9 @@
+import os
+
+# 💾 모든 수집기가 공유하는 로컬 캐시 폴더 (GitHub Actions에서는 actions/cache로 보존)
+CACHE_DIR = os.environ.get("NEWSBOT_CACHE_DIR", ".newsbot_cache")
+
+def cache_path(file_name):
+    """캐시 폴더 안의 파일 경로를 반환 (폴더가 없으면 생성)"""
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    return os.path.join(CACHE_DIR, file_name)
@@ -1,7 +1,10 @@
 import os
-import requests
-import pandas as pd
 from datetime import datetime
+from keyword_matcher import KeywordMatcher
+from date_normalizer import normalize_date
+from http_client import get_http_client
+from instrumentation import collector_run, stage
+from exporters import export
 
 # 1. 네이버 API 인증 정보 (GitHub Secrets에서 가져옴)
 client_id = os.environ.get('NAVER_CLIENT_ID')
@@ -9,26 +12,20 @@ client_secret = os.environ.get('NAVER_CLIENT_SECRET')
 
 def format_date(raw_date):
     """네이버 pubDate를 yyyy-mm-dd 형식으로 변환"""
-    try:
-        # 네이버 날짜 예시: "Tue, 27 Jan 2026 10:00:00 +0900"
-        # 앞의 요일과 뒤의 시간대를 제외한 날짜 부분만 파싱
-        date_obj = datetime.strptime(raw_date[5:16], "%d %b %Y")
-        return date_obj.strftime("%Y-%m-%d")
-    except:
-        return raw_date[:10] # 실패 시 앞부분 날짜만이라도 반환
+    # 네이버 날짜 예시: "Tue, 27 Jan 2026 10:00:00 +0900" (해석 실패 시 '날짜확인필요')
+    return normalize_date(raw_date)
+
+# 뉴스 제목 분류 사전 (사전 순서가 곧 우선순위, 대소문자 구분)
+CATEGORY_MATCHER = KeywordMatcher({
+    "기업": ["투자", "유치", "인수", "합병", "M&A", "실적", "상장", "IPO", "파트너십", "협력", "삼성", "네이버", "구글", "오픈AI"],
+    "기술": ["모델", "LLM", "성능", "출시", "특허", "논문", "칩", "반도체", "HBM", "Sora", "GPT", "알고리즘"],
+    "정책": ["정부", "법안", "규제", "가이드라인", "예산", "지원", "국회", "과기부", "EU", "조약", "윤리"],
+    "산업": ["시장", "전망", "도입", "사례", "금융", "의료", "제조", "일자리", "확산", "트렌드", "인력"]
+}, case_sensitive=True)
 
 def classify_category(title):
     """뉴스 제목을 분석하여 카테고리 분류"""
-    categories = {
-        "기업": ["투자", "유치", "인수", "합병", "M&A", "실적", "상장", "IPO", "파트너십", "협력", "삼성", "네이버", "구글", "오픈AI"],
-        "기술": ["모델", "LLM", "성능", "출시", "특허", "논문", "칩", "반도체", "HBM", "Sora", "GPT", "알고리즘"],
-        "정책": ["정부", "법안", "규제", "가이드라인", "예산", "지원", "국회", "과기부", "EU", "조약", "윤리"],
-        "산업": ["시장", "전망", "도입", "사례", "금융", "의료", "제조", "일자리", "확산", "트렌드", "인력"]
-    }
-    for category, keywords in categories.items():
-        if any(keyword in str(title) for keyword in keywords):
-            return category
-    return "기타"
+    return CATEGORY_MATCHER.first_category(str(title), default="기타")
 
 def get_naver_news_general():
     """일반 AI 뉴스 수집 (카테고리별 분류)"""
@@ -39,7 +36,7 @@ def get_naver_news_general():
     headers = {"X-Naver-Client-Id": client_id, "X-Naver-Client-Secret": client_secret}
     
     try:
-        res = requests.get(url, headers=headers, timeout=10)
+        res = get_http_client().get(url, headers=headers, timeout=10)
         if res.status_code == 200:
             items = res.json().get('items', [])
             counts = {"기업": 0, "기술": 0, "정책": 0, "산업": 0}
@@ -64,7 +61,7 @@ def get_msit_news_via_api():
     headers = {"X-Naver-Client-Id": client_id, "X-Naver-Client-Secret": client_secret}
     
     try:
-        res = requests.get(url, headers=headers, timeout=10)
+        res = get_http_client().get(url, headers=headers, timeout=10)
         if res.status_code == 200:
             items = res.json().get('items', [])
             for item in items[:5]:
@@ -79,17 +76,21 @@ def get_msit_news_via_api():
     return msit_list
 
 # --- 메인 실행부 ---
-if __name__ == "__main__":
+def main():
     collection_date = datetime.now().strftime("%Y-%m-%d")
     
     all_data = get_naver_news_general() + get_msit_news_via_api()
 
     if all_data:
-        df = pd.DataFrame(all_data)
-        df.insert(0, "수집일", collection_date)
-        
+        columns = ["수집일"] + list(dict.fromkeys(key for row in all_data for key in row))
+
         # 엑셀 저장
-        df.to_excel("news_list.xlsx", index=False)
+        with stage("write"):
+            export("news_list.xlsx", ({**row, "수집일": collection_date} for row in all_data), columns)
         print(f"✅ 수집 완료! 총 {len(all_data)}건 (과기부 포함)")
     else:
         print("❌ 수집된 데이터가 없습니다.")
+
+if __name__ == "__main__":
+    with collector_run("naver_news"):
+        main()
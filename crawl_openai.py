@@ -1,34 +1,54 @@
-import requests
 import xml.etree.ElementTree as ET
-import pandas as pd
 from datetime import datetime
-from googletrans import Translator
-import time
+from translation_memory import get_translation_memory
+from article_store import get_article_store
+from http_client import get_http_client
+from date_normalizer import normalize_date, normalize_many
+from instrumentation import collector_run, stage
 import os  # 파일 존재 여부 확인을 위해 필요
 
+SOURCE = "OpenAI"
+# 엑셀 열 이름 → 기사 저장소 필드 (엑셀은 저장소에서 만들어지는 내보내기 파일)
+EXPORT_COLUMNS = {"수집일": "collected", "발행일": "published", "기관": "source",
+                  "원문 제목": "title", "한글 번역 제목": "title_ko", "링크": "link"}
+
+def bootstrap_store(store, file_name):
+    """저장소가 비어 있으면 기존 엑셀을 한 번만 읽어 채움 (캐시가 초기화된 경우 대비)"""
+    if store.count(SOURCE) or not os.path.exists(file_name):
+        return
+    try:
+        import pandas as pd
+        existing_df = pd.read_excel(file_name, dtype=str).fillna("")
+        # 파일은 최신순이므로 뒤에서부터 넣어야 내보낼 때 같은 순서가 유지됨
+        # 예전 파일에 남아 있는 원본 pubDate 문자열도 이때 함께 정리
+        existing_df["발행일"] = normalize_many(existing_df["발행일"])
+        rows = [{field: row[col] for col, field in EXPORT_COLUMNS.items()} for row in existing_df.to_dict("records")][::-1]
+        print(f"   - 기존 엑셀 {store.insert_new(rows)}건을 저장소로 옮겼습니다.")
+    except Exception as e:
+        print(f"   - 기존 파일을 읽는 중 오류 발생(무시하고 새로 생성): {e}")
+
 def crawl_openai_rss():
     file_name = "openai_news.xlsx"
     print("1. 수집 및 누적 프로세스 시작...")
     
     url = "https://openai.com/news/rss.xml"
     headers = {"User-Agent": "Mozilla/5.0"}
-    translator = Translator()
+    translator = get_translation_memory()
     collect_date = datetime.now().strftime("%Y-%m-%d")
     
-    # 📂 [중요] 기존 데이터 불러오기
-    existing_df = pd.DataFrame()
-    existing_links = []
-    if os.path.exists(file_name):
-        try:
-            existing_df = pd.read_excel(file_name)
-            existing_links = existing_df['링크'].tolist()  # 이미 수집된 링크 리스트
-            print(f"   - 기존 데이터 {len(existing_df)}건을 로드했습니다.")
-        except Exception as e:
-            print(f"   - 기존 파일을 읽는 중 오류 발생(무시하고 새로 생성): {e}")
+    # 📂 [중요] 기사 저장소 열기 (중복 확인은 링크 인덱스 조회)
+    store = get_article_store()
+    bootstrap_store(store, file_name)
+    print(f"   - 저장소에 기존 데이터 {store.count(SOURCE)}건이 있습니다.")
 
     try:
-        response = requests.get(url, headers=headers, timeout=10)
-        root = ET.fromstring(response.content)
+        # 지난번과 같은 피드면 304로 끝나므로 파싱/번역/내보내기를 모두 건너뜀
+        response = get_http_client().get(url, headers=headers, timeout=10, conditional=True)
+        if response.status_code == 304:
+            print("2. RSS 변경 없음 (304) → 새 기사가 없어 종료합니다.")
+            return
+        with stage("parse"):
+            root = ET.fromstring(response.content)
         print("2. RSS 데이터 가져오기 성공")
     except Exception as e:
         print(f"접속 에러: {e}")
@@ -41,54 +61,47 @@ def crawl_openai_rss():
     for i, item in enumerate(items):
         link = item.find("link").text
         
-        # 🛡️ [중복 체크] 이미 엑셀에 있는 링크라면 건너뜁니다.
-        if link in existing_links:
+        # 🛡️ [중복 체크] 이미 저장소에 있는 링크라면 건너뜁니다.
+        if store.exists(link):
             continue
             
         title_en = item.find("title").text
         pub_date_raw = item.find("pubDate").text
         
         # 발행일 형식 변경 (yyyy-mm-dd)
-        try:
-            # RSS 날짜 예시: "Wed, 28 Jan 2026 10:00:00 GMT" -> "2026-01-28"
-            date_part = pub_date_raw[5:16]
-            date_obj = datetime.strptime(date_part, "%d %b %Y")
-            pub_date = date_obj.strftime("%Y-%m-%d")
-        except:
-            pub_date = pub_date_raw
-
-        # 한글 번역
-        try:
-            print(f"   - [신규 기사] 번역 중: {title_en[:30]}...")
-            title_ko = translator.translate(title_en, src='en', dest='ko').text
-            time.sleep(1.2) # 번역 API 차단 방지
-        except Exception as e:
-            print(f"   - 번역 실패 ({e})")
-            title_ko = title_en
+        # RSS 날짜 예시: "Wed, 28 Jan 2026 10:00:00 GMT" -> "2026-01-28"
+        pub_date = normalize_date(pub_date_raw)
 
         news_items.append({
-            "수집일": collect_date,
-            "발행일": pub_date,
-            "기관": "OpenAI",
-            "원문 제목": title_en,
-            "한글 번역 제목": title_ko,
-            "링크": link
+            "collected": collect_date,
+            "published": pub_date,
+            "source": SOURCE,
+            "title": title_en,
+            "title_ko": title_en,
+            "link": link
         })
         new_count += 1
     
+    # 한글 번역 (신규 기사만 묶어서 1회 요청, 캐시에 있으면 네트워크/대기 생략)
+    if news_items:
+        print(f"   - [신규 기사] {len(news_items)}건 번역 중...")
+        titles_ko = translator.translate_many([n["title"] for n in news_items], src='en', dest='ko',
+                                              pause=1.2) # 번역 API 차단 방지
+        for news, title_ko in zip(news_items, titles_ko):
+            news["title_ko"] = title_ko
+        translator.report()
+
     if new_count > 0:
-        new_df = pd.DataFrame(news_items)
-        # 기존 데이터와 새 데이터를 합칩니다.
-        final_df = pd.concat([new_df, existing_df], ignore_index=True)
-        
-        # 발행일 기준 최신순 정렬
-        final_df = final_df.sort_values(by="발행일", ascending=False)
+        # 신규 기사만 한 트랜잭션으로 저장소에 추가
+        store.insert_new(news_items)
         
-        # 저장
-        final_df.to_excel(file_name, index=False)
-        print(f"4. 완료! 신규 {new_count}건이 추가되어 총 {len(final_df)}건이 저장되었습니다.")
+        # 엑셀은 저장소에서 발행일 최신순으로 내보내기
+        with stage("write"):
+            total = store.export_file(file_name, EXPORT_COLUMNS, source=SOURCE)
+        print(f"4. 완료! 신규 {new_count}건이 추가되어 총 {total}건이 저장되었습니다.")
     else:
         print("4. 업데이트할 새로운 기사가 없습니다.")
 
 if __name__ == "__main__":
-    crawl_openai_rss()
+    with collector_run("openai"):
+        crawl_openai_rss()
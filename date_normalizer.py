@@ -0,0 +1,95 @@
+import re
+import time
+from datetime import date, datetime
+from functools import lru_cache
+
+# 날짜를 알 수 없을 때 돌려주는 표시 (자유 형식 문자열 대신 항상 이 값)
+UNKNOWN_DATE = "날짜확인필요"
+
+MONTHS = {"jan": 1, "feb": 2, "mar": 3, "apr": 4, "may": 5, "jun": 6,
+          "jul": 7, "aug": 8, "sep": 9, "oct": 10, "nov": 11, "dec": 12}
+
+# 문자열 모양별로 미리 컴파일한 패턴
+NUMERIC_YMD = re.compile(r"(\d{4})\s*[-./]\s*(\d{1,2})\s*[-./]\s*(\d{1,2})")       # ISO-8601, YYYY.MM.DD, YYYY/MM/DD
+CJK_YMD = re.compile(r"(\d{4})\s*[年년]\s*(\d{1,2})\s*[月월]\s*(\d{1,2})\s*[日일]")  # 2025年1月27日, 2025년 1월 27일
+DAY_MONTH_YEAR = re.compile(r"(\d{1,2})\s+([A-Za-z]{3,9})\.?,?\s+(\d{4})")         # RFC-822: Tue, 27 Jan 2026 ...
+MONTH_DAY_YEAR = re.compile(r"([A-Za-z]{3,9})\.?\s+(\d{1,2})(?:st|nd|rd|th)?,?\s+(\d{4})")  # January 28, 2026
+
+
+def _ymd(year, month, day):
+    try:
+        return date(int(year), int(month), int(day))
+    except ValueError:
+        return None
+
+
+def _month_number(name):
+    return MONTHS.get(name[:3].lower())
+
+
+@lru_cache(maxsize=8192)
+def _parse_text(text):
+    """문자열 → date (모르면 None). 같은 문자열은 한 번만 파싱"""
+    if not text:
+        return None
+    # 숫자로 시작하면 숫자형/한자형 먼저, 영문으로 시작하면 RFC-822/영문 월 이름 먼저 시도
+    if text[0].isdigit():
+        candidates = (NUMERIC_YMD, CJK_YMD, DAY_MONTH_YEAR, MONTH_DAY_YEAR)
+    else:
+        candidates = (DAY_MONTH_YEAR, MONTH_DAY_YEAR, NUMERIC_YMD, CJK_YMD)
+
+    for pattern in candidates:
+        match = pattern.search(text)
+        if not match:
+            continue
+        if pattern is DAY_MONTH_YEAR:
+            month = _month_number(match.group(2))
+            parsed = _ymd(match.group(3), month, match.group(1)) if month else None
+        elif pattern is MONTH_DAY_YEAR:
+            month = _month_number(match.group(1))
+            parsed = _ymd(match.group(3), month, match.group(2)) if month else None
+        else:
+            parsed = _ymd(*match.groups())
+        if parsed:
+            return parsed
+    return None
+
+
+def parse_date(value):
+    """문자열/datetime/date/struct_time(feedparser의 published_parsed) → date (모르면 None)"""
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    if isinstance(value, (time.struct_time, tuple)):
+        return _ymd(*value[:3]) if len(value) >= 3 else None
+    return _parse_text(str(value).strip())
+
+
+def normalize_date(value, default=UNKNOWN_DATE):
+    """어떤 형식이든 'YYYY-MM-DD'로, 해석할 수 없으면 default(기본: UNKNOWN_DATE)"""
+    parsed = parse_date(value)
+    return parsed.isoformat() if parsed else default
+
+
+def normalize_many(values, default=UNKNOWN_DATE):
+    """열 전체를 한 번에 정규화 (서로 다른 값만 파싱한 뒤 매핑)
+
+    pandas Series를 넘기면 Series로, 그 밖의 iterable은 list로 돌려줍니다.
+    """
+    if hasattr(values, "unique") and hasattr(values, "map"):
+        mapping = {v: normalize_date(v, default) for v in values.unique()}
+        return values.map(mapping)
+    values = list(values)
+    mapping = {}
+    for v in values:
+        key = tuple(v) if isinstance(v, (time.struct_time, list)) else v
+        if key not in mapping:
+            mapping[key] = normalize_date(v, default)
+    return [mapping[tuple(v) if isinstance(v, (time.struct_time, list)) else v] for v in values]
+
+
+def cache_info():
+    return _parse_text.cache_info()
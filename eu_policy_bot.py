@@ -1,52 +1,141 @@
-import requests
-from bs4 import BeautifulSoup
-import csv
-
-def fetch_2025_news_perfect():
-    # 2025년 필터링된 주소
-    url = "https://european-union.europa.eu/news-and-events/news-and-stories_en?f%5B0%5D=oe_news_publication_date%3Abt%7C2025-01-01T02%3A12%3A07%2B01%3A00%7C2025-12-31T02%3A12%3A07%2B01%3A00"
-    
-    headers = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'}
-    
-    print("🎯 [정밀 타격] 메뉴/푸터 무시하고 '뉴스 알맹이'만 도려냅니다...", flush=True)
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from article_store import get_article_store
+from http_client import get_http_client
+from instrumentation import collector_run, stage
 
-    try:
-        res = requests.get(url, headers=headers, timeout=30)
-        soup = BeautifulSoup(res.text, 'html.parser')
-
-        # [핵심] EU 뉴스 사이트에서 기사가 들어있는 구역만 딱 집어냅니다.
-        # 이 구역 밖의 'Call us', 'Mission' 등은 모두 무시됩니다.
-        news_items = soup.find_all('div', class_='ecl-content-block')
-
-        results = []
-        for item in news_items:
-            title_tag = item.find('h2') or item.find('h3')
-            link_tag = item.find('a')
-            
+# lxml이 있으면 C 파서 + XPath로 기사 블록만 골라냄 (없으면 BeautifulSoup에 SoupStrainer로 블록만 파싱)
+try:
+    import lxml.html
+except ImportError:
+    lxml = None
+
+# 2025년 필터링된 주소 (page=0부터 시작)
+LISTING_URL = "https://european-union.europa.eu/news-and-events/news-and-stories_en?f%5B0%5D=oe_news_publication_date%3Abt%7C2025-01-01T02%3A12%3A07%2B01%3A00%7C2025-12-31T02%3A12%3A07%2B01%3A00"
+BASE_URL = "https://european-union.europa.eu"
+FILE_NAME = 'EU_2025_NEWS_CLEAN.csv'
+SOURCE = "EU News"
+# CSV 열 이름 → 기사 저장소 필드 (CSV는 저장소에서 만들어지는 내보내기 파일, 발행일이 없어 수집 순서대로)
+EXPORT_COLUMNS = {"title": "title", "link": "link"}
+MAX_WORKERS = int(os.environ.get("EU_NEWS_WORKERS", "4"))     # 동시에 받을 목록 페이지 수
+MAX_PAGES = int(os.environ.get("EU_NEWS_MAX_PAGES", "500"))   # 안전장치: 필터 결과가 이보다 길 일은 없음
+HEADERS = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'}
+# 'Call us' 같은 짧은 메뉴성 블록은 기사가 아님
+# (단어 단위로 비교: 부분 문자열로 보면 'Commission'이 'mission'에 걸려 대부분의 기사가 빠짐)
+MENU_WORDS = re.compile(r"\b(?:call us|contact|mission|about)\b", re.I)
+MENU_MAX_WORDS = 4
+BLOCK_XPATH = "//div[contains(concat(' ', normalize-space(@class), ' '), ' ecl-content-block ')]"
+
+
+def parse_blocks(content):
+    """목록 HTML에서 기사 블록(ecl-content-block)만 골라 [{"title", "link"}] 반환"""
+    items = []
+    if lxml is not None:
+        if not content.strip():
+            return items
+        for block in lxml.html.fromstring(content).xpath(BLOCK_XPATH):
+            title_tag = next(iter(block.xpath(".//h2 | .//h3")), None)
+            link_tag = next(iter(block.xpath(".//a[@href]")), None)
+            if title_tag is not None and link_tag is not None:
+                items.append((title_tag.text_content().strip(), link_tag.get('href')))
+    else:
+        from bs4 import BeautifulSoup, SoupStrainer
+        soup = BeautifulSoup(content, 'html.parser', parse_only=SoupStrainer('div', class_='ecl-content-block'))
+        for block in soup.find_all('div', class_='ecl-content-block'):
+            title_tag = block.find('h2') or block.find('h3')
+            link_tag = block.find('a', href=True)
             if title_tag and link_tag:
-                title = title_tag.get_text(strip=True)
-                link = link_tag['href']
-                if not link.startswith('http'):
-                    link = "https://european-union.europa.eu" + link
-                
-                # 'Call us' 같은 메뉴성 텍스트가 포함된 경우 걸러내기
-                if any(x in title.lower() for x in ['call us', 'contact', 'mission', 'about']):
-                    continue
-                    
-                results.append({"title": title, "link": link})
-
-        if results:
-            with open('EU_2025_NEWS_CLEAN.csv', 'w', newline='', encoding='utf-8-sig') as f:
-                writer = csv.DictWriter(f, fieldnames=["title", "link"])
-                writer.writeheader()
-                writer.writerows(results)
-            print(f"✅ 성공! 진짜 2025년 뉴스 {len(results)}건 확보!")
-            print(f"📌 첫 기사: {results[0]['title']}")
-        else:
-            print("⚠️ 뉴스 구역을 찾는 데 실패했습니다. EU가 클래스명을 숨겼을 수 있습니다.")
+                items.append((title_tag.get_text(strip=True), link_tag['href']))
+
+    results = []
+    for title, link in items:
+        if not title or (len(title.split()) <= MENU_MAX_WORDS and MENU_WORDS.search(title)):
+            continue
+        if not link.startswith('http'):
+            link = BASE_URL + link
+        results.append({"title": " ".join(title.split()), "link": link})
+    return results
+
+
+def fetch_listing_page(page):
+    res = get_http_client().get(f"{LISTING_URL}&page={page}", headers=HEADERS, timeout=30)
+    if res.status_code != 200:
+        raise ValueError(f"{page}페이지 HTTP {res.status_code}")
+    with stage("parse"):
+        return parse_blocks(res.content)
+
+
+def open_archive(file_name=FILE_NAME):
+    """기사 저장소 (CSV에만 있는 행은 먼저 가져옴: 캐시가 비었거나 다른 실행이 CSV를 갱신한 경우)"""
+    store = get_article_store()
+    with stage("load"):
+        imported = store.import_csv(file_name, EXPORT_COLUMNS, SOURCE)
+    if imported:
+        print(f"   - 기존 CSV {imported}건을 저장소로 옮겼습니다.", flush=True)
+    return store
 
+
+def save_archive(store, file_name=FILE_NAME):
+    with stage("write"):
+        return store.export_file(file_name, EXPORT_COLUMNS, source=SOURCE)
+
+
+def harvest(known, max_workers=MAX_WORKERS, max_pages=MAX_PAGES):
+    """최신 페이지부터 max_workers개씩 동시에 받아 순서대로 병합
+
+    빈 페이지(필터 기간의 끝)나 이미 보관된 링크가 나온 페이지에서 멈춥니다.
+    목록이 최신순이므로 아는 링크 뒤쪽은 모두 지난 실행에서 본 기사입니다.
+    known(link)는 보관 여부 (저장소 인덱스 조회) → (새 기사 목록, 확인한 페이지 수)
+    """
+    fresh, seen_links, page = [], set(), 0
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        while page < max_pages:
+            batch = list(range(page, min(page + max_workers, max_pages)))
+            for p_num, items in zip(batch, pool.map(fetch_listing_page, batch)):
+                if not items:
+                    return fresh, p_num
+                reached_archive = False
+                for item in items:
+                    if item["link"] in seen_links:
+                        continue
+                    if known(item["link"]):
+                        reached_archive = True
+                        continue
+                    seen_links.add(item["link"])
+                    fresh.append(item)
+                print(f"📡 {p_num + 1}페이지 완료 | 새 기사 누적 {len(fresh)}건", end='\r', flush=True)
+                if reached_archive:
+                    return fresh, p_num + 1
+            page = batch[-1] + 1
+    return fresh, page
+
+
+def fetch_2025_news_perfect(file_name=FILE_NAME):
+    """2025년 EU 뉴스 목록을 끝 페이지(또는 보관된 기사)까지 수집해 아카이브 앞쪽에 추가"""
+    store = open_archive(file_name)
+    known = store.count(SOURCE)
+    print(f"🎯 EU 뉴스 수집: 보관 {known}건, 동시 {MAX_WORKERS}페이지 "
+          f"({'lxml' if lxml is not None else 'html.parser'} 파서, 기사 블록만 파싱)", flush=True)
+
+    try:
+        fresh, pages = harvest(store.exists)
     except Exception as e:
-        print(f"❌ 오류: {e}")
+        print(f"\n❌ 오류: {e}")
+        return
+
+    # 목록은 최신순이므로 뒤에서부터 넣어야 내보낼 때 최신 기사가 위로 옴
+    added = store.insert_new([dict(item, source=SOURCE) for item in reversed(fresh)])
+    if added or (known and not os.path.exists(file_name)):
+        save_archive(store, file_name)
+    if fresh:
+        print(f"\n✅ {pages}페이지 확인, 새 2025년 뉴스 {added}건 추가 → 총 {known + added}건")
+        print(f"📌 최신 기사: {fresh[0]['title']}")
+    elif known:
+        print(f"\n✅ {pages}페이지 확인, 새 기사 없음 (보관 {known}건)")
+    else:
+        print("\n⚠️ 뉴스 구역을 찾는 데 실패했습니다. EU가 클래스명을 숨겼을 수 있습니다.")
 
 if __name__ == "__main__":
-    fetch_2025_news_perfect()
+    with collector_run("eu_policy"):
+        fetch_2025_news_perfect()
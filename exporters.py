@@ -0,0 +1,151 @@
+import csv
+import json
+import os
+import threading
+
+# 기본 파일과 같은 행을 다른 형식으로도 남기려면 NEWSBOT_EXPORT_FORMATS=parquet,jsonl
+# (예: news_list.xlsx → news_list.parquet, news_list.jsonl 을 같은 순회에서 함께 씀)
+EXTRA_FORMATS = [f.strip().lstrip(".").lower() for f in os.environ.get("NEWSBOT_EXPORT_FORMATS", "").split(",") if f.strip()]
+ROW_GROUP_SIZE = 50000    # Parquet 행 그룹 크기 (이만큼만 메모리에 모았다가 씀)
+
+
+def _cell(value):
+    """pandas to_excel과 같은 모양이 되도록 NaN/None은 빈 칸으로"""
+    if value is None or (isinstance(value, float) and value != value):
+        return None
+    return value
+
+
+class CsvSink:
+    """엑셀에서 한글이 깨지지 않도록 기본 utf-8-sig (BOM)"""
+
+    def __init__(self, path, columns, encoding="utf-8-sig"):
+        self._file = open(path, "w", newline="", encoding=encoding)
+        self._writer = csv.DictWriter(self._file, fieldnames=columns, extrasaction="ignore")
+        self._writer.writeheader()
+
+    def write(self, row):
+        self._writer.writerow({c: _cell(row.get(c)) for c in self._writer.fieldnames})
+
+    def close(self):
+        self._file.close()
+
+
+class XlsxSink:
+    """openpyxl write-only 모드: 행을 바로 시트 XML로 흘려 보내므로 행 수와 관계없이 메모리 일정"""
+
+    def __init__(self, path, columns, sheet_name="Sheet1"):
+        from openpyxl import Workbook
+        self._path = path
+        self._columns = columns
+        self._workbook = Workbook(write_only=True)
+        self._sheet = self._workbook.create_sheet(sheet_name)
+        self._sheet.append(list(columns))
+
+    def write(self, row):
+        self._sheet.append([_cell(row.get(c)) for c in self._columns])
+
+    def close(self):
+        self._workbook.save(self._path)
+
+
+class ParquetSink:
+    """ROW_GROUP_SIZE행씩 모아 행 그룹 단위로 기록 (열은 모두 문자열, 빈 값은 null)"""
+
+    def __init__(self, path, columns, row_group_size=ROW_GROUP_SIZE):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        self._pa = pa
+        self._columns = columns
+        self._schema = pa.schema([(c, pa.string()) for c in columns])
+        self._writer = pq.ParquetWriter(path, self._schema, compression="zstd")
+        self._row_group_size = row_group_size
+        self._buffer = {c: [] for c in columns}
+        self._buffered = 0
+
+    def write(self, row):
+        for c in self._columns:
+            value = _cell(row.get(c))
+            self._buffer[c].append(None if value is None else str(value))
+        self._buffered += 1
+        if self._buffered >= self._row_group_size:
+            self._flush()
+
+    def _flush(self):
+        if self._buffered:
+            self._writer.write_table(self._pa.Table.from_pydict(self._buffer, schema=self._schema))
+            self._buffer = {c: [] for c in self._columns}
+            self._buffered = 0
+
+    def close(self):
+        self._flush()
+        self._writer.close()
+
+
+class JsonlSink:
+    def __init__(self, path, columns):
+        self._file = open(path, "w", encoding="utf-8")
+        self._columns = columns
+
+    def write(self, row):
+        record = {c: _cell(row.get(c)) for c in self._columns}
+        self._file.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+
+    def close(self):
+        self._file.close()
+
+
+SINKS = {"csv": CsvSink, "xlsx": XlsxSink, "parquet": ParquetSink, "jsonl": JsonlSink}
+# 형식별로 받는 옵션 (export()에 준 옵션 중 해당 형식 것만 전달)
+SINK_OPTIONS = {"csv": {"encoding"}, "xlsx": {"sheet_name"}, "parquet": {"row_group_size"}, "jsonl": set()}
+
+
+def _format_of(file_name):
+    ext = os.path.splitext(file_name)[1].lstrip(".").lower()
+    if ext not in SINKS:
+        raise ValueError(f"지원하지 않는 내보내기 형식: {file_name}")
+    return ext
+
+
+def export(file_name, rows, columns, extra_formats=None, **options):
+    """행 dict 이터레이터를 파일로 기록 → 기록한 행 수
+
+    - 형식은 확장자로 결정 (.csv / .xlsx / .parquet / .jsonl), 열 순서는 columns 그대로 (없는 열은 빈 칸)
+    - 행을 한 번만 순회하며 바로 기록하므로 결과 전체를 메모리에 모으지 않음
+    - 임시 파일에 다 쓴 뒤 이름을 바꾸므로 중간에 실패해도 기존 파일은 그대로 남음
+    - extra_formats(기본: NEWSBOT_EXPORT_FORMATS)의 형식도 같은 이름·다른 확장자로 함께 기록
+    """
+    columns = list(columns)
+    base = os.path.splitext(file_name)[0]
+    targets = {file_name: _format_of(file_name)}
+    for fmt in (EXTRA_FORMATS if extra_formats is None else extra_formats):
+        if fmt in SINKS:
+            targets.setdefault(f"{base}.{fmt}", fmt)
+
+    tag = f"{os.getpid()}.{threading.get_ident()}"
+    opened = []
+    count = 0
+    try:
+        for path, fmt in targets.items():
+            tmp = f"{path}.{tag}.tmp"
+            accepted = {k: v for k, v in options.items() if k in SINK_OPTIONS[fmt]}
+            opened.append((path, tmp, SINKS[fmt](tmp, columns, **accepted)))
+        for row in rows:
+            for _, _, sink in opened:
+                sink.write(row)
+            count += 1
+        for _, _, sink in opened:
+            sink.close()
+    except BaseException:
+        for _, tmp, sink in opened:
+            try:
+                sink.close()
+            except Exception:
+                pass
+            if os.path.exists(tmp):
+                os.remove(tmp)
+        raise
+    for path, tmp, _ in opened:
+        os.replace(tmp, path)
+    return count
+
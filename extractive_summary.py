@@ -0,0 +1,170 @@
+import argparse
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+import numpy as np
+from scipy import sparse
+from fr_text_store import RawTextStore, read_raw_text
+from instrumentation import add_profile_arg, collector_run, stage
+from exporters import export
+
+TOP_K = 3                 # 요약으로 뽑을 문장 수
+MIN_WORDS = 6             # 이보다 짧은 문장(제목/조항 번호)은 후보에서 제외
+MAX_CHARS = 600           # 이보다 긴 문장(표/목록이 한 줄로 붙은 것)은 후보에서 제외
+MAX_SENTENCES = 400       # 긴 문서는 중심 문장 상위 N개만 TextRank에 넣음 (유사도 행렬이 N²으로 커지는 것 방지)
+DAMPING = 0.85
+ITERATIONS = 50
+TOLERANCE = 1e-6
+PARALLEL_MIN = 32         # 이보다 적은 문서는 프로세스 풀 없이 바로 처리
+WORKERS = int(os.environ.get("SUMMARY_WORKERS", "0")) or os.cpu_count() or 1
+
+# 문장 끝(. ! ?) 뒤 공백 + 대문자/숫자/따옴표, 또는 한·중·일 문장부호, 또는 빈 줄
+_BOUNDARY = re.compile(r"(?<=[.!?])[\"')\]]*\s+(?=[A-Z0-9\"'(])|(?<=[。！？])\s*|\n\s*\n")
+# 마침표로 끝나지만 문장 끝이 아닌 약어 (Sec. 2, U.S.C., No. 14148, E.O. 등)
+_ABBREVIATION = re.compile(r"(?:\b(?:Sec|Secs|No|Nos|Pub|Stat|Fed|Reg|Dr|Mr|Ms|Mrs|St|Inc|Co|Corp|Jan|Feb|Mar|Apr"
+                           r"|Jun|Jul|Aug|Sept?|Oct|Nov|Dec|e\.g|i\.e|al|etc|vs?|U\.S\.C?|E\.O)|\b[A-Z]|\bSecs?\. \d+[a-z]?)\.$")
+_WORD = re.compile(r"[a-z][a-z0-9\-]+|[가-힣]{2,}")
+STOPWORDS = frozenset("""
+a an and are as at be been by for from has have in is it its of on or that the their this to was were will with
+shall such any all other under may which not these those each than into also including within upon
+""".split())
+
+
+def split_sentences(text):
+    """원문 → 문장 목록 (줄바꿈으로 끊긴 문장은 이어 붙이고, 약어 뒤에서는 자르지 않음)"""
+    sentences, pending = [], ""
+    for piece in _BOUNDARY.split(text or ""):
+        piece = " ".join(piece.split())
+        if not piece:
+            continue
+        pending = f"{pending} {piece}" if pending else piece
+        if not _ABBREVIATION.search(pending):
+            sentences.append(pending)
+            pending = ""
+    if pending:
+        sentences.append(pending)
+    return sentences
+
+
+def _tfidf(sentences):
+    """문장 × 단어 TF-IDF 희소 행렬 (행은 L2 정규화) - 빈 행렬이면 None"""
+    vocabulary, lengths, cols = {}, [], []
+    for sentence in sentences:
+        ids = [vocabulary.setdefault(w, len(vocabulary)) for w in _WORD.findall(sentence.lower()) if w not in STOPWORDS]
+        lengths.append(len(ids))
+        cols += ids
+    if not vocabulary:
+        return None
+    rows = np.repeat(np.arange(len(sentences)), lengths)
+    counts = sparse.csr_matrix((np.ones(len(cols), dtype=np.float32), (rows, cols)),
+                               shape=(len(sentences), len(vocabulary)))
+    counts.sum_duplicates()
+    counts.data = 1.0 + np.log(counts.data)
+    df = np.bincount(counts.indices, minlength=len(vocabulary))
+    idf = np.log((1.0 + len(sentences)) / (1.0 + df)) + 1.0
+    matrix = counts.multiply(idf.astype(np.float32)).tocsr()
+    norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+    norms[norms == 0] = 1.0
+    return sparse.diags(1.0 / norms) @ matrix
+
+
+def textrank(matrix):
+    """정규화된 TF-IDF 행렬 → 문장별 TextRank 점수 (코사인 유사도 그래프의 PageRank)"""
+    n = matrix.shape[0]
+    similarity = (matrix @ matrix.T).tocsr()
+    similarity.setdiag(0)
+    similarity.eliminate_zeros()
+    out_weight = np.asarray(similarity.sum(axis=1)).ravel()
+    dangling = out_weight == 0
+    out_weight[dangling] = 1.0
+    transition = (sparse.diags(1.0 / out_weight) @ similarity).T.tocsr()
+    scores = np.full(n, 1.0 / n)
+    for _ in range(ITERATIONS):
+        updated = (1 - DAMPING) / n + DAMPING * (transition @ scores + scores[dangling].sum() / n)
+        if np.abs(updated - scores).sum() < TOLERANCE:
+            return updated
+        scores = updated
+    return scores
+
+
+def summarize(text, k=TOP_K):
+    """원문에서 핵심 문장 k개를 원래 순서대로 뽑아 줄바꿈으로 이어 반환 (뽑을 문장이 없으면 빈 문자열)"""
+    sentences = [s for s in split_sentences(text) if len(s.split()) >= MIN_WORDS and len(s) <= MAX_CHARS]
+    if len(sentences) <= k:
+        return "\n".join(sentences)
+    matrix = _tfidf(sentences)
+    if matrix is None:
+        return "\n".join(sentences[:k])
+
+    positions = np.arange(len(sentences))
+    if len(sentences) > MAX_SENTENCES:
+        # 문서 전체 중심 벡터와 가까운 문장만 남김
+        centrality = matrix @ np.asarray(matrix.sum(axis=0)).ravel()
+        positions = np.sort(np.argpartition(-centrality, MAX_SENTENCES)[:MAX_SENTENCES])
+        matrix = matrix[positions]
+
+    scores = textrank(matrix)
+    top = np.sort(positions[np.argsort(-scores, kind="stable")[:k]])
+    return "\n".join(sentences[i] for i in top)
+
+
+def _summarize_stored(document_number, root, k):
+    text = read_raw_text(root, document_number)
+    return summarize(text, k) if text else ""
+
+
+def _map(func, items, workers):
+    """문서가 많으면 프로세스 풀로 나눠 처리 (입력 순서 유지)"""
+    workers = max(1, workers or WORKERS)
+    if workers == 1 or len(items) < PARALLEL_MIN:
+        return [func(item) for item in items]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(func, items, chunksize=max(1, len(items) // (workers * 8))))
+
+
+def summarize_many(texts, k=TOP_K, workers=None):
+    """원문 목록 → 요약 목록"""
+    with stage("summarize"):
+        return _map(partial(summarize, k=k), list(texts), workers)
+
+
+def summarize_documents(document_numbers, store=None, k=TOP_K, workers=None):
+    """원문 저장소의 문서번호 목록 → {문서번호: 요약} (원문이 없는 문서는 빈 문자열)
+
+    작업 프로세스가 저장소 파일을 직접 읽으므로 원문을 프로세스 사이로 넘기지 않습니다.
+    """
+    root = (store or RawTextStore()).root
+    numbers = list(dict.fromkeys(n for n in document_numbers if n))
+    with stage("summarize"):
+        return dict(zip(numbers, _map(partial(_summarize_stored, root=root, k=k), numbers, workers)))
+
+
+def main(listing, file_name, k=TOP_K, workers=None):
+    """보관된 관보 목록의 원문을 모두 요약해 CSV로 저장 (네트워크 사용 없음)"""
+    store = RawTextStore()
+    documents = store.load_listing(listing)
+    if documents is None:
+        print(f"❌ 보관된 목록({listing})이 없습니다. 먼저 수집기를 온라인으로 한 번 실행하세요.")
+        return
+    numbers = [doc.get('document_number') for doc in documents if store.has(doc.get('document_number') or '')]
+    print(f"🧾 {listing}: 원문 {len(numbers)}/{len(documents)}건 요약 (문장 {k}개, 프로세스 {workers or WORKERS}개)")
+    summaries = summarize_documents(numbers, store, k=k, workers=workers)
+
+    rows = ({"발행일": doc.get('publication_date'), "제목": doc.get('title'), "문서번호": doc.get('document_number'),
+             "요약내용": summaries[doc.get('document_number')], "링크": doc.get('html_url')}
+            for doc in documents if doc.get('document_number') in summaries)
+    with stage("write"):
+        export(file_name, rows, ["발행일", "제목", "문서번호", "요약내용", "링크"])
+    print(f"🏁 완료! {len(summaries)}건 요약 → {file_name}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="관보 원문 추출 요약 (로컬 CPU, 네트워크 없음)")
+    parser.add_argument("--listing", default="trump_eo_2025", help="원문 저장소에 보관된 목록 이름")
+    parser.add_argument("--out", default="trump_2025_summaries.csv", help="결과 CSV 파일")
+    parser.add_argument("-k", type=int, default=TOP_K, help="요약 문장 수")
+    parser.add_argument("--workers", type=int, help="작업 프로세스 수 (기본: CPU 수)")
+    add_profile_arg(parser)
+    args = parser.parse_args()
+    with collector_run("extractive_summary"):
+        main(args.listing, args.out, k=args.k, workers=args.workers)
@@ -0,0 +1,296 @@
+import argparse
+import csv
+import hashlib
+import os
+import threading
+import time
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pa_csv
+import pyarrow.ipc as ipc
+from cache_paths import cache_path
+from date_normalizer import normalize_date, parse_date
+from instrumentation import add_profile_arg, collector_run, stage
+from search_index import ARCHIVE_DIR
+
+FORMAT_VERSION = "2"      # 캐시 열 구성을 바꾸면 올려서 기존 캐시를 버리게 함
+ARCHIVES = ("Federal_Register_2025_Final.csv", "Federal_Register_2025_By_Agency.csv")
+DATE_COLUMN = "발행일"
+AGENCY_COLUMN = "발행부처"
+TYPE_COLUMN = "문서종류"
+AGENCY_LIST_COLUMN = "기관목록"   # 캐시에만 있는 열: 발행부처를 기관별로 나눈 ID 목록
+# 여러 부처가 함께 낸 문서는 "Justice Department, Drug Enforcement Administration, …" 처럼 이어 붙어 있음
+AGENCY_SEPARATOR = ", "
+# 이름 자체에 ", "가 들어 있는 관보 기관 (API agencies 목록의 도치형 이름) - 나눈 조각을 다시 이어 붙임
+COMMA_AGENCIES = frozenset({
+    "Trade Representative, Office of United States",
+})
+_MAX_COMMA_PARTS = max(name.count(AGENCY_SEPARATOR) for name in COMMA_AGENCIES) + 1
+
+
+def _sha1(path):
+    digest = hashlib.sha1()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def cache_file_for(source):
+    return cache_path(f"{os.path.splitext(os.path.basename(source))[0]}.arrow")
+
+
+def _dates(column):
+    """문자열 열 → date32 (모두 ISO 형식이면 한 번에 변환, 아니면 값마다 해석하고 실패는 null)"""
+    try:
+        return pc.cast(column, pa.date32())
+    except (pa.ArrowInvalid, pa.ArrowNotImplementedError):
+        return pa.array([parse_date(value) for value in column.to_pylist()], pa.date32())
+
+
+def split_agencies(cell):
+    """발행부처 문자열 → 기관 이름 목록 (순서 유지, 중복 제거, COMMA_AGENCIES는 한 기관으로)"""
+    parts = [part.strip() for part in (cell or "").split(AGENCY_SEPARATOR)]
+    names, i = [], 0
+    while i < len(parts):
+        for width in range(min(_MAX_COMMA_PARTS, len(parts) - i), 0, -1):
+            name = AGENCY_SEPARATOR.join(parts[i:i + width])
+            if width == 1 or name in COMMA_AGENCIES:
+                break
+        if name:
+            names.append(name)
+        i += width
+    return list(dict.fromkeys(names))
+
+
+def _agency_lists(encoded):
+    """사전 인코딩된 발행부처 → 기관 ID 목록 (기관 이름 사전 하나를 모든 행이 공유, 한 행 안의 중복은 제거)
+
+    서로 다른 발행부처 문자열(수백 개)만 나눈 뒤, 행에는 그 결과를 코드로 펼쳐 붙임
+    """
+    vocabulary, exploded = {}, []
+    for cell in encoded.dictionary.to_pylist():
+        exploded.append([vocabulary.setdefault(name, len(vocabulary)) for name in split_agencies(cell)])
+    counts = np.array([len(ids) for ids in exploded], dtype=np.int64)
+    starts = np.concatenate([[0], np.cumsum(counts)[:-1]]).astype(np.int64)
+    flat = np.array([i for ids in exploded for i in ids], dtype=np.int32)
+
+    codes = encoded.indices.to_numpy(zero_copy_only=False)
+    lengths = counts[codes]
+    offsets = np.concatenate([[0], np.cumsum(lengths)])
+    position = np.arange(offsets[-1]) - np.repeat(offsets[:-1], lengths)
+    ids = flat[np.repeat(starts[codes], lengths) + position]
+    values = pa.DictionaryArray.from_arrays(pa.array(ids, pa.int32()), pa.array(list(vocabulary), pa.string()))
+    return pa.ListArray.from_arrays(pa.array(offsets.astype(np.int32)), values)
+
+
+def build_cache(source, target, digest=None):
+    """CSV를 한 번 읽어 열 단위 캐시(압축 없는 Arrow IPC 파일)로 기록
+
+    - 발행일은 date32, 발행부처/문서종류는 사전 인코딩(정수 코드 + 값 목록)
+    - 발행부처는 기관별로 나눠 기관목록(list<dictionary>) 열을 추가
+    - 원본 해시/크기/수정 시각은 스키마 메타데이터에 기록
+    """
+    with open(source, newline="", encoding="utf-8-sig") as f:
+        header = next(csv.reader(f), [])
+    with stage("parse"):
+        table = pa_csv.read_csv(source, convert_options=pa_csv.ConvertOptions(
+            column_types={name: pa.string() for name in header}, strings_can_be_null=False))
+
+    columns, fields = {}, []
+    for name in table.column_names:
+        column = table.column(name).combine_chunks()
+        if name == DATE_COLUMN:
+            column = _dates(column)
+        elif name in (AGENCY_COLUMN, TYPE_COLUMN):
+            column = column.dictionary_encode()
+        columns[name] = column
+        fields.append(pa.field(name, column.type))
+    if AGENCY_COLUMN in columns:
+        columns[AGENCY_LIST_COLUMN] = _agency_lists(columns[AGENCY_COLUMN])
+        fields.append(pa.field(AGENCY_LIST_COLUMN, columns[AGENCY_LIST_COLUMN].type))
+
+    schema = pa.schema(fields, metadata=_stamp(source, digest or _sha1(source)))
+    _write(pa.Table.from_arrays(list(columns.values()), schema=schema), target)
+
+
+def _stamp(source, digest):
+    stat = os.stat(source)
+    return {"version": FORMAT_VERSION, "source_sha1": digest,
+            "source_size": str(stat.st_size), "source_mtime_ns": str(stat.st_mtime_ns)}
+
+
+def _write(table, target):
+    """임시 파일에 다 쓴 뒤 이름을 바꿈 (이미 메모리 맵으로 열린 이전 캐시는 그대로 유효)"""
+    tmp = f"{target}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with stage("write"), ipc.new_file(tmp, table.schema) as writer:
+            writer.write_table(table)
+        os.replace(tmp, target)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+
+def _cache_metadata(target):
+    """캐시 파일의 메타데이터 (없거나 깨졌으면 None) - 스키마만 읽으므로 데이터는 건드리지 않음"""
+    try:
+        with pa.memory_map(target) as source:
+            metadata = ipc.open_file(source).schema.metadata or {}
+    except (OSError, pa.ArrowInvalid):
+        return None
+    return {k.decode(): v.decode() for k, v in metadata.items()}
+
+
+class FRArchive:
+    """관보 보관 CSV의 열 단위 캐시를 메모리 맵으로 연 것
+
+    - table: pyarrow Table (파일 페이지를 그대로 가리키므로 읽기 비용이 행 수와 무관)
+    - filter(): 발행부처(기관 단위, 부분 일치)/문서종류(부분 일치)/기간으로 거름 - 문자열 비교는
+      사전의 값 목록에서만 하고, 행은 정수 코드와 date32 값으로만 고름
+    """
+
+    def __init__(self, table, source=None):
+        self.table = table
+        self.source = source
+
+    @classmethod
+    def open(cls, target, source=None):
+        with pa.memory_map(target) as mapped:
+            table = ipc.open_file(mapped).read_all()
+        return cls(table, source)
+
+    def __len__(self):
+        return self.table.num_rows
+
+    @property
+    def agencies(self):
+        """기관 ID → 기관 이름"""
+        column = self.table.column(AGENCY_LIST_COLUMN)
+        return column.chunk(0).values.dictionary.to_pylist() if column.num_chunks else []
+
+    def _agency_mask(self, wanted):
+        masks = []
+        for chunk in self.table.column(AGENCY_LIST_COLUMN).chunks:
+            hit = np.isin(chunk.flatten().indices.to_numpy(zero_copy_only=False), wanted)
+            rows = np.zeros(len(chunk), dtype=bool)
+            rows[pc.list_parent_indices(chunk).to_numpy()[hit]] = True
+            masks.append(rows)
+        return np.concatenate(masks) if masks else np.zeros(0, dtype=bool)
+
+    def _code_mask(self, name, text):
+        """사전 인코딩 열에서 text를 포함하는 값의 코드만 골라 행 마스크로"""
+        needle = text.lower()
+        masks = []
+        for chunk in self.table.column(name).chunks:
+            wanted = [i for i, value in enumerate(chunk.dictionary.to_pylist()) if needle in value.lower()]
+            masks.append(np.isin(chunk.indices.to_numpy(zero_copy_only=False), wanted))
+        return np.concatenate(masks) if masks else np.zeros(0, dtype=bool)
+
+    def mask(self, agency=None, doc_type=None, since=None, until=None):
+        """조건에 맞는 행의 bool 배열 (조건은 모두 AND)"""
+        selected = np.ones(len(self), dtype=bool)
+        if agency:
+            needle = agency.lower()
+            wanted = [i for i, name in enumerate(self.agencies) if needle in name.lower()]
+            selected &= self._agency_mask(wanted)
+        if doc_type:
+            selected &= self._code_mask(TYPE_COLUMN, doc_type)
+        dates = self.table.column(DATE_COLUMN)
+        for bound, compare in ((since, pc.greater_equal), (until, pc.less_equal)):
+            if bound:
+                day = parse_date(normalize_date(bound, default=bound))
+                if day:
+                    selected &= pc.fill_null(compare(dates, pa.scalar(day, pa.date32())), False).to_numpy()
+        return selected
+
+    def filter(self, **conditions):
+        return self.table.filter(pa.array(self.mask(**conditions)))
+
+    def agency_counts(self, mask=None):
+        """[(기관 이름, 문서 수)] 많은 순 (공동 발행 문서는 참여 기관마다 한 번씩)"""
+        counts = np.zeros(len(self.agencies), dtype=np.int64)
+        start = 0
+        for chunk in self.table.column(AGENCY_LIST_COLUMN).chunks:
+            ids = chunk.flatten().indices.to_numpy(zero_copy_only=False)
+            if mask is not None:
+                ids = ids[mask[start:start + len(chunk)][pc.list_parent_indices(chunk).to_numpy()]]
+            counts += np.bincount(ids, minlength=len(counts))
+            start += len(chunk)
+        names = self.agencies
+        return [(names[i], int(counts[i])) for i in np.argsort(-counts, kind="stable") if counts[i]]
+
+
+stats = {"opened": 0, "rebuilt": 0, "hashed": 0}
+_shared = {}
+_shared_lock = threading.Lock()
+
+def load_archive(file_name, directory=ARCHIVE_DIR, target=None):
+    """보관 CSV → FRArchive (CSV가 없으면 None)
+
+    캐시는 원본 크기/수정 시각이 같으면 그대로 쓰고, 다르면 원본 해시를 비교해 내용이 바뀐 경우에만 다시 만듦
+    (내용은 같고 수정 시각만 바뀌었으면 CSV를 다시 읽지 않고 캐시의 기록만 고쳐 다음부터 해시를 건너뜀)
+    """
+    source = os.path.join(directory, file_name)
+    if not os.path.exists(source):
+        return None
+    target = target or cache_file_for(source)
+    stat = os.stat(source)
+    metadata = _cache_metadata(target)
+    fresh = metadata is not None and metadata.get("version") == FORMAT_VERSION
+    digest = None
+    if fresh and (metadata.get("source_size"), metadata.get("source_mtime_ns")) != (str(stat.st_size), str(stat.st_mtime_ns)):
+        stats["hashed"] += 1
+        digest = _sha1(source)
+        fresh = digest == metadata.get("source_sha1")
+        if fresh:
+            _write(FRArchive.open(target).table.replace_schema_metadata(_stamp(source, digest)), target)
+    if not fresh:
+        stats["rebuilt"] += 1
+        build_cache(source, target, digest)
+    stats["opened"] += 1
+    with stage("load"):
+        return FRArchive.open(target, source)
+
+
+def get_fr_archive(file_name=ARCHIVES[0], directory=ARCHIVE_DIR):
+    """프로세스 전체에서 보관 파일별 FRArchive를 공유 (원본이 바뀌었으면 다시 엶)"""
+    with _shared_lock:
+        source = os.path.join(directory, file_name)
+        stamp = os.stat(source).st_mtime_ns if os.path.exists(source) else None
+        cached = _shared.get(source)
+        if cached is None or cached[0] != stamp:
+            _shared[source] = (stamp, load_archive(file_name, directory))
+        return _shared[source][1]
+
+
+def report():
+    print(f"🗃️ 관보 열 캐시: 열기 {stats['opened']}회 | 다시 만듦 {stats['rebuilt']}회 | 원본 해시 확인 {stats['hashed']}회")
+
+
+def main(file_name, agency=None, doc_type=None, since=None, until=None, top=15):
+    started = time.perf_counter()
+    archive = load_archive(file_name)
+    if archive is None:
+        print(f"❌ 보관 파일({file_name})이 없습니다.")
+        return
+    loaded = time.perf_counter() - started
+    mask = archive.mask(agency=agency, doc_type=doc_type, since=since, until=until)
+    print(f"📚 {file_name}: {len(archive)}건 중 {int(mask.sum())}건 선택 (기관 {len(archive.agencies)}개, 열기 {loaded * 1000:.0f} ms)")
+    for name, count in archive.agency_counts(mask)[:top]:
+        print(f"   - {name}: {count}건")
+    report()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="관보 보관 CSV를 열 단위 캐시로 열어 기관별 집계")
+    parser.add_argument("file", nargs="?", default=ARCHIVES[0], choices=ARCHIVES)
+    parser.add_argument("--agency", help="발행부처 (기관 단위, 부분 일치)")
+    parser.add_argument("--type", dest="doc_type", help="문서종류 (부분 일치)")
+    parser.add_argument("--since", help="이 날짜 이후")
+    parser.add_argument("--until", help="이 날짜 이전")
+    parser.add_argument("--top", type=int, default=15, help="출력할 기관 수")
+    add_profile_arg(parser)
+    args = parser.parse_args()
+    with collector_run("fr_archive"):
+        main(args.file, args.agency, args.doc_type, args.since, args.until, args.top)
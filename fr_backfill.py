@@ -0,0 +1,176 @@
+import argparse
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import date, timedelta
+from http_client import get_http_client
+from rate_limiter import TokenBucket
+from exporters import export
+
+API_URL = "https://www.federalregister.gov/api/v1/documents.json"
+DEFAULT_FIELDS = ["title", "publication_date", "type", "agency_names", "html_url", "document_number"]
+PER_PAGE = 1000          # API가 허용하는 최대 페이지 크기
+RESULT_LIMIT = 10000     # API가 한 검색에 돌려주는 최대 결과 수 (넘으면 잘림)
+INITIAL_DAYS = 31        # 처음 나누는 구간 길이 (일)
+MAX_WORKERS = 4
+REQUESTS_PER_SEC = 4.0   # 전체 작업이 나눠 쓰는 요청 예산
+RETRIES = 3
+
+
+class BackfillIncomplete(RuntimeError):
+    """일부 구간/페이지를 끝내 받지 못함 - 받은 문서(docs)와 실패 구간(failed: [(시작, 끝)])을 함께 전달"""
+
+    def __init__(self, docs, failed):
+        self.docs = docs
+        self.failed = sorted(set(failed))
+        super().__init__(f"실패 구간 {len(self.failed)}개 (가장 이른 시작 {self.failed[0][0]})")
+
+
+class FederalRegisterBackfill:
+    """임의 기간의 Federal Register 문서를 구간 분할 + 동시 요청으로 빠짐없이 수집
+
+    - [start, end) 기간을 INITIAL_DAYS 단위로 나누고, 첫 페이지의 count가 RESULT_LIMIT를 넘는
+      구간은 반으로 쪼개 다시 조회 (하루짜리 구간이 넘치면 경고 후 가능한 만큼만 수집)
+    - 첫 페이지 이후의 페이지와 쪼갠 구간은 모두 하나의 스레드 풀에서 동시에 처리
+    - 모든 요청은 하나의 토큰 버킷(초당 requests_per_sec)을 공유
+    - 결과는 문서번호로 중복 제거 후 (발행일, 문서번호) 순으로 정렬해 실행마다 동일
+    - 재시도 후에도 실패한 구간/페이지가 있으면 받은 문서와 함께 BackfillIncomplete를 던짐
+      (부분 결과를 완전한 결과로 착각해 워터마크를 넘기는 일이 없도록)
+    """
+
+    def __init__(self, conditions=None, fields=None, max_workers=MAX_WORKERS,
+                 requests_per_sec=REQUESTS_PER_SEC, per_page=PER_PAGE, result_limit=RESULT_LIMIT,
+                 session=None):
+        self.conditions = dict(conditions or {})
+        self.fields = fields or DEFAULT_FIELDS
+        self.max_workers = max_workers
+        self.per_page = per_page
+        self.result_limit = result_limit
+        self.bucket = TokenBucket(requests_per_sec, max(1.0, requests_per_sec))
+        self.session = session or get_http_client()   # 공유 클라이언트 (keep-alive 연결 풀, 압축, 호스트별 통계)
+        self._lock = threading.Lock()
+        self.stats = {"requests": 0, "partitions": 0, "splits": 0, "truncated": [], "failed": []}
+
+    def _get(self, start, end, page):
+        params = dict(self.conditions)
+        params.update({
+            "conditions[publication_date][gte]": start.isoformat(),
+            "conditions[publication_date][lt]": end.isoformat(),
+            "per_page": self.per_page,
+            "page": page,
+            "order": "oldest",
+            "fields[]": self.fields,
+        })
+        for attempt in range(1, RETRIES + 1):
+            self.bucket.acquire()
+            with self._lock:
+                self.stats["requests"] += 1
+            try:
+                res = self.session.get(API_URL, params=params, timeout=(10, 60))
+                if res.status_code == 200:
+                    return res.json()
+                error = f"HTTP {res.status_code}"
+            except Exception as e:
+                error = str(e)
+            if attempt < RETRIES:
+                time.sleep(2 ** attempt)   # 재시도 전 점점 길게 대기 (마지막 시도 뒤에는 바로 실패)
+        raise RuntimeError(f"{start}~{end} {page}페이지 실패: {error}")
+
+    def _probe(self, start, end):
+        """구간의 첫 페이지 요청 → ('split', 반쪽 구간들) 또는 ('pages', 결과, 전체 페이지 수)"""
+        data = self._get(start, end, 1)
+        count = data.get("count", 0)
+        if count > self.result_limit:
+            if (end - start).days > 1:
+                mid = start + timedelta(days=(end - start).days // 2)
+                return "split", [(start, mid), (mid, end)]
+            with self._lock:
+                self.stats["truncated"].append((start.isoformat(), count))
+            print(f"⚠️ {start} 하루에 {count}건 → API 한도({self.result_limit}건)까지만 수집")
+        total_pages = min(data.get("total_pages", 1), -(-self.result_limit // self.per_page))
+        return "pages", data.get("results", []), total_pages
+
+    def _page(self, start, end, page):
+        return "results", self._get(start, end, page).get("results", [])
+
+    def run(self, start, end):
+        """[start, end) 기간의 문서 dict 리스트를 반환 (start/end는 date 또는 'YYYY-MM-DD')
+
+        실패한 구간이 하나라도 있으면 BackfillIncomplete (e.docs에 받은 문서, e.failed에 실패 구간)
+        """
+        start, end = _as_date(start), _as_date(end)
+        partitions = []
+        cursor = start
+        while cursor < end:
+            nxt = min(cursor + timedelta(days=INITIAL_DAYS), end)
+            partitions.append((cursor, nxt))
+            cursor = nxt
+
+        docs = {}
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            pending = {pool.submit(self._probe, s, e): ("probe", s, e) for s, e in partitions}
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    kind, s, e = pending.pop(future)
+                    try:
+                        outcome = future.result()
+                    except Exception as ex:
+                        print(f"\n❌ {ex}")
+                        self.stats["failed"].append((s.isoformat(), e.isoformat()))
+                        continue
+                    if outcome[0] == "split":
+                        self.stats["splits"] += 1
+                        for hs, he in outcome[1]:
+                            pending[pool.submit(self._probe, hs, he)] = ("probe", hs, he)
+                        continue
+                    if outcome[0] == "pages":
+                        self.stats["partitions"] += 1
+                        for page in range(2, outcome[2] + 1):
+                            pending[pool.submit(self._page, s, e, page)] = ("page", s, e)
+                    for doc in outcome[1]:
+                        if doc.get("document_number"):
+                            docs[doc["document_number"]] = doc
+                print(f"📥 수집 중... (요청 {self.stats['requests']}회 / 누적: {len(docs)}건)", end="\r", flush=True)
+
+        print(f"\n✅ 백필 완료: {len(docs)}건 | 구간 {self.stats['partitions']}개 (분할 {self.stats['splits']}회) | "
+              f"요청 {self.stats['requests']}회 | 실패 구간 {len(self.stats['failed'])}개")
+        results = sorted(docs.values(), key=lambda d: (d.get("publication_date") or "", d["document_number"]))
+        if self.stats["failed"]:
+            raise BackfillIncomplete(results, self.stats["failed"])
+        return results
+
+
+def _as_date(value):
+    return value if isinstance(value, date) else date.fromisoformat(value)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Federal Register 기간 백필")
+    parser.add_argument("--start", required=True, help="시작일 (포함, YYYY-MM-DD)")
+    parser.add_argument("--end", required=True, help="종료일 (제외, YYYY-MM-DD)")
+    parser.add_argument("--type", action="append", default=[], help="문서 유형 (RULE, PRORULE, NOTICE, PRESDOCU)")
+    parser.add_argument("--agency", action="append", default=[], help="부처 slug (예: commerce-department)")
+    parser.add_argument("--president", help="대통령 slug (예: donald-trump)")
+    parser.add_argument("--workers", type=int, default=MAX_WORKERS)
+    parser.add_argument("--rps", type=float, default=REQUESTS_PER_SEC, help="초당 요청 예산")
+    parser.add_argument("--out", default="Federal_Register_Backfill.csv")
+    args = parser.parse_args()
+
+    conditions = {}
+    if args.type: conditions["conditions[type][]"] = args.type
+    if args.agency: conditions["conditions[agencies][]"] = args.agency
+    if args.president: conditions["conditions[president]"] = args.president
+
+    failed = []
+    try:
+        docs = FederalRegisterBackfill(conditions, max_workers=args.workers, requests_per_sec=args.rps).run(args.start, args.end)
+    except BackfillIncomplete as e:
+        docs, failed = e.docs, e.failed
+    export(args.out, ({**doc, "agency_names": ", ".join(doc.get("agency_names") or [])} for doc in docs), DEFAULT_FIELDS)
+    print(f"💾 '{args.out}'에 {len(docs)}건 저장")
+    if failed:
+        raise SystemExit(f"❌ 받지 못한 구간 {len(failed)}개: " + ", ".join(f"{s}~{e}" for s, e in failed))
+
+if __name__ == "__main__":
+    main()
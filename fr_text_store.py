@@ -0,0 +1,107 @@
+import gzip
+import json
+import os
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from cache_paths import cache_path
+from http_client import get_http_client
+
+MAX_WORKERS = 8        # 동시에 내려받을 원문 수
+TIMEOUT = (10, 60)     # (연결, 읽기) 제한 시간 (초)
+
+
+def raw_text_path(root, document_number):
+    safe = re.sub(r"[^0-9A-Za-z._-]", "_", document_number)
+    return os.path.join(root, f"{safe}.txt.gz")
+
+
+def read_raw_text(root, document_number):
+    """저장소 객체 없이 원문 읽기 (HTTP 클라이언트를 만들지 않으므로 작업 프로세스에서 사용)"""
+    path = raw_text_path(root, document_number)
+    if not os.path.exists(path):
+        return None
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        return f.read()
+
+
+class RawTextStore:
+    """Federal Register 원문(raw_text_url)을 문서번호 기준으로 gzip 압축해 보관하는 로컬 저장소
+
+    관보 원문은 발행 후 바뀌지 않으므로 한 번 받은 문서는 다시 내려받지 않습니다.
+    """
+
+    def __init__(self, root=None, max_workers=MAX_WORKERS, session=None):
+        self.root = root or cache_path("fr_raw_text")
+        os.makedirs(self.root, exist_ok=True)
+        self.max_workers = max_workers
+        self.session = session or get_http_client()
+        self._lock = threading.Lock()
+        self.stats = {"cached": 0, "downloaded": 0, "failed": 0, "bytes": 0}
+
+    def _path(self, document_number):
+        return raw_text_path(self.root, document_number)
+
+    def has(self, document_number):
+        return os.path.exists(self._path(document_number))
+
+    def get(self, document_number):
+        """저장된 원문 반환 (없으면 None)"""
+        return read_raw_text(self.root, document_number)
+
+    def put(self, document_number, text):
+        # 임시 파일에 쓴 뒤 교체해 중간에 끊겨도 깨진 파일이 남지 않게 함
+        path = self._path(document_number)
+        tmp = f"{path}.{threading.get_ident()}.tmp"
+        with gzip.open(tmp, "wt", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(tmp, path)
+
+    def _download(self, document_number, url):
+        try:
+            res = self.session.get(url, timeout=TIMEOUT)
+            if res.status_code != 200:
+                raise ValueError(f"HTTP {res.status_code}")
+            self.put(document_number, res.text)
+            with self._lock:
+                self.stats["downloaded"] += 1
+                self.stats["bytes"] += len(res.content)
+            return True
+        except Exception as e:
+            print(f"⚠️ 원문 다운로드 실패 ({document_number}): {e}")
+            with self._lock:
+                self.stats["failed"] += 1
+            return False
+
+    def sync(self, documents):
+        """[(문서번호, raw_text_url), ...] 중 아직 없는 문서만 동시에 내려받음"""
+        missing = []
+        for document_number, url in documents:
+            if not document_number or not url:
+                continue
+            if self.has(document_number):
+                self.stats["cached"] += 1
+            else:
+                missing.append((document_number, url))
+
+        if missing:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+                list(pool.map(lambda item: self._download(*item), missing))
+        print(f"📦 원문 저장소: 보유 {self.stats['cached']}건 | 신규 {self.stats['downloaded']}건 "
+              f"({self.stats['bytes'] / 1024:.0f} KB) | 실패 {self.stats['failed']}건")
+        return self.stats
+
+    # 📋 API 목록 응답도 함께 보관해 두면 재분류 시 네트워크가 전혀 필요 없음
+    def save_listing(self, name, documents):
+        path = os.path.join(self.root, f"{name}.json")
+        tmp = f"{path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(documents, f, ensure_ascii=False)
+        os.replace(tmp, path)
+
+    def load_listing(self, name):
+        path = os.path.join(self.root, f"{name}.json")
+        if not os.path.exists(path):
+            return None
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
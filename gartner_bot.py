@@ -1,7 +1,10 @@
-import requests
+import os
 import xml.etree.ElementTree as ET
-import csv
 from urllib.parse import quote
+from date_normalizer import normalize_date
+from http_client import get_http_client
+from instrumentation import collector_run, stage
+from exporters import export
 
 def crawl_gartner_final():
     # 1. 검색 키워드 최적화: 가트너 공식 보도자료 위주
@@ -20,15 +23,18 @@ def crawl_gartner_final():
 
     try:
         # RSS 피드 요청
-        response = requests.get(rss_url, headers=headers, timeout=20)
-        
-        if response.status_code == 200:
+        response = get_http_client().get(rss_url, headers=headers, timeout=20, conditional=True)
+
+        if response.status_code == 304 and os.path.exists(file_name):
+            print("💤 피드 변경 없음 (304) → 기존 파일을 그대로 둡니다.")
+            return
+        if response.status_code in (200, 304):
             root = ET.fromstring(response.content)
             # RSS 아이템 순회 (최신 10~15개)
             for item in root.findall('.//item')[:15]:
                 title = item.find('title').text
                 link = item.find('link').text
-                pub_date = item.find('pubDate').text
+                pub_date = normalize_date(item.find('pubDate').text)
                 
                 # 가트너 공식 도메인이 포함된 결과만 엄선
                 if "gartner.com" in link.lower() or "gartner" in title.lower():
@@ -40,10 +46,8 @@ def crawl_gartner_final():
 
             if all_data:
                 # CSV 저장 (엑셀 깨짐 방지 utf-8-sig)
-                with open(file_name, 'w', newline='', encoding='utf-8-sig') as f:
-                    writer = csv.DictWriter(f, fieldnames=["date", "title", "link"])
-                    writer.writeheader()
-                    writer.writerows(all_data)
+                with stage("write"):
+                    export(file_name, all_data, ["date", "title", "link"])
                 print(f"✅ 수집 성공! 총 {len(all_data)}건의 가트너 인사이트 확보.")
                 return
             else:
@@ -55,8 +59,9 @@ def crawl_gartner_final():
         print(f"❌ 실행 중 오류: {e}")
 
     # 실패 시 빈 파일 생성 (워크플로우 에러 방지)
-    with open(file_name, 'w', newline='', encoding='utf-8-sig') as f:
+    with stage("write"), open(file_name, 'w', newline='', encoding='utf-8-sig') as f:
         f.write("date,title,link\n")
 
 if __name__ == "__main__":
-    crawl_gartner_final()
+    with collector_run("gartner"):
+        crawl_gartner_final()
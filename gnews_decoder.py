@@ -0,0 +1,134 @@
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from urllib.parse import urlparse
+from cache_paths import cache_path
+from instrumentation import stage
+from rate_limiter import GOOGLE_NEWS_HOST, default_limiter
+
+NEGATIVE_TTL = 24 * 3600   # 해독 실패 결과는 하루 동안만 기억 (성공 결과는 만료 없음)
+MAX_WORKERS = 4            # 캐시 미스 링크를 동시에 해독할 최대 개수
+
+
+class LinkDecoder:
+    """news.google.com 기사 링크 → 언론사 원본 링크 해독 서비스
+
+    - 성공 결과는 영구 보관, 실패 결과는 NEGATIVE_TTL 동안만 캐시
+    - 캐시 미스는 스레드 풀에서 동시에 해독 (구글 뉴스 토큰 버킷 적용)
+    - 같은 링크를 여러 수집기가 동시에 요청해도 실제 해독은 한 번만 수행
+    """
+
+    def __init__(self, path=None, max_workers=MAX_WORKERS, negative_ttl=NEGATIVE_TTL,
+                 limiter=default_limiter, decoder=None):
+        self.path = path or cache_path("gnews_links.sqlite3")
+        self.negative_ttl = negative_ttl
+        self.limiter = limiter
+        self._decoder = decoder
+        self._pool = ThreadPoolExecutor(max_workers=max_workers)
+        self._inflight = {}
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.path, check_same_thread=False)
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS links (
+                google_url TEXT PRIMARY KEY, decoded_url TEXT, ok INTEGER, checked_at REAL
+            )
+        """)
+        self._db.commit()
+        self.stats = {"requested": 0, "cache_hits": 0, "shared_inflight": 0, "decoded": 0, "failures": 0}
+
+    @property
+    def decoder(self):
+        if self._decoder is None:
+            from googlenewsdecoder import gnewsdecoder
+            self._decoder = gnewsdecoder
+        return self._decoder
+
+    def _lookup(self, url):
+        row = self._db.execute("SELECT decoded_url, ok, checked_at FROM links WHERE google_url = ?",
+                               (url,)).fetchone()
+        if not row:
+            return None
+        decoded_url, ok, checked_at = row
+        if ok:
+            return decoded_url
+        if time.time() - checked_at < self.negative_ttl:
+            return url
+        return None
+
+    def _store(self, url, decoded_url, ok):
+        with self._lock:
+            self.stats["decoded" if ok else "failures"] += 1
+            self._db.execute("INSERT OR REPLACE INTO links VALUES (?, ?, ?, ?)",
+                             (url, decoded_url, int(ok), time.time()))
+            self._db.commit()
+
+    def _decode(self, url):
+        try:
+            self.limiter.acquire(url)
+            decoded = self.decoder(url)
+            decoded_url = decoded.get('decoded_url') if decoded.get('status', True) else None
+        except Exception:
+            decoded_url = None
+        if decoded_url:
+            self._store(url, decoded_url, True)
+            return decoded_url
+        self._store(url, None, False)
+        return url
+
+    def _finish(self, url, future):
+        with self._lock:
+            self._inflight.pop(url, None)
+
+    def submit(self, url):
+        """해독 결과를 담은 Future 반환 (구글 뉴스 링크가 아니면 그대로 통과)"""
+        with self._lock:
+            self.stats["requested"] += 1
+            if not url or (urlparse(url).hostname or "").lower() != GOOGLE_NEWS_HOST:
+                future = Future()
+                future.set_result(url)
+                return future
+            if url in self._inflight:
+                self.stats["shared_inflight"] += 1
+                return self._inflight[url]
+            cached = self._lookup(url)
+            if cached is not None:
+                self.stats["cache_hits"] += 1
+                future = Future()
+                future.set_result(cached)
+                return future
+            future = self._pool.submit(self._decode, url)
+            self._inflight[url] = future
+        future.add_done_callback(lambda f, u=url: self._finish(u, f))
+        return future
+
+    def decode(self, url):
+        return self.submit(url).result()
+
+    def decode_many(self, urls):
+        """입력 순서 그대로 해독된 링크 리스트 반환"""
+        with stage("decode"):
+            futures = [self.submit(url) for url in urls]
+            return [future.result() for future in futures]
+
+    def report(self):
+        s = self.stats
+        print(f"🔗 링크 해독: 요청 {s['requested']}건 | 캐시 적중 {s['cache_hits']}건 | "
+              f"동시 요청 공유 {s['shared_inflight']}건 | 신규 해독 {s['decoded']}건 | 실패 {s['failures']}건")
+
+    def close(self):
+        self._pool.shutdown(wait=True)
+        with self._lock:
+            self._db.close()
+
+
+_shared = None
+_shared_lock = threading.Lock()
+
+def get_link_decoder():
+    """프로세스 전체에서 하나의 링크 해독 서비스를 공유"""
+    global _shared
+    with _shared_lock:
+        if _shared is None:
+            _shared = LinkDecoder()
+        return _shared
@@ -0,0 +1,140 @@
+import sqlite3
+import threading
+import time
+from urllib.parse import urlparse
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from cache_paths import cache_path
+from instrumentation import METRICS
+
+DEFAULT_TIMEOUT = (10, 30)   # (연결, 읽기) 제한 시간 (초) - 호출 시 timeout을 주지 않으면 적용
+POOL_SIZE = 16               # 호스트당 유지할 keep-alive 연결 수
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+
+# brotli 디코더가 설치돼 있을 때만 br을 요청 (없으면 gzip/deflate)
+try:
+    import brotli  # noqa: F401
+    ACCEPT_ENCODING = "gzip, deflate, br"
+except ImportError:
+    try:
+        import brotlicffi  # noqa: F401
+        ACCEPT_ENCODING = "gzip, deflate, br"
+    except ImportError:
+        ACCEPT_ENCODING = "gzip, deflate"
+
+
+class HttpClient:
+    """모든 수집기가 공유하는 HTTP 클라이언트
+
+    - 하나의 Session으로 호스트별 keep-alive 연결 풀 재사용, gzip/brotli 압축 협상
+    - timeout을 주지 않은 요청에도 DEFAULT_TIMEOUT 적용, 일시적 5xx는 자동 재시도
+    - get(url, conditional=True)는 URL별 ETag/Last-Modified를 저장해 두고 조건부 요청을 보냄
+      → 304면 status_code 304 그대로, content에는 지난번 본문을 담아 돌려줌
+    - 호스트별 요청 수/바이트/지연 시간 집계 (report)
+
+    requests.Session.get과 같은 방식으로 호출할 수 있어 session 자리에 그대로 넘길 수 있습니다.
+    """
+
+    def __init__(self, path=None, timeout=DEFAULT_TIMEOUT, pool_size=POOL_SIZE, retries=2, headers=None):
+        self.path = path or cache_path("http_cache.sqlite3")
+        self.timeout = timeout
+        self.session = requests.Session()
+        retry = Retry(total=retries, backoff_factor=0.5, status_forcelist=(502, 503, 504),
+                      allowed_methods=frozenset(["GET", "HEAD"]), raise_on_status=False)
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update({"User-Agent": USER_AGENT, "Accept-Encoding": ACCEPT_ENCODING})
+        if headers:
+            self.session.headers.update(headers)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.path, check_same_thread=False)
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS validators (
+                url TEXT PRIMARY KEY, etag TEXT, last_modified TEXT, body BLOB, fetched_at REAL
+            )
+        """)
+        self._db.commit()
+        self.hosts = {}
+
+    def _record(self, url, res, seconds, size):
+        host = urlparse(url).netloc
+        wire = res.headers.get("Content-Length")
+        with self._lock:
+            h = self.hosts.setdefault(host, {"requests": 0, "not_modified": 0, "bytes": 0,
+                                             "wire_bytes": 0, "seconds": 0.0, "max_seconds": 0.0})
+            h["requests"] += 1
+            h["not_modified"] += res.status_code == 304
+            h["bytes"] += size
+            h["wire_bytes"] += int(wire) if wire and wire.isdigit() else size
+            h["seconds"] += seconds
+            h["max_seconds"] = max(h["max_seconds"], seconds)
+
+    def request(self, method, url, **kwargs):
+        """stream=True면 본문을 읽지 않고 돌려줌 (크기는 Content-Length 기준으로 집계, 지연 시간은 헤더 수신까지)"""
+        kwargs.setdefault("timeout", self.timeout)
+        started = time.perf_counter()
+        res = self.session.request(method, url, **kwargs)
+        seconds = time.perf_counter() - started
+        if kwargs.get("stream"):
+            wire = res.headers.get("Content-Length")
+            size = int(wire) if wire and wire.isdigit() else 0
+        else:
+            size = len(res.content)
+        self._record(url, res, seconds, size)
+        retry_state = getattr(res.raw, "retries", None)
+        METRICS.add_stage("http", seconds)
+        METRICS.observe_http(urlparse(url).netloc, seconds, res.status_code, size,
+                             retries=len(retry_state.history) if retry_state is not None else 0)
+        return res
+
+    def get(self, url, conditional=False, **kwargs):
+        if not conditional:
+            return self.request("GET", url, **kwargs)
+
+        with self._lock:
+            cached = self._db.execute("SELECT etag, last_modified, body FROM validators WHERE url = ?",
+                                      (url,)).fetchone()
+        headers = dict(kwargs.pop("headers", None) or {})
+        if cached:
+            if cached[0]: headers["If-None-Match"] = cached[0]
+            if cached[1]: headers["If-Modified-Since"] = cached[1]
+        res = self.request("GET", url, headers=headers, **kwargs)
+
+        if res.status_code == 304 and cached:
+            res._content = cached[2] or b""   # 304에는 본문이 없으므로 지난번 본문을 채워 둠
+        elif res.status_code == 200 and (res.headers.get("ETag") or res.headers.get("Last-Modified")):
+            with self._lock:
+                self._db.execute("INSERT OR REPLACE INTO validators VALUES (?, ?, ?, ?, ?)",
+                                 (url, res.headers.get("ETag"), res.headers.get("Last-Modified"),
+                                  res.content, time.time()))
+                self._db.commit()
+        return res
+
+    def post(self, url, **kwargs):
+        return self.request("POST", url, **kwargs)
+
+    def report(self):
+        for host, h in sorted(self.hosts.items()):
+            avg = h["seconds"] / h["requests"] if h["requests"] else 0.0
+            print(f"🌐 {host}: 요청 {h['requests']}회 (304 {h['not_modified']}회) | "
+                  f"수신 {h['wire_bytes'] / 1024:.0f} KB (해제 후 {h['bytes'] / 1024:.0f} KB) | "
+                  f"평균 {avg * 1000:.0f} ms / 최대 {h['max_seconds'] * 1000:.0f} ms")
+
+    def close(self):
+        self.session.close()
+        with self._lock:
+            self._db.close()
+
+
+_shared = None
+_shared_lock = threading.Lock()
+
+def get_http_client():
+    """프로세스 전체에서 하나의 HTTP 클라이언트를 공유"""
+    global _shared
+    with _shared_lock:
+        if _shared is None:
+            _shared = HttpClient()
+        return _shared
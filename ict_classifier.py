@@ -0,0 +1,399 @@
+import argparse
+import csv
+import glob
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+import zlib
+import numpy as np
+from scipy import sparse
+from scipy.optimize import minimize
+from cache_paths import cache_path
+from instrumentation import add_profile_arg, collector_run, stage
+from search_index import ARCHIVE_DIR, FRBodies, fr_document_number, tokenize
+
+N_FEATURES = 1 << 18      # 해싱 특징 공간 크기 (단어 + 인접 2-gram)
+L2 = 1.0                  # 가중치 L2 규제 세기
+MAX_ITER = 300            # L-BFGS 최대 반복
+MAX_POS_WEIGHT = 10.0     # 양성 사례가 드문 분류에 주는 최대 가중치
+MIN_POSITIVES = 2         # 이보다 사례가 적은 분류는 학습하지 않음
+THRESHOLD = 0.5           # 기본 판정 기준 (분류별로 덮어쓸 수 있음)
+EVIDENCE_MARGIN = 0.1     # 아는 단어가 하나도 없는 문서의 점수(=사전 확률)보다 이만큼은 높아야 분류로 인정
+HOLDOUT = 0.2             # train 명령이 검증용으로 떼어 두는 비율
+FOLDS = 5                 # 기준값 조정용 교차 검증 겹 수
+MIN_TUNE_POSITIVES = 3    # 교차 검증 양성이 이보다 적은 분류는 조정하지 않고 기본 기준값 사용
+TRUSTED_F1 = 0.6          # 검증 micro-F1이 이보다 낮으면 규칙 분류를 대신할 수 없는 참고용 모델로 취급
+THRESHOLD_GRID = np.round(np.arange(0.05, 0.96, 0.01), 2)
+
+# 분류 체계별 학습 데이터: (파일 패턴, 본문 열들, 분류 열, 링크 열, 분류 없음을 뜻하는 값)
+# 규칙 분류는 제목+본문에 붙은 것이므로, 관보 링크가 있는 행은 원문 저장소에 보관된 초록/원문을 제목에 이어 붙여 학습
+TAXONOMIES = {
+    "ict46": [
+        ("trump_2025_api_report.csv", ("Title",), "Category", "Link", None),
+        ("Trump_ICT_Policy_Inventory_2025.csv", ("Policy_Title",), "ICT_Category", "Link", "General/Other"),
+    ],
+    "ict_refined": [
+        ("Global_ICT_50_Agencies_*.csv", ("제목", "원문"), "ICT 분류", "링크", "기타 ICT 일반"),
+    ],
+}
+
+
+def _hash(token):
+    return zlib.crc32(token.encode("utf-8")) & (N_FEATURES - 1)
+
+
+def featurize(texts):
+    """텍스트 목록 → 해싱 특징 빈도 희소 행렬 (문서 × N_FEATURES)"""
+    indptr, indices = [0], []
+    for text in texts:
+        tokens = tokenize(text)
+        indices += [_hash(t) for t in tokens]
+        indices += [_hash(f"{a} {b}") for a, b in zip(tokens, tokens[1:])]
+        indptr.append(len(indices))
+    matrix = sparse.csr_matrix((np.ones(len(indices), dtype=np.float32), indices, indptr),
+                               shape=(len(indptr) - 1, N_FEATURES))
+    matrix.sum_duplicates()
+    return matrix
+
+
+def _split_labels(value, none_label):
+    labels = [part.strip() for part in (value or "").split(",")]
+    return [label for label in labels if label and label != none_label]
+
+
+class _Bodies:
+    """관보 링크 → 보관된 본문 (저장소는 관보 링크가 처음 나올 때 한 번만 엶)"""
+
+    def __init__(self):
+        self._bodies = None
+
+    def join(self, text, link):
+        if not fr_document_number(link):
+            return text
+        if self._bodies is None:
+            self._bodies = FRBodies()
+        return " ".join(filter(None, [text, self._bodies.body(link)]))
+
+
+def load_examples(taxonomy, directory=ARCHIVE_DIR):
+    """분류 체계의 보관 CSV들 → (텍스트 목록, 분류 목록의 목록, 원본 파일 지문) (링크 기준 중복 제거)"""
+    texts, labels, sources, seen = [], [], {}, set()
+    bodies = _Bodies()
+    for pattern, text_columns, label_column, link_column, none_label in TAXONOMIES[taxonomy]:
+        for path in sorted(glob.glob(os.path.join(directory, pattern))):
+            with open(path, "rb") as f:
+                sources[os.path.basename(path)] = hashlib.sha1(f.read()).hexdigest()
+            with open(path, newline='', encoding='utf-8-sig') as f:
+                for row in csv.DictReader(f):
+                    link = row.get(link_column)
+                    if link and link in seen:
+                        continue
+                    seen.add(link)
+                    text = " ".join(row.get(column) or "" for column in text_columns).strip()
+                    if text:
+                        texts.append(bodies.join(text, link))
+                        labels.append(_split_labels(row.get(label_column), none_label))
+    return texts, labels, sources
+
+
+def _label_matrix(labels, names):
+    column = {label: j for j, label in enumerate(names)}
+    y = np.zeros((len(labels), len(names)), dtype=bool)
+    for i, row in enumerate(labels):
+        for label in row:
+            if label in column:
+                y[i, column[label]] = True
+    return y
+
+
+def _f1(predicted, truth):
+    """bool 행렬 둘 → (micro-F1, TP, FP, FN)"""
+    tp = int((predicted & truth).sum())
+    fp = int((predicted & ~truth).sum())
+    fn = int((~predicted & truth).sum())
+    return (2 * tp / (2 * tp + fp + fn) if tp else 0.0), tp, fp, fn
+
+
+def tune_thresholds(scores, truth, floor):
+    """분류별로 교차 검증 F1이 가장 높은 기준값 (동점이면 더 높은 값)
+
+    floor(아는 단어가 없는 문서의 점수 + EVIDENCE_MARGIN) 아래로는 내리지 않음 - 내리면 학습 자료와 다른
+    관보 제목 대부분에 분류가 붙음. 양성이 MIN_TUNE_POSITIVES보다 적은 분류와, 조정한 값이 교차 검증 F1에서
+    기본 기준값보다 나아지지 않는 분류는 기본 기준값 그대로.
+    """
+    thresholds = np.maximum(THRESHOLD, floor)
+    for j in range(truth.shape[1]):
+        grid = THRESHOLD_GRID[THRESHOLD_GRID >= floor[j]]
+        if truth[:, j].sum() >= MIN_TUNE_POSITIVES and len(grid):
+            column, target = scores[:, j:j + 1], truth[:, j:j + 1]
+            best = max(grid, key=lambda t: (_f1(column >= t, target)[0], t))
+            if _f1(column >= best, target)[0] > _f1(column >= thresholds[j], target)[0]:
+                thresholds[j] = best
+    return thresholds
+
+
+def out_of_fold_scores(texts, labels, names, folds=FOLDS):
+    """K겹 교차 검증 점수 (문서 × names) - 각 문서는 자기를 빼고 학습한 모델로 채점"""
+    scores = np.zeros((len(texts), len(names)))
+    order = list(range(len(texts)))
+    random.Random(0).shuffle(order)
+    for k in range(folds):
+        held = order[k::folds]
+        held_set = set(held)
+        train_idx = [i for i in order if i not in held_set]
+        try:
+            model = ICTClassifier.train([texts[i] for i in train_idx], [labels[i] for i in train_idx])
+        except ValueError:
+            continue   # 이 겹의 학습 부분에 사례가 충분한 분류가 없음 → 점수 0으로 둠
+        fold_scores = model.scores([texts[i] for i in held])
+        for j, label in enumerate(names):
+            if label in model.labels:
+                scores[held, j] = fold_scores[:, model.labels.index(label)]
+    return scores
+
+
+def _fit(x, y, pos_weight, l2=L2, max_iter=MAX_ITER):
+    """분류별 이진 로지스틱 회귀를 한꺼번에 학습 (가중치 행렬 W, 편향 b)"""
+    n, d = x.shape
+    k = y.shape[1]
+    xt = x.T.tocsr()
+    sample_weight = np.where(y > 0, pos_weight, 1.0)
+
+    def loss(params):
+        w = params[:d * k].reshape(d, k)
+        b = params[d * k:]
+        z = x @ w + b
+        # log(1 + e^z) - y·z 를 수치적으로 안정하게
+        value = (sample_weight * (np.logaddexp(0, z) - y * z)).sum() / n + 0.5 * l2 * (w * w).sum() / n
+        g = sample_weight * (1.0 / (1.0 + np.exp(-z)) - y) / n
+        grad_w = xt @ g + l2 * w / n
+        return value, np.concatenate([grad_w.ravel(), g.sum(axis=0)])
+
+    result = minimize(loss, np.zeros(d * k + k), jac=True, method="L-BFGS-B", options={"maxiter": max_iter})
+    return result.x[:d * k].reshape(d, k), result.x[d * k:]
+
+
+class ICTClassifier:
+    """해싱 TF-IDF 특징 + 분류별 로지스틱 회귀 (다중 분류)
+
+    - 가중치는 학습에 등장한 특징 행만 담은 희소 행렬 → 문서 묶음 전체를 행렬 곱 한 번으로 채점
+    - scores()는 분류별 확률을 그대로 돌려주므로 기준값은 수집기를 다시 돌리지 않고 조정 가능
+    - 분류별 기준값은 교차 검증 점수로 조정해(tune_thresholds) 모델 파일에 함께 저장
+    """
+
+    def __init__(self, labels, idf, weights, bias, thresholds=None, meta=None):
+        self.labels = list(labels)
+        self.idf = idf              # (N_FEATURES,)
+        self.weights = weights      # (N_FEATURES × 분류 수) CSR
+        self.bias = bias
+        self.thresholds = np.array([(thresholds or {}).get(label, THRESHOLD) for label in self.labels])
+        self.meta = meta or {}
+
+    @classmethod
+    def train(cls, texts, labels, meta=None, l2=L2):
+        counts = {}
+        for row in labels:
+            for label in row:
+                counts[label] = counts.get(label, 0) + 1
+        names = sorted((label for label, c in counts.items() if c >= MIN_POSITIVES),
+                       key=lambda label: (int(label.split(".")[0]) if label.split(".")[0].isdigit() else 999, label))
+        if not texts or not names:
+            raise ValueError("학습할 분류 사례가 없습니다")
+        y = _label_matrix(labels, names)
+
+        y = y.astype(float)
+
+        counts_matrix = featurize(texts)
+        active = np.unique(counts_matrix.indices)
+        df = np.bincount(counts_matrix.indices, minlength=N_FEATURES)[active]
+        # 학습에 없던 특징도 가장 드문 단어와 같은 IDF를 줌 → 모르는 단어가 많은 문서는 아는 단어 비중이 작아짐
+        idf = np.full(N_FEATURES, np.log(1.0 + len(texts)) + 1.0, dtype=np.float32)
+        idf[active] = np.log((1.0 + len(texts)) / (1.0 + df)) + 1.0
+
+        model = cls(names, idf, None, None, meta=meta)
+        x = model.transform(counts_matrix)[:, active]
+        positives = y.sum(axis=0)
+        pos_weight = np.minimum(MAX_POS_WEIGHT, np.maximum(1.0, (len(texts) - positives) / positives))
+        w, b = _fit(x, y, pos_weight, l2=l2)
+        rows = np.repeat(active, len(names))
+        cols = np.tile(np.arange(len(names)), len(active))
+        model.weights = sparse.csr_matrix((w.ravel().astype(np.float32), (rows, cols)), shape=(N_FEATURES, len(names)))
+        model.bias = b.astype(np.float32)
+        model.thresholds = model.default_thresholds()
+        model.meta.update({"trained_at": time.strftime("%Y-%m-%d %H:%M:%S"), "examples": len(texts),
+                           "positives": {label: int(counts[label]) for label in names}, "features": int(len(active))})
+        return model
+
+    def evidence_floor(self):
+        """아는 단어가 하나도 없는 문서의 점수(=편향의 확률) + EVIDENCE_MARGIN"""
+        return 1.0 / (1.0 + np.exp(-self.bias)) + EVIDENCE_MARGIN
+
+    def default_thresholds(self):
+        # 규칙 분류가 대부분의 문서에 붙었던 분류(예: 42. Manufacturing)는 편향만으로 0.5를 넘으므로 기준값을 올림
+        return np.maximum(THRESHOLD, self.evidence_floor())
+
+    def transform(self, counts_matrix):
+        """빈도 행렬 → 로그 TF × IDF, 행 L2 정규화"""
+        x = counts_matrix.astype(np.float32)
+        x.data = 1.0 + np.log(x.data)
+        x = x.multiply(self.idf).tocsr()
+        norms = np.sqrt(np.asarray(x.multiply(x).sum(axis=1)).ravel())
+        norms[norms == 0] = 1.0
+        return sparse.diags(1.0 / norms) @ x
+
+    def scores(self, texts):
+        """(문서 수 × 분류 수) 확률 행렬"""
+        x = self.transform(featurize(texts))
+        z = (x @ self.weights).toarray() + self.bias
+        return 1.0 / (1.0 + np.exp(-z))
+
+    def predict(self, texts, scores=None):
+        """문서별로 기준값을 넘은 분류 목록 (점수 높은 순)"""
+        scores = self.scores(texts) if scores is None else scores
+        return [[self.labels[j] for j in np.argsort(-row) if row[j] >= self.thresholds[j]] for row in scores]
+
+    def save(self, path):
+        weights = self.weights.tocoo()
+        tmp = f"{path}.tmp.npz"
+        np.savez_compressed(tmp, labels=np.array(self.labels), idf=self.idf, bias=self.bias,
+                            rows=weights.row.astype(np.int32), cols=weights.col.astype(np.int16), data=weights.data,
+                            thresholds=self.thresholds.astype(np.float32),
+                            meta=np.array(json.dumps(self.meta, ensure_ascii=False)))
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path, allow_pickle=False) as f:
+            labels = [str(label) for label in f["labels"]]
+            weights = sparse.csr_matrix((f["data"], (f["rows"], f["cols"].astype(np.int32))),
+                                        shape=(N_FEATURES, len(labels)))
+            return cls(labels, f["idf"], weights, f["bias"], dict(zip(labels, f["thresholds"].tolist())),
+                       json.loads(str(f["meta"])))
+
+
+def model_path(taxonomy):
+    return cache_path(f"ict_classifier_{taxonomy}.npz")
+
+
+def _train_tuned(texts, labels, meta=None, tune=True):
+    """학습 후 분류별 기준값을 교차 검증 점수로 조정 (tune=False면 기본 기준값 그대로)"""
+    model = ICTClassifier.train(texts, labels, meta=meta)
+    if not tune:
+        return model
+    scores = out_of_fold_scores(texts, labels, model.labels)
+    model.thresholds = tune_thresholds(scores, _label_matrix(labels, model.labels), model.evidence_floor())
+    return model
+
+
+def train(taxonomy="ict46", directory=ARCHIVE_DIR, holdout=HOLDOUT):
+    """보관 CSV로 학습 → 검증 결과 출력 → 전체 데이터로 다시 학습해 저장
+
+    기준값은 학습 부분의 교차 검증으로만 조정하고, 떼어 둔 검증 부분에서 기본 기준값보다 나아졌을 때만
+    조정 기준값을 저장 (아니면 기본 기준값으로 저장하고 그 F1을 기록)
+    """
+    texts, labels, sources = load_examples(taxonomy, directory)
+    if not texts:
+        patterns = ", ".join(pattern for pattern, *_ in TAXONOMIES[taxonomy])
+        raise ValueError(f"[{taxonomy}] 학습 자료가 없습니다 ({patterns})")
+    print(f"🧠 [{taxonomy}] 학습 사례 {len(texts)}건 (파일 {len(sources)}개)")
+    evaluation, use_tuned = None, True
+    if holdout and len(texts) >= 20:
+        order = list(range(len(texts)))
+        random.Random(0).shuffle(order)
+        cut = int(len(order) * (1 - holdout))
+        with stage("tune"):
+            model = _train_tuned([texts[i] for i in order[:cut]], [labels[i] for i in order[:cut]])
+        test = order[cut:]
+        scores = model.scores([texts[i] for i in test])
+        truth = _label_matrix([labels[i] for i in test], model.labels)
+        default = _f1(scores >= model.default_thresholds(), truth)
+        tuned = _f1(scores >= model.thresholds, truth)
+        use_tuned = tuned[0] > default[0]
+        f1, tp, fp, fn = tuned if use_tuned else default
+        evaluation = {"examples": len(test), "f1_default": round(default[0], 2), "f1_tuned": round(tuned[0], 2),
+                      "thresholds": "tuned" if use_tuned else "default", "f1": round(f1, 2),
+                      "tp": tp, "fp": fp, "fn": fn}
+        print(f"   - 검증 {len(test)}건 (규칙 분류 대비): micro-F1 기본 기준값 {evaluation['f1_default']:.2f} / "
+              f"조정 기준값 {evaluation['f1_tuned']:.2f} → {'조정' if use_tuned else '기본'} 기준값 저장 "
+              f"(TP {tp} / FP {fp} / FN {fn})")
+        if f1 < TRUSTED_F1:
+            print(f"⚠️ 검증 F1이 {TRUSTED_F1:.1f} 미만 → 규칙 분류를 대신할 수 없습니다 (참고 점수로만 사용)")
+
+    with stage("train"):
+        model = _train_tuned(texts, labels, meta={"taxonomy": taxonomy, "sources": sources, "holdout": evaluation},
+                             tune=use_tuned)
+    path = model_path(taxonomy)
+    model.save(path)
+    tuned = ", ".join(f"{label} {t:.2f}" for label, t in zip(model.labels, model.thresholds))
+    print(f"✅ 분류 {len(model.labels)}개, 특징 {model.meta['features']}개 → {path}\n   - 기준값: {tuned}")
+    return model
+
+
+_shared = {}
+_shared_lock = threading.Lock()
+
+def get_classifier(taxonomy="ict46"):
+    """저장된 모델을 한 번만 읽어 공유 (모델이 없으면 학습하지 않고 FileNotFoundError)"""
+    with _shared_lock:
+        if taxonomy not in _shared:
+            path = model_path(taxonomy)
+            if not os.path.exists(path):
+                raise FileNotFoundError(f"[{taxonomy}] 저장된 모델이 없습니다 ({path}) - "
+                                        f"먼저 'python ict_classifier.py train --taxonomy {taxonomy}' 실행")
+            _shared[taxonomy] = ICTClassifier.load(path)
+        return _shared[taxonomy]
+
+
+def score_file(file_name, column, out_file, taxonomy="ict46", link_column="원문링크"):
+    """CSV의 한 열을 묶음 채점 → 원래 열 + '모델 추정 분류' + 분류별 점수 열을 CSV로 저장
+
+    학습 때와 같게 관보 링크가 있는 행은 보관된 초록/원문을 이어 붙여 채점
+    """
+    model = get_classifier(taxonomy)
+    evaluation = model.meta.get("holdout") or {}
+    if evaluation.get("f1", 0.0) < TRUSTED_F1:
+        print(f"⚠️ [{taxonomy}] 모델 검증 F1 {evaluation.get('f1', 0.0):.2f} - 규칙 분류를 대신하지 않는 참고 점수입니다")
+    with stage("load"), open(file_name, newline='', encoding='utf-8-sig') as f:
+        reader = csv.DictReader(f)
+        fieldnames = list(reader.fieldnames or [])
+        rows = list(reader)
+
+    started = time.perf_counter()
+    with stage("classify"):
+        bodies = _Bodies()
+        scores = model.scores([bodies.join(row.get(column) or "", row.get(link_column)) for row in rows])
+        predicted = model.predict(None, scores=scores)
+    elapsed = time.perf_counter() - started
+
+    with stage("write"), open(out_file, 'w', newline='', encoding='utf-8-sig') as f:
+        writer = csv.writer(f)
+        writer.writerow(fieldnames + ["모델 추정 분류"] + [f"점수:{label}" for label in model.labels])
+        for row, labels, row_scores in zip(rows, predicted, scores):
+            writer.writerow([row.get(name) for name in fieldnames] + [", ".join(labels)]
+                            + [f"{s:.4f}" for s in row_scores])
+    matched = sum(1 for labels in predicted if labels)
+    print(f"🏷️ {file_name}: {len(rows)}건 채점 {elapsed * 1000:.0f} ms | 분류 있음 {matched}건 → {out_file}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="보관 보고서로 학습한 ICT 다중 분류기")
+    commands = parser.add_subparsers(dest="command", required=True)
+    train_cmd = commands.add_parser("train", help="보관 CSV로 학습해 모델 저장")
+    train_cmd.add_argument("--taxonomy", default="ict46", choices=sorted(TAXONOMIES))
+    score_cmd = commands.add_parser("score", help="CSV 한 열을 채점해 분류별 점수 CSV로 저장")
+    score_cmd.add_argument("file")
+    score_cmd.add_argument("--column", default="제목(영문)", help="채점할 텍스트 열")
+    score_cmd.add_argument("--link-column", default="원문링크", help="관보 링크 열 (보관된 본문을 이어 붙임)")
+    score_cmd.add_argument("--out", help="결과 CSV (기본: <파일>_ICT_Scores.csv)")
+    score_cmd.add_argument("--taxonomy", default="ict46", choices=sorted(TAXONOMIES))
+    for cmd in (train_cmd, score_cmd):
+        add_profile_arg(cmd)
+    args = parser.parse_args()
+    with collector_run("ict_classifier"):
+        if args.command == "train":
+            train(args.taxonomy)
+        else:
+            score_file(args.file, args.column, args.out or f"{os.path.splitext(args.file)[0]}_ICT_Scores.csv",
+                       args.taxonomy, args.link_column)
@@ -0,0 +1,324 @@
+import json
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime
+from cache_paths import cache_path
+
+# HTTP 지연 시간 히스토그램 구간 (초, Prometheus 'le' 경계)
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+REPORT_DIR = os.environ.get("NEWSBOT_REPORT_DIR") or cache_path("reports")
+RUN_REPORT_FILE = "run_reports.jsonl"
+
+
+class Metrics:
+    """프로세스 전체의 단계별 시간, 호스트별 HTTP 통계, 카운터 집계
+
+    - stage(name): with 블록의 소요 시간을 (수집기, 단계)별로 누적
+    - 수집기 이름은 스레드별로 지정(newsbot 실행기), 지정되지 않은 스레드는 프로세스 기본값 사용
+    - 공유 서비스(HTTP 클라이언트/번역 메모리/링크 해독)는 http/translate/decode 단계를 스스로 기록
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.default_collector = "main"
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.stages = {}
+            self.hosts = {}
+            self.counters = Counter()
+
+    @property
+    def collector(self):
+        return getattr(self._local, "collector", None) or self.default_collector
+
+    def set_collector(self, name):
+        """현재 스레드에서 기록되는 단계의 수집기 이름 지정"""
+        self._local.collector = name
+
+    def add_stage(self, name, seconds, collector=None):
+        key = (collector or self.collector, name)
+        with self._lock:
+            s = self.stages.setdefault(key, {"seconds": 0.0, "calls": 0, "max_seconds": 0.0})
+            s["seconds"] += seconds
+            s["calls"] += 1
+            s["max_seconds"] = max(s["max_seconds"], seconds)
+
+    @contextmanager
+    def stage(self, name):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_stage(name, time.perf_counter() - started)
+
+    def incr(self, name, value=1, **labels):
+        with self._lock:
+            self.counters[(name, tuple(sorted(labels.items())))] += value
+
+    def observe_http(self, host, seconds, status, size, retries=0):
+        with self._lock:
+            h = self.hosts.get(host)
+            if h is None:
+                h = self.hosts[host] = {"requests": 0, "errors": 0, "not_modified": 0, "retries": 0,
+                                        "bytes": 0, "seconds": 0.0, "buckets": [0] * len(LATENCY_BUCKETS)}
+            h["requests"] += 1
+            h["errors"] += status >= 400
+            h["not_modified"] += status == 304
+            h["retries"] += retries
+            h["bytes"] += size
+            h["seconds"] += seconds
+            for i, bound in enumerate(LATENCY_BUCKETS):
+                if seconds <= bound:
+                    h["buckets"][i] += 1
+
+    def snapshot(self):
+        """JSON으로 바로 쓸 수 있는 현재 집계"""
+        with self._lock:
+            stages = {}
+            for (collector, name), s in sorted(self.stages.items()):
+                stages.setdefault(collector, {})[name] = {"seconds": round(s["seconds"], 4), "calls": s["calls"],
+                                                           "max_seconds": round(s["max_seconds"], 4)}
+            hosts = {host: dict(h, seconds=round(h["seconds"], 4), buckets=list(h["buckets"]))
+                     for host, h in sorted(self.hosts.items())}
+            counters = [{"name": name, "labels": dict(labels), "value": value}
+                        for (name, labels), value in sorted(self.counters.items())]
+        return {"stages": stages, "hosts": hosts, "counters": counters + _service_counters()}
+
+
+def _service_counters():
+    """공유 캐시 서비스의 적중/요청 수 (이번 프로세스에서 실제로 쓰인 것만)"""
+    counters = []
+    services = {"translation_memory": ("translation", "cache_hits", "requested"),
+                "gnews_decoder": ("gnews_link", "cache_hits", "requested"),
+                "summarizer": ("summary", "cache_hits", "requested")}
+    for module_name, (cache, hit_key, total_key) in services.items():
+        module = sys.modules.get(module_name)
+        shared = getattr(module, "_shared", None) if module else None
+        if shared is not None:
+            counters.append({"name": "cache_hits", "labels": {"cache": cache}, "value": shared.stats.get(hit_key, 0)})
+            counters.append({"name": "cache_lookups", "labels": {"cache": cache}, "value": shared.stats.get(total_key, 0)})
+    return counters
+
+
+METRICS = Metrics()
+
+
+def stage(name):
+    """with stage("write"): ... 형태로 단계 시간 기록"""
+    return METRICS.stage(name)
+
+
+def incr(name, value=1, **labels):
+    METRICS.incr(name, value, **labels)
+
+
+# ---------------------------------------------------------------------------
+# 리포트 출력: JSON Lines 실행 기록 + Prometheus textfile
+# ---------------------------------------------------------------------------
+
+def _label_text(labels):
+    if not labels:
+        return ""
+    escaped = (f'{k}="{str(v).replace(chr(92), chr(92) * 2).replace(chr(34), chr(92) + chr(34))}"'
+               for k, v in sorted(labels.items()))
+    return "{" + ",".join(escaped) + "}"
+
+
+# 메트릭 이름 → (종류, 설명). textfile에서는 같은 이름의 샘플이 한 덩어리로 모여 있어야 함
+PROM_FAMILIES = {
+    "newsbot_run_duration_seconds": ("gauge", "Wall time of the last run."),
+    "newsbot_run_timestamp_seconds": ("gauge", "Unix time the last run finished."),
+    "newsbot_collector_success": ("gauge", "Whether the collector finished without error (1) or not (0)."),
+    "newsbot_collector_duration_seconds": ("gauge", "Wall time per collector."),
+    "newsbot_stage_seconds": ("gauge", "Cumulative time spent per stage."),
+    "newsbot_stage_calls": ("gauge", "Number of times each stage ran."),
+    "newsbot_http_request_duration_seconds": ("histogram", "HTTP latency per host."),
+    "newsbot_http_errors_total": ("counter", "HTTP responses with status >= 400."),
+    "newsbot_http_not_modified_total": ("counter", "HTTP 304 responses (conditional GET cache hits)."),
+    "newsbot_http_retries_total": ("counter", "Automatic HTTP retries."),
+    "newsbot_http_bytes_total": ("counter", "Decoded response bytes."),
+}
+
+
+def prometheus_text(report):
+    """실행 기록 1건 → Prometheus textfile 형식 문자열"""
+    run = {"run": report["run"]}
+    samples = {}
+
+    def add(family, labels, value, suffix=""):
+        samples.setdefault(family, []).append(f"{family}{suffix}{_label_text(dict(run, **labels))} {value}")
+
+    add("newsbot_run_duration_seconds", {}, report["duration_seconds"])
+    add("newsbot_run_timestamp_seconds", {}, report["finished_ts"])
+    for name, c in report["collectors"].items():
+        add("newsbot_collector_success", {"collector": name}, int(c["status"] == "ok"))
+        add("newsbot_collector_duration_seconds", {"collector": name}, c["seconds"])
+    for collector, stages in report["metrics"]["stages"].items():
+        for name, s in stages.items():
+            add("newsbot_stage_seconds", {"collector": collector, "stage": name}, s["seconds"])
+            add("newsbot_stage_calls", {"collector": collector, "stage": name}, s["calls"])
+    for host, h in report["metrics"]["hosts"].items():
+        family = "newsbot_http_request_duration_seconds"
+        for bound, count in zip(LATENCY_BUCKETS, h["buckets"]):
+            add(family, {"host": host, "le": bound}, count, "_bucket")
+        add(family, {"host": host, "le": "+Inf"}, h["requests"], "_bucket")
+        add(family, {"host": host}, h["seconds"], "_sum")
+        add(family, {"host": host}, h["requests"], "_count")
+        for key in ("errors", "not_modified", "retries", "bytes"):
+            add(f"newsbot_http_{key}_total", {"host": host}, h[key])
+    for counter in report["metrics"]["counters"]:
+        add(f"newsbot_{counter['name']}_total", counter["labels"], counter["value"])
+
+    lines = []
+    for family, values in samples.items():
+        kind, help_text = PROM_FAMILIES.get(family, ("counter", family.replace("_", " ") + "."))
+        lines += [f"# HELP {family} {help_text}", f"# TYPE {family} {kind}"] + values
+    return "\n".join(lines) + "\n"
+
+
+def write_reports(run_name, collectors, duration, directory=None, extra=None):
+    """실행 기록을 JSONL에 한 줄 추가하고 Prometheus textfile(newsbot_<run>.prom)을 원자적으로 교체"""
+    directory = directory or REPORT_DIR
+    os.makedirs(directory, exist_ok=True)
+    report = {
+        "run": run_name,
+        "finished_at": datetime.now().isoformat(timespec="seconds"),
+        "finished_ts": round(time.time(), 3),
+        "duration_seconds": round(duration, 3),
+        "collectors": collectors,
+        "metrics": METRICS.snapshot(),
+    }
+    if extra:
+        report.update(extra)
+    with open(os.path.join(directory, RUN_REPORT_FILE), "a", encoding="utf-8") as f:
+        f.write(json.dumps(report, ensure_ascii=False) + "\n")
+
+    prom_path = os.path.join(directory, f"newsbot_{run_name}.prom")
+    tmp = f"{prom_path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(prometheus_text(report))
+    os.replace(tmp, prom_path)
+    return report
+
+
+def print_stage_summary(report):
+    for collector, stages in report["metrics"]["stages"].items():
+        parts = ", ".join(f"{name} {s['seconds']:.2f}초" for name, s in
+                          sorted(stages.items(), key=lambda kv: -kv[1]["seconds"]))
+        print(f"⏱️ [{collector}] {parts}")
+
+
+# ---------------------------------------------------------------------------
+# 샘플링 프로파일러: 모든 스레드의 스택을 주기적으로 찍어 함수별 비중 집계
+# ---------------------------------------------------------------------------
+
+class SamplingProfiler:
+    """스레드 풀 안에서 도는 작업까지 잡히도록 sys._current_frames()를 일정 간격으로 샘플링
+
+    결과는 콘솔 상위 목록과 flamegraph용 collapsed stack 파일(.folded)로 남깁니다.
+    """
+
+    def __init__(self, interval=0.005):
+        self.interval = interval
+        self.stacks = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="newsbot-profiler", daemon=True)
+
+    def _run(self):
+        me = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            for ident, frame in sys._current_frames().items():
+                if ident == me:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+                    frame = frame.f_back
+                self.stacks[";".join(reversed(stack))] += 1
+            self.samples += 1
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def top(self, limit=25):
+        """(함수, 자기 자신 샘플 수, 포함 샘플 수) 상위 목록"""
+        own, inclusive = Counter(), Counter()
+        for stack, count in self.stacks.items():
+            frames = stack.split(";")
+            own[frames[-1]] += count
+            for name in set(frames):
+                inclusive[name] += count
+        return [(name, own[name], inclusive[name]) for name, _ in inclusive.most_common(limit)]
+
+    def write(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+
+    def report(self, path=None, limit=25):
+        total = sum(self.stacks.values()) or 1
+        print(f"🔬 프로파일 (샘플 {self.samples}회, 간격 {self.interval * 1000:.0f}ms) - 포함 비중 상위 {limit}")
+        for name, own, inclusive in self.top(limit):
+            print(f"   {inclusive / total * 100:5.1f}%  (자체 {own / total * 100:5.1f}%)  {name}")
+        if path:
+            self.write(path)
+            print(f"   💾 collapsed stack: {path}")
+
+
+def profiling_requested():
+    """--profile 인자나 NEWSBOT_PROFILE=1 환경 변수로 프로파일링 요청 여부 판단"""
+    return "--profile" in sys.argv or os.environ.get("NEWSBOT_PROFILE") == "1"
+
+
+def add_profile_arg(parser):
+    """argparse 파서에 --profile 추가 (값은 profiling_requested()가 sys.argv에서 직접 읽음 - 도움말/인자 검사용)"""
+    parser.add_argument("--profile", action="store_true", help="샘플링 프로파일러로 함수별 소요 시간 기록")
+    return parser
+
+
+@contextmanager
+def collector_run(name, profile=None):
+    """단독 실행 스크립트용: 실행 시간/단계를 기록하고 끝나면 JSONL + Prometheus 리포트 작성
+
+        if __name__ == "__main__":
+            with collector_run("oecd"):
+                main()
+
+    인자가 있는 스크립트는 parse_args()를 이 블록에 들어오기 전에 호출 (--help나 잘못된 인자가
+    실패한 실행으로 기록되지 않게)
+    """
+    METRICS.default_collector = name
+    profiler = SamplingProfiler().start() if (profiling_requested() if profile is None else profile) else None
+    started = time.perf_counter()
+    status, error = "ok", None
+    try:
+        yield METRICS
+    except BaseException as e:
+        status, error = "failed", f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        duration = time.perf_counter() - started
+        extra = None
+        if profiler:
+            profiler.stop()
+            folded = os.path.join(REPORT_DIR, f"profile_{name}_{datetime.now():%Y%m%d_%H%M%S}.folded")
+            os.makedirs(REPORT_DIR, exist_ok=True)
+            profiler.report(folded)
+            extra = {"profile": folded}
+        report = write_reports(name, {name: {"status": status, "seconds": round(duration, 3), "error": error}},
+                               duration, extra=extra)
+        print_stage_summary(report)
@@ -1,79 +1,185 @@
+import argparse
 import asyncio
-from playwright.async_api import async_playwright
+import os
 import csv
+from instrumentation import add_profile_arg, collector_run, stage
+from exporters import export
 
-async def crawl_digital_2025_playwright_fixed():
-    start_page = 21
-    end_page = 188
-    file_name = 'Japan_Digital_2025_Full_Archive.csv'
+# 동시에 띄울 브라우저 컨텍스트(페이지) 수
+POOL_SIZE = int(os.environ.get("JAPAN_POOL_SIZE", "4"))
+# 추출기가 읽는 링크 (이 앵커가 보이면 데이터 로딩 완료로 판단)
+ANCHOR_SELECTOR = 'a[href*="/news/"], a[href*="/press/"], a[href*="/policies/"]'
+# 증분 모드: 연속 몇 페이지가 모두 아는 링크면 더 오래된 페이지는 보지 않음
+EARLY_STOP_PAGES = int(os.environ.get("JAPAN_EARLY_STOP_PAGES", "2"))
+# 목록 추출에 필요 없는 리소스는 요청 단계에서 차단
+BLOCKED_RESOURCES = {"image", "media", "font", "stylesheet"}
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+
+EXTRACT_LINKS_JS = """
+    () => {
+        const results = [];
+        const anchors = document.querySelectorAll('%s');
+        anchors.forEach(a => {
+            const text = a.innerText.trim();
+            if (text.length > 15) {
+                results.push({
+                    title: text.replace(/\\n/g, ' '),
+                    href: a.href
+                });
+            }
+        });
+        return results;
+    }
+""" % ANCHOR_SELECTOR
+
+async def _block_resources(route):
+    if route.request.resource_type in BLOCKED_RESOURCES:
+        await route.abort()
+    else:
+        await route.continue_()
+
+async def fetch_page_links(page_obj, p_num):
+    url = f"https://www.digital.go.jp/news?page={p_num}"
+    # DOM만 준비되면 고정 대기 없이 추출 대상 앵커가 나타날 때까지만 기다림
+    await page_obj.goto(url, wait_until="domcontentloaded", timeout=60000)
+    await page_obj.wait_for_selector(ANCHOR_SELECTOR, state="attached", timeout=15000)
+    return await page_obj.evaluate(EXTRACT_LINKS_JS)
+
+class PagePool:
+    """브라우저 하나에 N개의 컨텍스트/페이지를 띄워 두고 페이지 번호 묶음을 나눠 처리"""
+
+    def __init__(self, pool_size=POOL_SIZE):
+        self.pool_size = max(1, pool_size)
+        self.pages = []
+
+    async def __aenter__(self):
+        from playwright.async_api import async_playwright
+        self._playwright = await async_playwright().start()
+        # 브라우저 실행
+        self.browser = await self._playwright.chromium.launch(headless=True)
+        for _ in range(self.pool_size):
+            context = await self.browser.new_context(user_agent=USER_AGENT)
+            await context.route("**/*", _block_resources)
+            self.pages.append(await context.new_page())
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.browser.close()
+        await self._playwright.stop()
+
+    async def fetch(self, page_numbers, progress_total=None):
+        """큐에서 페이지 번호를 꺼내 동시에 수집 → {페이지 번호: 링크 목록} (실패한 페이지는 제외)"""
+        results = {}
+        queue = asyncio.Queue()
+        for p_num in page_numbers:
+            queue.put_nowait(p_num)
+        progress_total = progress_total or max(page_numbers, default=0)
+
+        async def worker(page_obj):
+            while True:
+                try:
+                    p_num = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                try:
+                    results[p_num] = await fetch_page_links(page_obj, p_num)
+                    print(f"📡 {p_num}/{progress_total} 완료 | 처리한 페이지: {len(results)}개", end='\r')
+                except Exception as e:
+                    print(f"\n❌ {p_num}페이지 로드 실패: {str(e)[:100]}")
+
+        await asyncio.gather(*(worker(page_obj) for page_obj in self.pages[:len(page_numbers)]))
+        return results
+
+def load_archive_links(file_name):
+    """기존 아카이브의 링크를 seen 집합으로 로드"""
+    if not os.path.exists(file_name):
+        return set()
+    with stage("load"), open(file_name, newline='', encoding='utf-8-sig') as f:
+        return {row['link'] for row in csv.DictReader(f)}
+
+def append_rows(file_name, rows):
+    """기존 파일을 다시 정렬/재작성하지 않고 끝에 새 행만 추가"""
+    write_header = not os.path.exists(file_name) or os.path.getsize(file_name) == 0
+    with stage("write"), open(file_name, 'a', newline='', encoding='utf-8-sig' if write_header else 'utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=["title", "link"])
+        if write_header:
+            writer.writeheader()
+        writer.writerows(rows)
+
+async def crawl_incremental(file_name='Japan_Digital_2025_Full_Archive.csv', max_page=188,
+                            early_stop=EARLY_STOP_PAGES):
+    """최신 페이지부터 넘기다가 연속 early_stop개 페이지가 모두 아는 링크면 중단하고 새 항목만 추가"""
+    seen_links = load_archive_links(file_name)
+    new_data = []
+    known_streak = 0
+    p_num = 1
+
+    print(f"🔁 [증분 모드] 기존 {len(seen_links)}건 로드, 1페이지부터 확인 (연속 {early_stop}페이지 변화 없으면 중단)")
+    async with PagePool(min(POOL_SIZE, early_stop)) as pool:
+        while p_num <= max_page and known_streak < early_stop:
+            batch = list(range(p_num, min(p_num + early_stop, max_page + 1)))
+            page_links = await pool.fetch(batch, progress_total=max_page)
+            for n in batch:
+                links = page_links.get(n)
+                if links is None: # 로드 실패한 페이지는 판단 보류
+                    known_streak = 0
+                    continue
+                fresh = [link for link in links if link['href'] not in seen_links]
+                for link in fresh:
+                    seen_links.add(link['href'])
+                    new_data.append({"title": link['title'], "link": link['href']})
+                known_streak = 0 if fresh else known_streak + 1
+                if known_streak >= early_stop:
+                    break
+            p_num = batch[-1] + 1
+
+    if new_data:
+        append_rows(file_name, new_data)
+        print(f"\n\n✅ [증분 완료] {p_num - 1}페이지까지 확인, 신규 {len(new_data)}건 추가!")
+    else:
+        print(f"\n✅ [증분 완료] {p_num - 1}페이지까지 확인, 새 항목 없음")
+
+async def crawl_digital_2025_playwright_fixed(start_page=21, end_page=188,
+                                              file_name='Japan_Digital_2025_Full_Archive.csv'):
     all_data = []
     seen_links = set()
 
-    async with async_playwright() as p:
-        # 브라우저 실행
-        browser = await p.chromium.launch(headless=True)
-        context = await browser.new_context(
-            user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
-        )
-        page_obj = await context.new_page()
-
-        print(f"🚀 [브라우저 모드] {start_page} ~ {end_page} 페이지 정밀 스캔 시작...")
-
-        for p_num in range(start_page, end_page + 1):
-            url = f"https://www.digital.go.jp/news?page={p_num}"
-            
-            try:
-                # 페이지 접속 및 네트워크 안정화 대기
-                await page_obj.goto(url, wait_until="domcontentloaded", timeout=60000)
-                # 데이터 로딩을 위해 아주 잠깐 대기
-                await asyncio.sleep(1.5) 
-
-                # [수정 완료] results.append -> results.push 로 변경
-                links = await page_obj.evaluate("""
-                    () => {
-                        const results = [];
-                        const anchors = document.querySelectorAll('a[href*="/news/"], a[href*="/press/"], a[href*="/policies/"]');
-                        anchors.forEach(a => {
-                            const text = a.innerText.trim();
-                            if (text.length > 15) {
-                                results.push({
-                                    title: text.replace(/\\n/g, ' '),
-                                    href: a.href
-                                });
-                            }
-                        });
-                        return results;
-                    }
-                """)
-
-                for link in links:
-                    if link['href'] not in seen_links:
-                        seen_links.add(link['href'])
-                        all_data.append({
-                            "title": link['title'],
-                            "link": link['href']
-                        })
-                
-                print(f"📡 {p_num}/{end_page} 완료 | 현재 누적: {len(all_data)}건", end='\r')
-
-            except Exception as e:
-                print(f"\n❌ {p_num}페이지 로드 실패: {str(e)[:100]}")
-                continue
-
-        await browser.close()
+    print(f"🚀 [브라우저 모드] {start_page} ~ {end_page} 페이지 정밀 스캔 시작... (동시 페이지: {POOL_SIZE})")
+    async with PagePool() as pool:
+        page_links = await pool.fetch(list(range(start_page, end_page + 1)), progress_total=end_page)
+
+    # 페이지 순서대로 병합해 순차 수집과 같은 중복 제거 결과 유지
+    for p_num in sorted(page_links):
+        for link in page_links[p_num]:
+            if link['href'] not in seen_links:
+                seen_links.add(link['href'])
+                all_data.append({
+                    "title": link['title'],
+                    "link": link['href']
+                })
 
     # CSV 저장 (UTF-8-SIG로 엑셀 한글/일어 깨짐 방지)
     if all_data:
         # 날짜순 정렬 시도 (타이틀 앞에 날짜가 오는 경우가 많으므로)
         all_data.sort(key=lambda x: x['title'], reverse=True)
-        
-        with open(file_name, 'w', newline='', encoding='utf-8-sig') as f:
-            writer = csv.DictWriter(f, fieldnames=["title", "link"])
-            writer.writeheader()
-            writer.writerows(all_data)
+
+        with stage("write"):
+            export(file_name, all_data, ["title", "link"])
         print(f"\n\n✅ [임무 완수] 총 {len(all_data)}건의 데이터를 확보했습니다!")
     else:
         print("\n⚠️ 수집된 데이터가 없습니다.")
 
+async def main(full=False):
+    """아카이브가 있으면 증분 수집, 없거나 full이면 전체 범위 재수집"""
+    if full or not os.path.exists('Japan_Digital_2025_Full_Archive.csv'):
+        await crawl_digital_2025_playwright_fixed()
+    else:
+        await crawl_incremental()
+
 if __name__ == "__main__":
-    asyncio.run(crawl_digital_2025_playwright_fixed())
+    parser = argparse.ArgumentParser(description="일본 디지털청 뉴스 아카이브 수집")
+    parser.add_argument("--full", action="store_true", help="전체 페이지 범위를 다시 스캔해 파일을 새로 작성")
+    add_profile_arg(parser)
+    args = parser.parse_args()
+    with collector_run("japan_digital"):
+        asyncio.run(main(full=args.full))
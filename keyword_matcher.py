@@ -0,0 +1,108 @@
+import re
+from collections import namedtuple
+
+KeywordHit = namedtuple("KeywordHit", ["category", "keyword", "start", "end"])
+
+_WORD_CHAR = re.compile(r"[A-Za-z0-9]")
+
+
+def _trie_pattern(words):
+    """키워드 목록을 공통 접두사로 묶은 정규식으로 변환 (위치마다 첫 글자만 비교하면 됨)"""
+    trie = {}
+    for word in words:
+        node = trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[""] = True
+
+    def build(node):
+        alts = [re.escape(ch) + build(child) for ch, child in sorted(node.items()) if ch != ""]
+        if "" in node:
+            return f"(?:{'|'.join(alts)})?" if alts else ""
+        return alts[0] if len(alts) == 1 else f"(?:{'|'.join(alts)})"
+
+    return build(trie)
+
+
+class KeywordMatcher:
+    """분류 사전({카테고리: [키워드, ...]})을 한 번 컴파일해 문서당 한 번만 훑는 다중 키워드 매처
+
+    - 모든 키워드를 하나의 트라이 정규식으로 묶어 겹치는 매칭까지 한 번에 찾음
+    - word_boundary=True면 영문/숫자 키워드 앞뒤가 다른 영문/숫자와 붙어 있을 때 제외
+      ("MES"가 "times" 안에서 잡히지 않음). 키워드 끝에 '*'를 붙이면 접두어 매칭 ("ROBOT*" → ROBOTICS)
+    - 한글/일본어 키워드는 경계 규칙 없이 부분 문자열로 매칭
+    - 오프셋은 소문자 변환한 본문 기준 (대부분의 문서에서 원문과 동일)
+    """
+
+    def __init__(self, taxonomy, word_boundary=False, case_sensitive=False):
+        self.categories_order = list(taxonomy)
+        self.case_sensitive = case_sensitive
+        self._entries = {}   # 정규화 키워드 -> [(카테고리, 원래 키워드, 뒤쪽 경계 필요 여부)]
+        self._lead = {}      # 정규화 키워드 -> 앞쪽 경계 필요 여부
+        for category, keywords in taxonomy.items():
+            for keyword in keywords:
+                stem = keyword.endswith("*")
+                text = keyword[:-1] if stem else keyword
+                if word_boundary:
+                    text = text.strip()
+                norm = self._norm(text)
+                if not norm:
+                    continue
+                ascii_word = bool(word_boundary and _WORD_CHAR.search(norm))
+                self._entries.setdefault(norm, []).append(
+                    (category, text, ascii_word and not stem and bool(_WORD_CHAR.match(norm[-1]))))
+                lead = ascii_word and bool(_WORD_CHAR.match(norm[0]))
+                self._lead[norm] = self._lead.get(norm, True) and lead
+
+        words = sorted(self._entries)
+        # 같은 시작 위치에서 더 짧게 겹치는 키워드 (예: "digital twin" / "digital twins")
+        self._prefixes = {w: [p for p in words if w.startswith(p)] for w in words}
+        self._pattern = re.compile(f"(?=({_trie_pattern(words)}))") if words else None
+
+    def _norm(self, text):
+        return text if self.case_sensitive else text.lower()
+
+    def find(self, text):
+        """본문 한 번 스캔으로 모든 (카테고리, 키워드, 시작, 끝) 매칭을 등장 순서대로 반환"""
+        return list(self._iter_hits(text))
+
+    def _iter_hits(self, text):
+        if not text or self._pattern is None:
+            return
+        text = self._norm(text)
+        for m in self._pattern.finditer(text):
+            start = m.start()
+            if start and _WORD_CHAR.match(text[start - 1]):
+                lead_ok = False
+            else:
+                lead_ok = True
+            for word in self._prefixes[m.group(1)]:
+                if not lead_ok and self._lead[word]:
+                    continue
+                end = start + len(word)
+                tail_word_char = end < len(text) and _WORD_CHAR.match(text[end])
+                for category, keyword, needs_tail in self._entries[word]:
+                    if needs_tail and tail_word_char:
+                        continue
+                    yield KeywordHit(category, keyword, start, end)
+
+    def classify(self, text):
+        """{카테고리: [키워드, ...]} (카테고리는 사전 순서, 키워드는 처음 등장한 순서)"""
+        found = {}
+        for hit in self._iter_hits(text):
+            keywords = found.setdefault(hit.category, [])
+            if hit.keyword not in keywords:
+                keywords.append(hit.keyword)
+        return {cat: found[cat] for cat in self.categories_order if cat in found}
+
+    def categories(self, text):
+        return list(self.classify(text))
+
+    def first_category(self, text, default=None):
+        """사전 순서상 가장 먼저 매칭된 카테고리 (기존 for/any 루프의 반환값과 동일)"""
+        found = self.categories(text)
+        return found[0] if found else default
+
+    def matches_any(self, text):
+        """첫 매칭에서 바로 멈추는 포함 여부 검사"""
+        return next(self._iter_hits(text), None) is not None
@@ -1,70 +1,223 @@
-import requests
-import csv
-
-def fetch_eu_cellar_final_match():
-    sparql_url = "https://publications.europa.eu/webapi/rdf/sparql"
-    
-    # [수정] 날짜 계산 대신 '2025' 문자열 포함 여부로 검색합니다.
-    # 이렇게 하면 DB의 날짜 형식 오류를 완벽하게 무시하고 낚아챌 수 있습니다.
-    query = """
-    PREFIX cdm: <http://publications.europa.eu/ontology/cdm#>
-    
-    SELECT DISTINCT ?work ?date ?title
-    WHERE {
-      ?work a cdm:work ;
-            cdm:work_date_document ?date ;
-            cdm:work_has_expression ?expr .
-      ?expr cdm:expression_title ?title .
-      ?expr cdm:expression_uses_language <http://publications.europa.eu/resource/authority/language/ENG> .
-      
-      # 날짜 필드에 '2025'가 포함된 모든 것을 가져옴
-      FILTER (contains(str(?date), "2025"))
-    }
-    ORDER BY DESC(?date)
-    LIMIT 100
-    """
+import codecs
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from article_store import get_article_store
+from cache_paths import cache_path
+from date_normalizer import normalize_date
+from http_client import get_http_client
+from instrumentation import add_profile_arg, collector_run, stage
+from rate_limiter import default_limiter
+
+SPARQL_URL = "https://publications.europa.eu/webapi/rdf/sparql"
+CELLAR_HOST = "publications.europa.eu"
+FILE_NAME = 'EU_Policy_2025_Full.csv'
+SOURCE = "EU Cellar"
+# CSV 열 이름 → 기사 저장소 필드 (CSV는 저장소에서 만들어지는 내보내기 파일)
+EXPORT_COLUMNS = {"date": "published", "title": "title", "link": "link"}
+STATE_FILE = "eu_cellar_state.json"
+RANGE_START = "2025-01-01"      # 수집 기간 시작 (포함)
+RANGE_END = "2026-01-01"        # 수집 기간 끝 (제외)
+PAGE_SIZE = int(os.environ.get("CELLAR_PAGE_SIZE", "1000"))   # 요청 1회에 받을 행 수
+MAX_WORKERS = int(os.environ.get("CELLAR_WORKERS", "3"))      # 동시에 요청할 페이지 수
+CELLAR_RPS = float(os.environ.get("CELLAR_RPS", "2"))         # 초당 요청 한도 (공용 엔드포인트 예의상)
+TIMEOUT = (10, 120)
+
+# Cellar 엔드포인트는 모든 수집기가 같은 한도를 나눠 씀
+if default_limiter.bucket_for(CELLAR_HOST) is None:
+    default_limiter.set_limit(CELLAR_HOST, CELLAR_RPS, max(CELLAR_RPS, MAX_WORKERS))
+
+QUERY_TEMPLATE = """
+PREFIX cdm: <http://publications.europa.eu/ontology/cdm#>
+PREFIX xsd: <http://www.w3.org/2001/XMLSchema#>
+
+SELECT DISTINCT ?work ?date ?title
+WHERE {{
+  ?work a cdm:work ;
+        cdm:work_date_document ?date ;
+        cdm:work_has_expression ?expr .
+  ?expr cdm:expression_title ?title .
+  ?expr cdm:expression_uses_language <http://publications.europa.eu/resource/authority/language/ENG> .
+  FILTER (?date >= "{since}"^^xsd:date && ?date < "{until}"^^xsd:date)
+}}
+ORDER BY DESC(?date) ?work
+LIMIT {limit}
+OFFSET {offset}
+"""
+
+
+def build_query(since, until, limit=PAGE_SIZE, offset=0):
+    """xsd:date 범위 조건 (문자열 검색 대신 날짜 비교) + 정렬 고정 → OFFSET 페이지가 겹치지 않음"""
+    return QUERY_TEMPLATE.format(since=since, until=until, limit=limit, offset=offset)
+
+
+def iter_bindings(chunks, key="bindings"):
+    """SPARQL JSON 응답을 조각 단위로 읽으며 bindings 배열의 원소를 하나씩 돌려줌
 
-    file_name = 'EU_Policy_2025_Full.csv'
-    headers = {"Accept": "application/sparql-results+json"}
+    응답 전체를 메모리에 올리지 않으므로 페이지 크기와 관계없이 사용 메모리가 일정합니다.
+    """
+    decoder = json.JSONDecoder()
+    utf8 = codecs.getincrementaldecoder("utf-8")()
+    buffer, pos, started = "", 0, False
+    for chunk in chunks:
+        buffer = buffer[pos:] + utf8.decode(chunk)
+        pos = 0
+        if not started:
+            marker = buffer.find(f'"{key}"')
+            bracket = buffer.find("[", marker) if marker >= 0 else -1
+            if bracket < 0:
+                pos = max(0, len(buffer) - len(key) - 2) if marker < 0 else marker
+                continue
+            started, pos = True, bracket + 1
+        while True:
+            while pos < len(buffer) and buffer[pos] in " \t\r\n,":
+                pos += 1
+            if pos >= len(buffer):
+                break
+            if buffer[pos] == "]":
+                return
+            try:
+                item, end = decoder.raw_decode(buffer, pos)
+            except ValueError:
+                break   # 원소가 다음 조각까지 이어짐
+            yield item
+            pos = end
 
-    print("🎯 [최종 타격] 2025년 문자열 매칭으로 데이터를 강제 추출합니다...", flush=True)
 
+def fetch_page(since, until, offset, limit=PAGE_SIZE):
+    """한 페이지를 스트리밍으로 받아 [(작품 URI, 날짜, 제목)] 반환"""
+    default_limiter.acquire(SPARQL_URL)
+    res = get_http_client().get(SPARQL_URL, params={"query": build_query(since, until, limit, offset)},
+                                headers={"Accept": "application/sparql-results+json"}, timeout=TIMEOUT, stream=True)
     try:
-        # POST 방식으로 쿼리 전송
-        response = requests.post(sparql_url, data={'query': query}, headers=headers, timeout=60)
-        
-        if response.status_code == 200:
-            data = response.json()
-            bindings = data.get('results', {}).get('bindings', [])
-            
-            all_records = []
-            for item in bindings:
-                cellar_url = item['work']['value']
-                uuid = cellar_url.split('/')[-1]
-                title = item['title']['value']
-                date = item['date']['value']
-                link = f"https://op.europa.eu/en/publication-detail/-/publication/{uuid}"
-                
-                all_records.append({
-                    "date": date,
-                    "title": title,
-                    "link": link
-                })
-
-            if all_records:
-                with open(file_name, 'w', newline='', encoding='utf-8-sig') as f:
-                    writer = csv.DictWriter(f, fieldnames=["date", "title", "link"])
-                    writer.writeheader()
-                    writer.writerows(all_records)
-                print(f"✅ [성공] 2025년 데이터 {len(all_records)}건을 드디어 찾아냈습니다!", flush=True)
-            else:
-                # 2025년이 정말 없다면 2024년이라도 있는지 확인하여 서버 상태 최종 점검
-                print("⚠️ 2025년 매칭 데이터가 없습니다. DB 인덱싱 지연이 확실해 보입니다.", flush=True)
-        else:
-            print(f"❌ 서버 응답 오류: {response.status_code}", flush=True)
+        if res.status_code != 200:
+            raise ValueError(f"HTTP {res.status_code}")
+        with stage("parse"):
+            return [(item["work"]["value"], item["date"]["value"], item["title"]["value"])
+                    for item in iter_bindings(res.iter_content(chunk_size=65536))]
+    finally:
+        res.close()
+
+
+def harvest(since, until, page_size=PAGE_SIZE, max_workers=MAX_WORKERS):
+    """OFFSET 페이지를 max_workers개씩 동시에 요청, 덜 찬 페이지가 나오면 종료 → 페이지 목록(순서 유지)
+
+    첫 페이지는 혼자 먼저 요청하고, 꽉 찼을 때만 나머지를 동시에 요청
+    (증분 실행처럼 결과가 한 페이지도 안 되는 경우 빈 페이지 요청으로 속도 한도를 쓰지 않도록)
+    """
+    first = fetch_page(since, until, 0, page_size)
+    print(f"   📄 0~{page_size}행: {len(first)}건", flush=True)
+    if len(first) < page_size:
+        return [first]
+    pages, offset = [first], page_size
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        while True:
+            offsets = [offset + i * page_size for i in range(max_workers)]
+            batch = list(pool.map(lambda o: fetch_page(since, until, o, page_size), offsets))
+            pages.extend(batch)
+            print(f"   📄 {offsets[0]}~{offsets[-1] + page_size}행: {sum(len(p) for p in batch)}건", flush=True)
+            if any(len(p) < page_size for p in batch):
+                return pages
+            offset = offsets[-1] + page_size
+
+
+def work_id(value):
+    """작품 URI 또는 op.europa.eu 링크 → Cellar UUID (중복 판정 키)"""
+    return (value or "").rstrip("/").split("/")[-1]
+
+
+def work_link(uuid):
+    return f"https://op.europa.eu/en/publication-detail/-/publication/{uuid}"
 
+
+def _with_work_link(article):
+    # 예전 파일의 /en/ 없는 작품 링크도 같은 작품이면 같은 링크가 되도록 UUID로 다시 만듦 (작품이 아닌 링크는 그대로)
+    link = article.get("link") or ""
+    if "/publication-detail/-/publication/" in link:
+        article["link"] = work_link(work_id(link))
+    return article if work_id(link) else None
+
+
+def open_archive(file_name=FILE_NAME):
+    """기사 저장소 (CSV에만 있는 행은 먼저 가져옴: 캐시가 비었거나 다른 실행이 CSV를 갱신한 경우)"""
+    store = get_article_store()
+    with stage("load"):
+        imported = store.import_csv(file_name, EXPORT_COLUMNS, SOURCE, transform=_with_work_link)
+    if imported:
+        print(f"   - 기존 CSV {imported}건을 저장소로 옮겼습니다.", flush=True)
+    return store
+
+
+def save_archive(store, file_name=FILE_NAME):
+    with stage("write"):
+        return store.export_file(file_name, EXPORT_COLUMNS, source=SOURCE)
+
+
+def load_last_seen(store):
+    """저장된 마지막 날짜 (상태 파일이 없으면 저장소의 최신 날짜로 대체 - CI처럼 캐시가 없는 환경)"""
+    path = cache_path(STATE_FILE)
+    if os.path.exists(path):
+        with open(path, encoding='utf-8') as f:
+            return json.load(f).get("last_seen")
+    latest = store.latest(SOURCE)
+    return latest["published"] if latest else None
+
+
+def save_last_seen(value):
+    path = cache_path(STATE_FILE)
+    tmp = f"{path}.tmp"
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump({"last_seen": value}, f)
+    os.replace(tmp, path)
+
+
+def fetch_eu_cellar_final_match(full=False):
+    """2025년 Cellar 작품을 페이지 단위로 모두 수집해 아카이브에 병합 (작품 URI 기준 중복 제거)
+
+    지난 실행에서 본 가장 최근 날짜를 기억해 두고 그 날짜부터만 다시 조회합니다.
+    같은 날짜에 늦게 등록된 작품이 있을 수 있어 마지막 날짜는 포함해서 조회합니다.
+    """
+    store = open_archive()
+    known = store.count(SOURCE)
+    last_seen = None if full or not known else load_last_seen(store)
+    since = max(last_seen or RANGE_START, RANGE_START)
+    print(f"🎯 EU Cellar 수집: {since} ~ {RANGE_END} (페이지 {PAGE_SIZE}행, 동시 {MAX_WORKERS}개, 보관 {known}건)", flush=True)
+
+    try:
+        pages = harvest(since, RANGE_END)
     except Exception as e:
         print(f"❌ 실행 중 오류: {e}", flush=True)
+        return
+
+    # 작품 URI 기준 중복 제거 (링크는 UUID로 만들므로 같은 작품은 같은 링크)
+    articles, newest = {}, last_seen
+    for page in pages:
+        for work, raw_date, title in page:
+            uuid = work_id(work)
+            if not uuid or uuid in articles:
+                continue
+            date = normalize_date(raw_date, default=raw_date)
+            articles[uuid] = {"source": SOURCE, "published": date, "title": title, "link": work_link(uuid)}
+            newest = max(newest or date, date)
+    # 목록은 최신순이므로 뒤에서부터 넣어야 같은 날짜 안에서도 내보낼 때 순서가 유지됨
+    added = store.insert_new(list(articles.values())[::-1])
+
+    total = store.count(SOURCE)
+    if total:
+        if added or not os.path.exists(FILE_NAME):
+            save_archive(store)
+        if newest:
+            save_last_seen(newest)
+        print(f"✅ 신규 {added}건 추가 → 총 {total}건 (마지막 날짜 {newest})", flush=True)
+    else:
+        print("⚠️ 기간 내 데이터가 없습니다. DB 인덱싱 지연일 수 있습니다.", flush=True)
+    get_http_client().report()
 
 if __name__ == "__main__":
-    fetch_eu_cellar_final_match()
+    import argparse
+    parser = argparse.ArgumentParser(description="EU Cellar 2025 문서 아카이브 동기화")
+    parser.add_argument("--full", action="store_true", help="마지막 날짜를 무시하고 기간 전체를 다시 수집")
+    add_profile_arg(parser)
+    args = parser.parse_args()
+    with collector_run("eu_cellar"):
+        fetch_eu_cellar_final_match(full=args.full)
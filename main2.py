@@ -1,12 +1,63 @@
 import asyncio
-import csv
+import json
+import os
 import re
 from datetime import datetime
 from urllib.parse import urljoin
+import requests
 from crawl4ai import AsyncWebCrawler, BrowserConfig, CrawlerRunConfig
+from cache_paths import cache_path
+from http_client import get_http_client
+from date_normalizer import UNKNOWN_DATE, normalize_date, parse_date
+from near_duplicates import get_near_duplicate_index
+from instrumentation import collector_run, stage
+from exporters import export
+
+DATE_CACHE_FILE = cache_path("article_dates.json")
+MAX_CONCURRENCY = 6      # 동시에 날짜를 확인할 기사 수
+MAX_BROWSER_PAGES = 2    # 그중 브라우저(crawl4ai)까지 여는 기사 수
+HTTP_TIMEOUT = (5, 15)
+HEADERS = {"User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"}
+
+# HTML 안에서 발행일을 알려주는 흔적들 (위에서부터 신뢰도 순)
+HTML_DATE_PATTERNS = [
+    re.compile(r'<meta[^>]+(?:property|name|itemprop)=["\'](?:article:published_time|datePublished|pubdate|publishdate)["\'][^>]*content=["\']([^"\']+)', re.I),
+    re.compile(r'<meta[^>]+content=["\']([^"\']+)["\'][^>]*(?:property|name|itemprop)=["\'](?:article:published_time|datePublished|pubdate|publishdate)["\']', re.I),
+    re.compile(r'"datePublished"\s*:\s*"([^"]+)"'),
+    re.compile(r'<time[^>]+datetime=["\']([^"\']+)', re.I),
+]
+
+def load_date_cache():
+    if os.path.exists(DATE_CACHE_FILE):
+        with open(DATE_CACHE_FILE, encoding='utf-8') as f:
+            return json.load(f)
+    return {}
+
+def save_date_cache(cache):
+    tmp = f"{DATE_CACHE_FILE}.tmp"
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(cache, f, ensure_ascii=False)
+    os.replace(tmp, DATE_CACHE_FILE)
+
+def date_from_html(html, headers):
+    """메타 태그 → JSON-LD → <time> → Last-Modified 헤더 순으로 발행일 추출"""
+    for pattern in HTML_DATE_PATTERNS:
+        match = pattern.search(html)
+        if match and parse_date(match.group(1)):
+            return normalize_date(match.group(1))
+    return normalize_date(headers.get("Last-Modified"), default=None)
+
+def get_date_http(url):
+    """브라우저 없이 일반 GET 한 번으로 발행일 확인 (못 찾으면 None)"""
+    try:
+        res = get_http_client().get(url, headers=HEADERS, timeout=HTTP_TIMEOUT)
+        if res.status_code != 200: return None
+        return date_from_html(res.text, res.headers)
+    except requests.RequestException:
+        return None
 
 async def get_exact_date(crawler, url, config, site_name):
-    """기사 상세 페이지에서 날짜를 파내기 위한 이중 잠금 로직"""
+    """기사 상세 페이지에서 날짜를 파내기 위한 이중 잠금 로직 (브라우저 렌더링 경로)"""
     try:
         # 페이지 로딩을 기다리며 접속
         result = await crawler.arun(url=url, config=config)
@@ -17,25 +68,39 @@ async def get_exact_date(crawler, url, config, site_name):
         if site_name == "AI타임스":
             # 시/분까지 붙어있는 패턴을 먼저 찾음 (가장 정확)
             match = re.search(r'(\d{4}\.\d{2}\.\d{2})\s+\d{2}:\d{2}', content)
-            if match: return match.group(1).replace('.', '-')
+            if match: return normalize_date(match.group(1))
             # 없으면 날짜만 있는 패턴
             match2 = re.search(r'(\d{4}\.\d{2}\.\d{2})', content)
-            if match2: return match2.group(1).replace('.', '-')
+            if match2: return normalize_date(match2.group(1))
 
         # 2. 벤처비트/테크크런치: 상단 2000자 이내에서 영문/숫자 날짜 찾기
         header = content[:2000]
         # 숫자형 (2026-01-28)
         date_match = re.search(r'(\d{4}[-./]\d{2}[-./]\d{2})', header)
-        if date_match: return date_match.group(1).replace('.', '-').replace('/', '-')
+        if date_match: return normalize_date(date_match.group(1))
         
         # 영문형 (January 28, 2026)
         eng_match = re.search(r'([A-Z][a-z]+ \d{1,2}, \d{4})', header)
-        if eng_match:
-            dt = datetime.strptime(eng_match.group(1), "%B %d, %Y")
-            return dt.strftime("%Y-%m-%d")
+        if eng_match: return normalize_date(eng_match.group(1))
             
     except: pass
-    return "날짜확인필요"
+    return UNKNOWN_DATE
+
+async def resolve_dates(crawler, candidates, config, site_name, cache, http_sem, browser_sem):
+    """후보 기사들의 발행일을 동시에 확인: 캐시 → HTTP 빠른 경로 → 브라우저 순"""
+    async def resolve(link):
+        if link in cache:
+            return cache[link]
+        async with http_sem:
+            exact_date = await asyncio.to_thread(get_date_http, link)
+        if not exact_date:
+            async with browser_sem:
+                exact_date = await get_exact_date(crawler, link, config, site_name)
+        if exact_date != UNKNOWN_DATE:
+            cache[link] = exact_date
+        return exact_date
+
+    return await asyncio.gather(*(resolve(link) for _, link in candidates))
 
 async def main():
     target_sites = {
@@ -55,7 +120,12 @@ async def main():
     )
     
     final_data = []
+    date_cache = load_date_cache()
+    http_sem = asyncio.Semaphore(MAX_CONCURRENCY)
+    browser_sem = asyncio.Semaphore(MAX_BROWSER_PAGES)
     today_str = datetime.now().strftime("%Y-%m-%d")
+    near_dups = get_near_duplicate_index()
+    run_clusters, clusters = set(), {}
 
     async with AsyncWebCrawler(config=browser_config) as crawler:
         for site_name, url in target_sites.items():
@@ -66,43 +136,54 @@ async def main():
                 # 기사 링크 추출
                 links = re.findall(r'\[([^\]]{28,})\]\(([^\)]+)\)', list_result.markdown)
                 
-                count = 0
+                # 제목/링크 후보를 먼저 추리고
+                candidates = []
                 for title, link in links:
                     title_clean = re.sub(r'[\[\]\r\n\t]', '', title).strip()
                     # 이미지 및 불필요 링크 제거
                     if "![" in title or any(ext in link.lower() for ext in ['.jpg', '.png', 'wp-content']): continue
-                    
+                    # 같은 이야기(다른 사이트·표현 포함)는 이번 실행에서 한 번만
                     full_link = urljoin(url, link)
-                    if any(d['제목'] == title_clean for d in final_data): continue
-
-                    # 기사 안으로 들어가서 날짜 가져오기
-                    print(f"   🔎 상세 페이지 확인: {title_clean[:15]}...")
-                    exact_date = await get_exact_date(crawler, full_link, run_config, site_name)
-                    
-                    # 연도 필터링
-                    if not any(year in exact_date for year in allowed_years):
-                        if exact_date != "날짜확인필요": continue
-
-                    final_data.append({
-                        "출처": site_name,
-                        "수집일": today_str,
-                        "발행일": exact_date,
-                        "제목": title_clean,
-                        "링크": full_link
-                    })
-                    count += 1
-                    if count >= 6: break # 한 사이트당 6개씩
+                    match = near_dups.assign(title_clean, link=full_link, source=site_name)
+                    if match.cluster_id in run_clusters: continue
+                    run_clusters.add(match.cluster_id)
+                    clusters[full_link] = match.cluster_id
+                    candidates.append((title_clean, full_link))
+
+                # 부족한 개수만큼씩 묶어 상세 페이지 날짜를 동시에 확인
+                count = 0
+                while candidates and count < 6: # 한 사이트당 6개씩
+                    chunk, candidates = candidates[:6 - count], candidates[6 - count:]
+                    print(f"   🔎 상세 페이지 {len(chunk)}건 동시 확인...")
+                    dates = await resolve_dates(crawler, chunk, run_config, site_name, date_cache, http_sem, browser_sem)
+
+                    for (title_clean, full_link), exact_date in zip(chunk, dates):
+                        # 연도 필터링
+                        if not any(year in exact_date for year in allowed_years):
+                            if exact_date != UNKNOWN_DATE: continue
+
+                        final_data.append({
+                            "출처": site_name,
+                            "수집일": today_str,
+                            "발행일": exact_date,
+                            "제목": title_clean,
+                            "링크": full_link,
+                            "클러스터": clusters[full_link]
+                        })
+                        count += 1
+
+    save_date_cache(date_cache)
+    near_dups.report()
 
     # 💾 정렬: 1. 출처별(가나다) -> 2. 발행일순(최신순)
     final_data.sort(key=lambda x: (x['출처'], x['발행일']), reverse=False)
     
     file_name = 'ai_trend_report.csv'
-    with open(file_name, 'w', newline='', encoding='utf-8-sig') as f:
-        writer = csv.DictWriter(f, fieldnames=["출처", "수집일", "발행일", "제목", "링크"])
-        writer.writeheader()
-        writer.writerows(final_data)
+    with stage("write"):
+        export(file_name, final_data, ["출처", "수집일", "발행일", "제목", "링크", "클러스터"])
     
     print(f"\n🎉 성공! '{file_name}' 파일을 확인해보세요.")
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    with collector_run("ai_trend"):
+        asyncio.run(main())
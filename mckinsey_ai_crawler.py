@@ -1,8 +1,13 @@
 import feedparser
-import csv
-import time
+import os
 from datetime import datetime
-from googletrans import Translator
+from translation_memory import get_translation_memory
+from date_normalizer import normalize_date
+from keyword_matcher import KeywordMatcher
+from http_client import get_http_client
+from near_duplicates import get_near_duplicate_index
+from instrumentation import collector_run, stage
+from exporters import export
 
 def main():
     # 🎯 가장 신뢰도 높은 2대 지식 창고만 타겟팅
@@ -12,19 +17,34 @@ def main():
     ]
     
     file_name = 'ai_market_intelligence.csv'
-    translator = Translator()
+    translator = get_translation_memory()
     collected_date = datetime.now().strftime("%Y-%m-%d")
     
-    # 💡 AI 및 경영 혁신 관련 핵심 키워드
-    ai_keywords = ['AI', 'GEN', 'DIGITAL', 'TECH', 'INTELLIGENCE', 'DATA', 'FUTURE', 'AUTOMATION']
+    # 💡 AI 및 경영 혁신 관련 핵심 키워드 (한 번 컴파일해 제목마다 한 번만 스캔)
+    ai_keywords = KeywordMatcher({"ai": ['AI', 'GEN', 'DIGITAL', 'TECH', 'INTELLIGENCE', 'DATA', 'FUTURE', 'AUTOMATION']})
 
     print(f"📡 [정예 엔진] McKinsey & MIT Sloan 수집 시작...")
     new_data = []
 
+    # 조건부 요청: 모든 피드가 304(변경 없음)면 결과 파일도 그대로이므로 바로 종료
+    client = get_http_client()
+    responses = {}
+    for source in sources:
+        try:
+            responses[source['name']] = client.get(source['url'], conditional=True)
+        except Exception as e:
+            print(f"   ❌ {source['name']} 요청 실패: {e}")
+    if os.path.exists(file_name) and responses and len(responses) == len(sources) and \
+            all(res.status_code == 304 for res in responses.values()):
+        print("💤 모든 피드 변경 없음 (304) → 기존 파일을 그대로 둡니다.")
+        return
+
     for source in sources:
         print(f"🔍 {source['name']} 분석 중...")
         try:
-            feed = feedparser.parse(source['url'])
+            if source['name'] not in responses: continue
+            # 304인 피드는 지난번 본문으로 다시 파싱해 결과 파일의 해당 기관 행을 유지
+            feed = feedparser.parse(responses[source['name']].content)
             if not feed.entries:
                 print(f"   ⚠️ {source['name']} 피드 응답 없음")
                 continue
@@ -33,22 +53,15 @@ def main():
             for entry in feed.entries:
                 title_en = entry.title
                 # AI 관련 기사인지 제목에서 1차 검축
-                if any(kw in title_en.upper() for kw in ai_keywords):
+                if ai_keywords.matches_any(title_en):
                     
                     # 날짜 처리
-                    raw_date = entry.get('published_parsed', None)
-                    published_date = time.strftime('%Y-%m-%d', raw_date) if raw_date else collected_date
-
-                    # 한국어 번역
-                    try:
-                        title_ko = translator.translate(title_en, dest='ko').text
-                    except:
-                        title_ko = title_en
+                    published_date = normalize_date(entry.get('published_parsed'), default=collected_date)
 
                     new_data.append({
                         "기관": source['name'],
                         "발행일": published_date,
-                        "제목": title_ko,
+                        "제목": title_en,
                         "원문": title_en,
                         "링크": entry.link,
                         "수집일": collected_date
@@ -61,16 +74,23 @@ def main():
         except Exception as e:
             print(f"   ❌ {source['name']} 에러 발생: {e}")
 
+    # 한국어 번역 (전체 제목을 묶어서 1회 요청, 캐시 적중분은 네트워크 생략)
+    for item, title_ko in zip(new_data, translator.translate_many([d['원문'] for d in new_data], dest='ko')):
+        item['제목'] = title_ko
+    translator.report()
+
+    # 민간 컨설팅 모니터(Google News 경유)와 겹치는 기사에 같은 묶음 번호 표시
+    get_near_duplicate_index().annotate(new_data)
+
     # 💾 결과 저장 (최신순 정렬)
     if new_data:
         new_data.sort(key=lambda x: x['발행일'], reverse=True)
-        with open(file_name, 'w', newline='', encoding='utf-8-sig') as f:
-            writer = csv.DictWriter(f, fieldnames=["기관", "발행일", "제목", "원문", "링크", "수집일"])
-            writer.writeheader()
-            writer.writerows(new_data)
+        with stage("write"):
+            export(file_name, new_data, ["기관", "발행일", "제목", "원문", "링크", "수집일", "클러스터"])
         print(f"\n🎉 작업 완료! 엑셀 파일이 업데이트되었습니다.")
     else:
         print("\n💡 수집된 새로운 데이터가 없습니다.")
 
 if __name__ == "__main__":
-    main()
+    with collector_run("mckinsey"):
+        main()
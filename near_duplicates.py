@@ -0,0 +1,228 @@
+import hashlib
+import random
+import re
+import sqlite3
+import struct
+import threading
+import time
+import unicodedata
+from array import array
+from collections import namedtuple
+from article_store import canonical_link
+from cache_paths import cache_path
+from instrumentation import stage
+
+# numpy가 있으면 서명 계산/비교를 벡터 연산으로 (없으면 순수 파이썬으로 같은 값 계산)
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+NUM_PERM = 64            # MinHash 서명 길이
+BANDS = 16               # LSH 밴드 수 (밴드당 NUM_PERM // BANDS = 4행 → 유사도 0.5 부근부터 후보로 잡힘)
+THRESHOLD = 0.7          # 같은 이야기로 볼 추정 Jaccard 유사도 하한 (정형화된 관보 제목끼리 묶이지 않을 정도)
+SHINGLE = 3              # 글자 n-gram 크기 (띄어쓰기 없는 한·중·일 제목도 같은 방식으로 처리)
+MAX_BUCKET = 50          # 버킷 하나에서 비교할 최대 후보 수 (흔한 짧은 제목 대비)
+
+_MASK64 = (1 << 64) - 1
+_rng = random.Random(20250101)   # 서명이 실행마다 같아야 하므로 고정 시드
+_PERMS = [(_rng.getrandbits(64) | 1, _rng.getrandbits(64)) for _ in range(NUM_PERM)]
+if np is not None:
+    _PERM_A = np.array([a for a, _ in _PERMS], dtype=np.uint64)[:, None]
+    _PERM_B = np.array([b for _, b in _PERMS], dtype=np.uint64)[:, None]
+_PUBLISHER_SUFFIX = re.compile(r"\s+[-|–—]\s+[^-|–—]{2,40}$")   # "제목 - 언론사" (Google News)
+_NON_WORD = re.compile(r"[^\w]+")
+
+Match = namedtuple("Match", "cluster_id item_id duplicate similarity")
+
+
+def normalize_title(title):
+    """비교용 제목: NFKC, 소문자, 언론사 꼬리표·문장부호 제거, 공백 하나로"""
+    text = unicodedata.normalize("NFKC", title or "").lower().strip()
+    text = _PUBLISHER_SUFFIX.sub("", text)
+    return _NON_WORD.sub(" ", text).strip()
+
+
+def _shingles(text):
+    if len(text) <= SHINGLE:
+        return {text} if text else set()
+    return {text[i:i + SHINGLE] for i in range(len(text) - SHINGLE + 1)}
+
+
+def signature(title):
+    """정규화한 제목의 글자 n-gram MinHash 서명 (빈 제목이면 None)"""
+    shingles = _shingles(normalize_title(title))
+    if not shingles:
+        return None
+    hashes = [int.from_bytes(hashlib.blake2b(s.encode("utf-8"), digest_size=8).digest(), "little")
+              for s in shingles]
+    if np is not None:
+        with np.errstate(over="ignore"):   # uint64 곱셈의 자리 넘침 = mod 2^64
+            values = ((_PERM_A * np.array(hashes, dtype=np.uint64) + _PERM_B) >> np.uint64(32)).min(axis=1)
+        return array("I", values.astype(np.uint32).tobytes())
+    return array("I", [min(((a * h + b) & _MASK64) >> 32 for h in hashes) for a, b in _PERMS])
+
+
+def similarity(sig_a, sig_b):
+    """두 서명의 일치 비율 = Jaccard 유사도 추정치"""
+    return sum(x == y for x, y in zip(sig_a, sig_b)) / NUM_PERM
+
+
+def _band_keys(sig):
+    rows = NUM_PERM // BANDS
+    for band in range(BANDS):
+        chunk = sig[band * rows:(band + 1) * rows]
+        digest = hashlib.blake2b(chunk.tobytes(), digest_size=8).digest()
+        yield band, struct.unpack("<q", digest)[0]
+
+
+class NearDuplicateIndex:
+    """여러 수집기에 걸쳐 같은 이야기를 묶는 근사 중복 색인 (MinHash + LSH, SQLite에 영구 보관)
+
+    - 제목(원문)과 한글 제목을 각각 서명으로 저장 → 언어가 달라도 한쪽만 비슷하면 같은 묶음
+    - 밴드별 버킷 조회로 후보만 뽑아 비교하므로 보관 건수와 관계없이 새 항목 1건당 조회 비용이 일정
+    - assign()은 버리지 않고 묶음 번호(cluster_id)를 돌려줌 → 수집기가 표시/제외를 결정
+    - 같은 링크(canonical_link 기준)가 다시 들어오면 기존 묶음 번호를 그대로 돌려줌
+    """
+
+    def __init__(self, path=None, threshold=THRESHOLD):
+        self.path = path or cache_path("near_duplicates.sqlite3")
+        self.threshold = threshold
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.path, check_same_thread=False)
+        self._db.executescript("""
+            CREATE TABLE IF NOT EXISTS items (
+                id INTEGER PRIMARY KEY, link TEXT UNIQUE, cluster_id INTEGER NOT NULL,
+                source TEXT, title TEXT, added REAL
+            );
+            CREATE TABLE IF NOT EXISTS signatures (
+                item_id INTEGER NOT NULL, variant TEXT NOT NULL, sig BLOB NOT NULL,
+                PRIMARY KEY (item_id, variant)
+            );
+            CREATE TABLE IF NOT EXISTS bands (band INTEGER NOT NULL, bucket INTEGER NOT NULL, item_id INTEGER NOT NULL);
+            CREATE INDEX IF NOT EXISTS idx_bands_bucket ON bands(band, bucket);
+            CREATE INDEX IF NOT EXISTS idx_items_cluster ON items(cluster_id);
+        """)
+        self._db.commit()
+        self.stats = {"assigned": 0, "known_links": 0, "new_clusters": 0, "near_duplicates": 0, "compared": 0}
+
+    def _candidates(self, sig):
+        found = set()
+        for band, bucket in _band_keys(sig):
+            rows = self._db.execute("SELECT item_id FROM bands WHERE band = ? AND bucket = ? LIMIT ?",
+                                    (band, bucket, MAX_BUCKET)).fetchall()
+            found.update(row[0] for row in rows)
+        return found
+
+    def _best_match(self, sigs):
+        """서명들(원문/한글)과 가장 비슷한 기존 항목 → (item_id, cluster_id, 유사도) 또는 None"""
+        best = None
+        for sig in sigs:
+            candidates = self._candidates(sig)
+            if not candidates:
+                continue
+            marks = ",".join("?" * len(candidates))
+            rows = self._db.execute(f"""
+                SELECT s.item_id, i.cluster_id, s.sig FROM signatures s JOIN items i ON i.id = s.item_id
+                WHERE s.item_id IN ({marks})
+            """, list(candidates)).fetchall()
+            self.stats["compared"] += len(rows)
+            if np is not None:
+                matrix = np.frombuffer(b"".join(row[2] for row in rows), dtype=np.uint32).reshape(len(rows), NUM_PERM)
+                scores = (matrix == np.frombuffer(sig.tobytes(), dtype=np.uint32)).mean(axis=1).tolist()
+            else:
+                scores = [similarity(sig, array("I", row[2])) for row in rows]
+            for (item_id, cluster_id, _), score in zip(rows, scores):
+                if score >= self.threshold and (best is None or score > best[2]):
+                    best = (item_id, cluster_id, score)
+        return best
+
+    def _store_signature(self, item_id, variant, sig):
+        cur = self._db.execute("INSERT OR IGNORE INTO signatures VALUES (?, ?, ?)", (item_id, variant, sig.tobytes()))
+        if cur.rowcount:
+            self._db.executemany("INSERT INTO bands VALUES (?, ?, ?)",
+                                 [(band, bucket, item_id) for band, bucket in _band_keys(sig)])
+
+    def assign(self, title, link=None, source=None, title_ko=None):
+        """항목 1건을 색인에 추가하고 Match(cluster_id, item_id, duplicate, similarity) 반환
+
+        duplicate=True면 이미 있던 묶음(다른 링크의 비슷한 제목 또는 같은 링크)에 들어간 것입니다.
+        """
+        return self.assign_many([(title, link, source, title_ko)])[0]
+
+    def assign_many(self, items):
+        """(제목, 링크, 출처, 한글 제목) 목록을 한 트랜잭션으로 처리 → 입력 순서대로 Match 리스트"""
+        prepared = []
+        for title, link, source, title_ko in items:
+            variants = {"orig": signature(title)}
+            if title_ko and title_ko != title:
+                variants["ko"] = signature(title_ko)
+            prepared.append((title, canonical_link(link) or None, source,
+                             {k: v for k, v in variants.items() if v is not None}))
+        with stage("dedupe"), self._lock, self._db:
+            return [self._assign(*args) for args in prepared]
+
+    def _assign(self, title, key, source, variants):
+        self.stats["assigned"] += 1
+        if key:
+            row = self._db.execute("SELECT id, cluster_id FROM items WHERE link = ?", (key,)).fetchone()
+            if row:
+                self.stats["known_links"] += 1
+                for variant, sig in variants.items():
+                    self._store_signature(row[0], variant, sig)
+                return Match(row[1], row[0], True, 1.0)
+
+        best = self._best_match(variants.values())
+        cur = self._db.execute("INSERT INTO items (link, cluster_id, source, title, added) VALUES (?, 0, ?, ?, ?)",
+                               (key, source, title, time.time()))
+        item_id = cur.lastrowid
+        cluster_id = best[1] if best else item_id
+        self._db.execute("UPDATE items SET cluster_id = ? WHERE id = ?", (cluster_id, item_id))
+        for variant, sig in variants.items():
+            self._store_signature(item_id, variant, sig)
+        self.stats["near_duplicates" if best else "new_clusters"] += 1
+        return Match(cluster_id, item_id, best is not None, best[2] if best else 0.0)
+
+    def add_translation(self, link, title_ko):
+        """번역이 나중에 끝난 항목에 한글 제목 서명을 추가 (이후 한국어 기사와도 묶이도록)"""
+        key = canonical_link(link)
+        sig = signature(title_ko)
+        if not key or sig is None:
+            return
+        with self._lock, self._db:
+            row = self._db.execute("SELECT id FROM items WHERE link = ?", (key,)).fetchone()
+            if row:
+                self._store_signature(row[0], "ko", sig)
+
+    def annotate(self, rows, title_key="원문", ko_key="제목", link_key="링크", source_key="기관", field="클러스터"):
+        """CSV 행(dict) 목록에 묶음 번호 열을 채움 (행은 그대로 두고 표시만)"""
+        matches = self.assign_many([(row.get(title_key), row.get(link_key), row.get(source_key), row.get(ko_key))
+                                    for row in rows])
+        for row, match in zip(rows, matches):
+            row[field] = match.cluster_id
+        return rows
+
+    def cluster_members(self, cluster_id):
+        return self._db.execute("SELECT source, title, link FROM items WHERE cluster_id = ? ORDER BY id",
+                                (cluster_id,)).fetchall()
+
+    def report(self):
+        s = self.stats
+        print(f"🧩 근사 중복 색인: 처리 {s['assigned']}건 | 기존 링크 {s['known_links']}건 | "
+              f"비슷한 기사 묶음 {s['near_duplicates']}건 | 새 묶음 {s['new_clusters']}건 | 후보 비교 {s['compared']}회")
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+_shared = None
+_shared_lock = threading.Lock()
+
+def get_near_duplicate_index():
+    """프로세스 전체에서 하나의 근사 중복 색인을 공유"""
+    global _shared
+    with _shared_lock:
+        if _shared is None:
+            _shared = NearDuplicateIndex()
+        return _shared
@@ -0,0 +1,219 @@
+import argparse
+import asyncio
+import importlib
+import inspect
+import os
+import sys
+import threading
+import time
+import traceback
+from collections import namedtuple
+from datetime import datetime
+from instrumentation import METRICS, SamplingProfiler, REPORT_DIR, add_profile_arg, print_stage_summary, write_reports
+
+# 수집기 등록부: 이름 → (모듈, 진입 함수, 제한 시간(초), 정기 실행 여부, 설명)
+# 정기 실행(scheduled=False)이 아닌 수집기는 --all 또는 --only로만 실행됩니다.
+Collector = namedtuple("Collector", "module func timeout scheduled description")
+
+COLLECTORS = {
+    "naver_news":       Collector("crawl_news", "main", 300, True, "네이버 AI 뉴스 + 과기정통부"),
+    "ict_policy":       Collector("crawler_script", "main", 900, True, "글로벌 50개 부처 ICT 정책"),
+    "global_ai_policy": Collector("global_ai_monitor", "main", 600, True, "글로벌 AI 정책 모니터"),
+    "oecd":             Collector("oecd_only", "main", 600, True, "OECD AI"),
+    "private_ai":       Collector("private_consulting_ai", "main", 600, True, "민간 컨설팅사 AI 리포트"),
+    "openai":           Collector("crawl_openai", "crawl_openai_rss", 300, True, "OpenAI 뉴스 RSS"),
+    "gartner":          Collector("gartner_bot", "crawl_gartner_final", 300, True, "가트너 인사이트"),
+    "mckinsey":         Collector("mckinsey_ai_crawler", "main", 600, False, "McKinsey & MIT Sloan"),
+    "whitehouse_ict":   Collector("whitehouse_ict_2025", "main", 900, True, "백악관 행정명령 ICT 분석"),
+    "federal_register": Collector("trump_ict_analyzer_2025", "fetch_us_data", 1800, True, "미국 관보 2025 아카이브"),
+    "eu_policy":        Collector("eu_policy_bot", "fetch_2025_news_perfect", 300, True, "EU 디지털 정책 뉴스"),
+    "eu_cellar":        Collector("korea_policy_bot", "fetch_eu_cellar_final_match", 600, True, "EU Cellar 문서"),
+    "japan_digital":    Collector("japan_digital_bot", "main", 1800, True, "일본 디지털청 아카이브"),
+    "ai_trend":         Collector("main2", "main", 1200, True, "AI 트렌드 (AI타임스/벤처비트/테크크런치)"),
+    "whitehouse_ai":    Collector("scraper", "run_platform", 600, False, "백악관 뉴스 번역/요약"),
+}
+
+
+def _invoke(collector):
+    """수집기 모듈을 그 자리에서 import 해 실행 (코루틴이면 이 스레드 전용 이벤트 루프에서 실행)"""
+    module = importlib.import_module(collector.module)
+    result = getattr(module, collector.func)()
+    if inspect.iscoroutine(result):
+        result = asyncio.run(result)
+    return result
+
+
+class CollectorRun(threading.Thread):
+    """수집기 하나를 별도 스레드에서 실행하고 상태/소요 시간을 기록
+
+    한 수집기의 예외(의존성 누락 포함)나 시간 초과는 다른 수집기에 영향을 주지 않습니다.
+    데몬 스레드이므로 시간 초과로 포기한 수집기가 프로세스 종료를 막지 않습니다.
+    """
+
+    def __init__(self, name, collector, timeout=None):
+        super().__init__(name=f"newsbot-{name}", daemon=True)
+        self.collector_name = name
+        self.collector = collector
+        self.timeout = timeout or collector.timeout
+        self.status = "pending"
+        self.error = None
+        self.elapsed = 0.0
+        self.deadline = None
+
+    def start(self):
+        self._started_at = time.monotonic()
+        self.deadline = self._started_at + self.timeout
+        super().start()
+
+    def run(self):
+        self.status = "running"
+        METRICS.set_collector(self.collector_name)
+        try:
+            _invoke(self.collector)
+            self.status = "ok"
+        except (Exception, SystemExit) as e:
+            self.status = "failed"
+            self.error = e
+            print(f"\n❌ [{self.collector_name}] 실패: {e}")
+            traceback.print_exc()
+        finally:
+            self.elapsed = time.monotonic() - self._started_at
+
+    def wait(self):
+        self.join(max(0.0, self.deadline - time.monotonic()))
+        if self.is_alive():
+            self.status = "timeout"
+            self.elapsed = time.monotonic() - self._started_at
+        return self.status
+
+
+def select_collectors(only=None, include_all=False):
+    if only:
+        unknown = [name for name in only if name not in COLLECTORS]
+        if unknown:
+            raise SystemExit(f"❌ 알 수 없는 수집기: {', '.join(unknown)} (사용 가능: {', '.join(COLLECTORS)})")
+        return list(dict.fromkeys(only))
+    return [name for name, c in COLLECTORS.items() if include_all or c.scheduled]
+
+
+def run_collectors(names, timeout=None, profile=False):
+    """선택된 수집기를 동시에 실행 → {이름: CollectorRun}. 전체 소요 시간은 가장 느린 수집기 수준
+
+    실행이 끝나면 수집기별 상태/단계 시간/HTTP 통계를 실행 기록(JSONL)과 Prometheus textfile로 남깁니다.
+    """
+    runs = {name: CollectorRun(name, COLLECTORS[name], timeout) for name in names}
+    METRICS.default_collector = "newsbot"   # 수집기 내부 작업 스레드에서 기록된 단계는 여기로 모임
+    profiler = SamplingProfiler().start() if profile else None
+    started = time.monotonic()
+    print(f"🚀 수집기 {len(runs)}개 동시 실행: {', '.join(runs)}")
+    for run in runs.values():
+        run.start()
+    for run in runs.values():
+        run.wait()
+
+    icons = {"ok": "✅", "failed": "❌", "timeout": "⏱️"}
+    print(f"\n📋 실행 결과 (전체 {time.monotonic() - started:.1f}초)")
+    for name, run in runs.items():
+        detail = f" - {run.error}" if run.error else (f" - {run.timeout}초 초과" if run.status == "timeout" else "")
+        print(f"   {icons.get(run.status, '•')} {name:<17} {run.elapsed:7.1f}초{detail}")
+    _report_shared()
+    _refresh_search_index()
+
+    extra = None
+    if profiler:
+        profiler.stop()
+        os.makedirs(REPORT_DIR, exist_ok=True)
+        folded = os.path.join(REPORT_DIR, f"profile_newsbot_{datetime.now():%Y%m%d_%H%M%S}.folded")
+        profiler.report(folded)
+        extra = {"profile": folded}
+    collectors = {name: {"status": run.status, "seconds": round(run.elapsed, 3),
+                         "error": str(run.error) if run.error else None} for name, run in runs.items()}
+    report = write_reports("newsbot", collectors, time.monotonic() - started, extra=extra)
+    print_stage_summary(report)
+    print(f"📈 실행 기록: {REPORT_DIR}")
+    return runs
+
+
+def _report_shared():
+    """수집기들이 함께 쓴 번역 메모리/링크 해독 캐시/요약 캐시/근사 중복 색인/HTTP 클라이언트 통계 (실제로 쓰인 것만)"""
+    for module_name in ("translation_memory", "gnews_decoder", "summarizer", "near_duplicates", "http_client"):
+        module = sys.modules.get(module_name)
+        shared = getattr(module, "_shared", None) if module else None
+        if shared is not None:
+            shared.report()
+
+
+def _refresh_search_index():
+    """수집기가 새로 쓴/덧붙인 보관 파일을 검색 색인에 반영 (실패해도 실행 결과에는 영향 없음)"""
+    try:
+        from search_index import get_search_index
+        index = get_search_index()
+        index.refresh()
+        index.report()
+    except Exception as e:
+        print(f"⚠️ 검색 색인 갱신 실패: {e}")
+
+
+def cmd_run(args):
+    names = select_collectors(args.only, args.all)
+    runs = run_collectors(names, timeout=args.timeout, profile=args.profile)
+    return 0 if all(run.status == "ok" for run in runs.values()) else 1
+
+
+def cmd_search(args):
+    from search_index import get_search_index
+    index = get_search_index()
+    started = time.perf_counter()
+    index.refresh(full=args.reindex)   # 바뀐 보관 파일만 다시 읽음 (그대로면 파일 상태 확인만)
+    refreshed = time.perf_counter()
+    results = index.search(" ".join(args.query), limit=args.limit, source=args.source, agency=args.agency,
+                           doc_type=args.type, since=args.since, until=args.until)
+    elapsed = (time.perf_counter() - refreshed) * 1000
+    print(f"🔎 '{' '.join(args.query)}' → {len(results)}건 (검색 {elapsed:.1f} ms, "
+          f"색인 확인 {(refreshed - started) * 1000:.1f} ms)")
+    for rank, r in enumerate(results, 1):
+        meta = " | ".join(filter(None, [r["date"], r["source"], r["agency"], r["type"]]))
+        print(f"{rank:>3}. [{r['score']:.2f}] {meta}\n     {r['title']}\n     {r['link']}")
+    if args.reindex:
+        index.report()
+    return 0
+
+
+def cmd_list(args):
+    for name, c in COLLECTORS.items():
+        mark = "정기" if c.scheduled else "수동"
+        print(f"{name:<17} [{mark}] {c.module}.{c.func}  (제한 {c.timeout}초)  {c.description}")
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="newsbot", description="뉴스/정책 수집기 통합 실행기")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = sub.add_parser("run", help="수집기를 한 프로세스에서 동시에 실행")
+    run_parser.add_argument("--only", action="append", metavar="NAME", help="이 수집기만 실행 (여러 번 지정 가능)")
+    run_parser.add_argument("--all", action="store_true", help="수동 전용 수집기까지 모두 실행")
+    run_parser.add_argument("--timeout", type=int, help="모든 수집기에 같은 제한 시간(초) 적용")
+    add_profile_arg(run_parser)
+    run_parser.set_defaults(handler=cmd_run)
+
+    search_parser = sub.add_parser("search", help="모든 보관 CSV를 대상으로 전문 검색 (BM25)")
+    search_parser.add_argument("query", nargs="+", help="검색어 (한국어/일본어는 글자 2-gram으로 매칭)")
+    search_parser.add_argument("--source", help="출처 이름 (예: federal_register, japan_digital)")
+    search_parser.add_argument("--agency", help="기관/발행부처 (부분 일치)")
+    search_parser.add_argument("--type", help="문서 종류/분류 (부분 일치)")
+    search_parser.add_argument("--since", help="이 날짜 이후 (YYYY-MM-DD)")
+    search_parser.add_argument("--until", help="이 날짜 이전 (YYYY-MM-DD)")
+    search_parser.add_argument("--limit", type=int, default=20, help="결과 수 (기본 20)")
+    search_parser.add_argument("--reindex", action="store_true", help="색인을 비우고 모든 보관 파일을 다시 읽음")
+    search_parser.set_defaults(handler=cmd_search)
+
+    list_parser = sub.add_parser("list", help="등록된 수집기 목록")
+    list_parser.set_defaults(handler=cmd_list)
+
+    args = parser.parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
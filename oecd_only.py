@@ -1,9 +1,13 @@
 import feedparser
-import csv
 import urllib.parse
 from datetime import datetime
-from googletrans import Translator
-from googlenewsdecoder import gnewsdecoder # 💡 암호 해독 전문 도구
+from translation_memory import get_translation_memory
+from date_normalizer import normalize_date
+from http_client import get_http_client
+from gnews_decoder import get_link_decoder # 💡 암호 해독 전문 도구 (캐시/동시 처리)
+from near_duplicates import get_near_duplicate_index
+from instrumentation import collector_run, stage
+from exporters import export
 
 def main():
     # 🎯 검색어: OECD 사이트 내의 AI 관련 문서
@@ -12,14 +16,17 @@ def main():
     rss_url = f"https://news.google.com/rss/search?q={encoded_query}&hl=en-US&gl=US&ceid=US:en"
     
     file_name = 'oecd_ai_intelligence.csv'
-    translator = Translator()
+    translator = get_translation_memory()
+    decoder = get_link_decoder()
     collected_date = datetime.now().strftime("%Y-%m-%d")
 
     print(f"📡 OECD 데이터 수집 및 링크 암호 해독 시작...")
     raw_data = []
 
     try:
-        feed = feedparser.parse(rss_url)
+        res = get_http_client().get(rss_url)
+        with stage("parse"):
+            feed = feedparser.parse(res.content)
         print(f"🔍 {len(feed.entries)}개의 뉴스 발견. 원본 링크 추출 중...")
 
         for entry in feed.entries:
@@ -30,51 +37,47 @@ def main():
             if not any(kw in title_en.upper() for kw in keywords):
                 continue
 
-            # 💡 [핵심] 구글 뉴스 암호 해독 (서버 응답 대기 없음)
-            try:
-                decoded = gnewsdecoder(entry.link)
-                actual_link = decoded.get('decoded_url', entry.link)
-            except:
-                actual_link = entry.link
-
             if hasattr(entry, 'published_parsed') and entry.published_parsed:
                 pub_dt = datetime(*entry.published_parsed[:6])
                 raw_data.append({
                     "기관": "OECD",
-                    "발행일": pub_dt.strftime('%Y-%m-%d'),
+                    "발행일": normalize_date(pub_dt),
                     "dt_obj": pub_dt,
                     "제목_en": title_en,
-                    "링크": actual_link
+                    "링크": entry.link
                 })
 
         # 최신순 정렬 후 5개 선택
         raw_data.sort(key=lambda x: x['dt_obj'], reverse=True)
         final_5 = raw_data[:5]
 
+        # 💡 [핵심] 구글 뉴스 암호 해독 (최종 5건만, 캐시 미스는 동시에 해독)
+        for item, actual_link in zip(final_5, decoder.decode_many([item['링크'] for item in final_5])):
+            item['링크'] = actual_link
+        decoder.report()
+
         final_data = []
-        for item in final_5:
-            try:
-                title_ko = translator.translate(item['제목_en'].strip(), dest='ko').text
-            except:
-                title_ko = item['제목_en']
-            
+        titles_ko = translator.translate_many([item['제목_en'] for item in final_5], dest='ko')
+        translator.report()
+        for item, title_ko in zip(final_5, titles_ko):
             final_data.append({
                 "기관": "OECD", "발행일": item['발행일'], "제목": title_ko,
                 "원문": item['제목_en'], "링크": item['링크'], "수집일": collected_date
             })
+        # 글로벌 AI 정책 모니터의 OECD 기사와 겹치면 같은 묶음 번호
+        get_near_duplicate_index().annotate(final_data)
 
     except Exception as e:
         print(f"❌ 오류 발생: {e}")
 
     # 💾 결과 저장
-    with open(file_name, 'w', newline='', encoding='utf-8-sig') as f:
-        writer = csv.DictWriter(f, fieldnames=["기관", "발행일", "제목", "원문", "링크", "수집일"])
-        writer.writeheader()
+    with stage("write"):
+        export(file_name, final_data, ["기관", "발행일", "제목", "원문", "링크", "수집일", "클러스터"])
         if final_data:
-            writer.writerows(final_data)
             print(f"✅ 성공! 원본 링크로 변환된 {len(final_data)}건 저장 완료.")
         else:
             print("⚠️ 조건에 맞는 데이터가 없습니다.")
 
 if __name__ == "__main__":
-    main()
+    with collector_run("oecd"):
+        main()
@@ -1,9 +1,13 @@
 import feedparser
-import csv
 import urllib.parse
 from datetime import datetime
-from googletrans import Translator
-from googlenewsdecoder import gnewsdecoder
+from translation_memory import get_translation_memory
+from date_normalizer import normalize_date
+from http_client import get_http_client
+from gnews_decoder import get_link_decoder
+from near_duplicates import get_near_duplicate_index
+from instrumentation import collector_run, stage
+from exporters import export
 
 def main():
     # 🎯 민간 컨설팅사 타겟팅
@@ -16,7 +20,8 @@ def main():
     }
 
     file_name = 'private_consulting_ai_monitor.csv'
-    translator = Translator()
+    translator = get_translation_memory()
+    decoder = get_link_decoder()
     collected_date = datetime.now().strftime("%Y-%m-%d")
     all_data = []
 
@@ -28,7 +33,9 @@ def main():
         rss_url = f"https://news.google.com/rss/search?q={encoded_query}&hl=en-US&gl=US&ceid=US:en"
         
         try:
-            feed = feedparser.parse(rss_url)
+            res = get_http_client().get(rss_url)
+            with stage("parse"):
+                feed = feedparser.parse(res.content)
             # 사별로 최신 3~4건씩 검토
             entries = sorted(feed.entries, key=lambda x: x.get('published_parsed'), reverse=True)[:5]
             
@@ -36,45 +43,46 @@ def main():
                 title_en = entry.title.split(' - ')[0]
                 if len(title_en.split()) <= 2: continue
 
-                # 💡 구글 뉴스 암호 해독
-                try:
-                    decoded = gnewsdecoder(entry.link)
-                    link = decoded.get('decoded_url', entry.link)
-                except:
-                    link = entry.link
-
-                # 💡 PDF 여부 판별
-                is_pdf = "YES" if link.lower().endswith('.pdf') or ".pdf?" in link.lower() else "NO"
-
-                # 날짜 및 번역
-                pub_date = datetime(*entry.published_parsed[:6]).strftime('%Y-%m-%d') if hasattr(entry, 'published_parsed') else collected_date
-                try:
-                    title_ko = translator.translate(title_en, dest='ko').text
-                except:
-                    title_ko = title_en
+                # 날짜 (번역은 수집 후 일괄 처리)
+                pub_date = normalize_date(entry.get('published_parsed'), default=collected_date)
 
                 all_data.append({
                     "기관": firm,
                     "발행일": pub_date,
-                    "제목": f"{'[PDF] ' if is_pdf == 'YES' else ''}{title_ko}",
+                    "제목": title_en,
                     "원문": title_en,
-                    "PDF여부": is_pdf,
-                    "링크": link,
+                    "PDF여부": "NO",
+                    "링크": entry.link,
                     "수집일": collected_date
                 })
         except Exception as e:
             print(f"⚠️ {firm} 처리 중 오류: {e}")
 
+    # 💡 구글 뉴스 암호 해독 (캐시 미스만 동시에 해독) 후 PDF 여부 판별
+    for item, link in zip(all_data, decoder.decode_many([d['링크'] for d in all_data])):
+        item['링크'] = link
+        item['PDF여부'] = "YES" if link.lower().endswith('.pdf') or ".pdf?" in link.lower() else "NO"
+    decoder.report()
+
+    # 번역 (전체 제목을 묶어서 1회 요청, 캐시 적중분은 네트워크 생략)
+    for item, title_ko in zip(all_data, translator.translate_many([d['원문'] for d in all_data], dest='ko')):
+        item['제목'] = f"{'[PDF] ' if item['PDF여부'] == 'YES' else ''}{title_ko}"
+    translator.report()
+
+    # McKinsey 전용 수집기와 겹치는 기사에 같은 묶음 번호 표시
+    near_dups = get_near_duplicate_index()
+    near_dups.annotate(all_data)
+    near_dups.report()
+
     # 최신순 정렬
     all_data.sort(key=lambda x: x['발행일'], reverse=True)
 
     # 💾 결과 저장
-    fieldnames = ["기관", "발행일", "제목", "원문", "PDF여부", "링크", "수집일"]
-    with open(file_name, 'w', newline='', encoding='utf-8-sig') as f:
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
-        writer.writeheader()
-        writer.writerows(all_data)
+    fieldnames = ["기관", "발행일", "제목", "원문", "PDF여부", "링크", "수집일", "클러스터"]
+    with stage("write"):
+        export(file_name, all_data, fieldnames)
         print(f"✅ 완료! 총 {len(all_data)}건의 민간 인사이트 저장.")
 
 if __name__ == "__main__":
-    main()
+    with collector_run("private_ai"):
+        main()
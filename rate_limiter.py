@@ -0,0 +1,61 @@
+import os
+import threading
+import time
+from urllib.parse import urlparse
+
+
+class TokenBucket:
+    """초당 rate개의 토큰을 채우고 최대 capacity개까지 버스트를 허용하는 토큰 버킷"""
+
+    def __init__(self, rate, capacity=None):
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity is not None else max(1.0, rate))
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, tokens=1.0):
+        """토큰이 생길 때까지 기다린 뒤 소비 (대기한 시간을 초 단위로 반환)"""
+        waited = 0.0
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return waited
+                delay = (tokens - self._tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+
+class HostRateLimiter:
+    """호스트별로 독립된 토큰 버킷을 관리 (등록되지 않은 호스트는 제한 없음)"""
+
+    def __init__(self, limits=None):
+        self._buckets = {}
+        self._lock = threading.Lock()
+        for host, (rate, capacity) in (limits or {}).items():
+            self.set_limit(host, rate, capacity)
+
+    def set_limit(self, host, rate, capacity=None):
+        with self._lock:
+            self._buckets[host.lower()] = TokenBucket(rate, capacity)
+
+    def bucket_for(self, url_or_host):
+        host = urlparse(url_or_host).hostname if "://" in url_or_host else url_or_host
+        return self._buckets.get((host or "").lower())
+
+    def acquire(self, url_or_host, tokens=1.0):
+        bucket = self.bucket_for(url_or_host)
+        return bucket.acquire(tokens) if bucket else 0.0
+
+
+# 🌐 구글 뉴스(RSS 검색 + 링크 해독)는 모든 수집기가 같은 한도를 나눠 씀
+GOOGLE_NEWS_HOST = "news.google.com"
+GOOGLE_NEWS_RPS = float(os.environ.get("GOOGLE_NEWS_RPS", "5"))
+default_limiter = HostRateLimiter({GOOGLE_NEWS_HOST: (GOOGLE_NEWS_RPS, GOOGLE_NEWS_RPS * 2)})
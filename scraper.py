@@ -1,47 +1,41 @@
-import requests
 from bs4 import BeautifulSoup
-import pandas as pd
 from datetime import datetime
-import os
+from exporters import export
+from http_client import get_http_client
+from instrumentation import collector_run, stage
+from summarizer import get_summarizer
 
-# Ai2 모델 호출 함수 (Hugging Face API 이용)
+FAILED_TEXT = "번역/요약 처리 중 오류 발생"
+REPORT_COLUMNS = ["1)기관명", "2)발행일", "3)번역된 제목", "4)원문", "5)요약내용", "6)링크 (URL)", "7)수집일"]
+
+# Ai2 모델 호출 함수 (Hugging Face API 이용, 캐시/묶음 요청/JSON 검증은 공용 요약기가 담당)
 def ask_ai2(text):
-    api_url = "https://api-inference.huggingface.co/models/allenai/OLMo-7B-Instruct"
-    headers = {"Authorization": f"Bearer {os.getenv('HF_TOKEN')}"}
-    
-    # AI에게 내리는 정교한 명령 (프롬프트)
-    prompt = f"당신은 ICT 산업 분석가입니다. 다음 영문 뉴스를 한국어로 제목을 번역하고, 핵심 내용을 3줄로 요약하세요.\n\n내용: {text}\n\n형식:\n번역제목: \n요약: "
-    
-    try:
-        response = requests.post(api_url, headers=headers, json={"inputs": prompt})
-        result = response.json()
-        # AI 답변 추출 (비개발자분들을 위해 예외처리를 간단히 함)
-        return result[0]['generated_text'].split("형식:")[1]
-    except:
-        return "번역/요약 처리 중 오류 발생"
+    """영문 제목 → (번역 제목, 요약) (실패 시 원문 제목과 오류 문구)"""
+    result = get_summarizer().summarize(text)
+    return (result.title_ko, result.summary) if result else (text, FAILED_TEXT)
 
-def run_platform():
+def run_platform(limit=3):
     url = "https://www.whitehouse.gov/news/"
-    response = requests.get(url, headers={"User-Agent": "Mozilla/5.0"})
+    response = get_http_client().get(url, headers={"User-Agent": "Mozilla/5.0"})
     soup = BeautifulSoup(response.text, 'html.parser')
     
     data_list = []
-    # 최신 뉴스 3개만 샘플링
-    articles = soup.find_all('article', limit=3)
-    
-    for article in articles:
+    # 최신 뉴스 limit개만 샘플링
+    articles = []
+    for article in soup.find_all('article', limit=limit):
         title_tag = article.find('a')
-        original_title = title_tag.get_text(strip=True)
-        link = title_tag['href']
+        if title_tag is None:
+            continue
         pub_date = article.find('time').get_text(strip=True) if article.find('time') else "N/A"
-        
-        # --- Ai2 모델 가동 ---
-        ai_response = ask_ai2(original_title)
-        # 결과에서 제목과 요약 분리 (간단한 로직)
-        translated_title = ai_response.split("요약:")[0].replace("번역제목:", "").strip()
-        summary = ai_response.split("요약:")[1].strip()
-        # -------------------
+        articles.append((title_tag.get_text(strip=True), title_tag.get('href'), pub_date))
+
+    # --- Ai2 모델 가동 (기사 전체를 한 번에 넘겨 묶음/동시 요청) ---
+    summarizer = get_summarizer()
+    results = summarizer.summarize_many([title for title, _, _ in articles])
+    summarizer.report()
 
+    for (original_title, link, pub_date), result in zip(articles, results):
+        translated_title, summary = (result.title_ko, result.summary) if result else (original_title, FAILED_TEXT)
         data_list.append({
             "1)기관명": "미국 백악관",
             "2)발행일": pub_date,
@@ -52,8 +46,9 @@ def run_platform():
             "7)수집일": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         })
     
-    df = pd.DataFrame(data_list)
-    df.to_excel("whitehouse_ai_report.xlsx", index=False)
+    with stage("write"):
+        export("whitehouse_ai_report.xlsx", data_list, REPORT_COLUMNS)
 
 if __name__ == "__main__":
-    run_platform()
+    with collector_run("whitehouse_ai"):
+        run_platform()
@@ -0,0 +1,327 @@
+import csv
+import glob
+import hashlib
+import json
+import math
+import os
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import Counter, namedtuple
+from cache_paths import cache_path
+from date_normalizer import normalize_date
+
+# 수집기 CSV가 쌓이는 폴더 (워크플로와 newsbot은 저장소 루트에서 실행)
+ARCHIVE_DIR = os.environ.get("NEWSBOT_ARCHIVE_DIR", ".")
+TITLE_WEIGHT = 2         # 제목에 나온 단어는 본문(초록/원문)보다 2배로 계산
+K1, B = 1.2, 0.75        # BM25 매개변수
+MAX_BODY_CHARS = 20000   # 원문은 앞부분만 색인 (관보 원문은 수십만 자인 경우도 있음)
+
+# 보관 파일별 열 구성: 파일 패턴 → (출처 이름, 제목 열들, 날짜 열, 기관 열, 종류 열, 링크 열, 고유 키 열[, 본문 열])
+# 날짜 열이 없거나 날짜가 아닌 값이면 제목 안의 날짜(예: 일본 디지털청 "2025年1月27日")를 사용
+Archive = namedtuple("Archive", "source titles date agency type link key body", defaults=(None,))
+
+ARCHIVES = {
+    "Federal_Register_2025_Final.csv": Archive("federal_register", ("제목(영문)",), "발행일", "발행부처", "문서종류", "원문링크", "문서번호"),
+    "Federal_Register_2025_Master.csv": Archive("federal_register_master", ("제목",), "발행일", "부처", "종류", "원문링크", "문서번호"),
+    "Federal_Register_Backfill.csv": Archive("fr_backfill", ("title",), "publication_date", "agency_names", "type", "html_url", "document_number"),
+    "Federal_Register_2025_By_Agency.csv": Archive("fr_by_agency", ("제목(한글)", "제목(영문)"), "발행일", "발행부처", "문서종류", "원문링크", None),
+    "trump_2025_api_report.csv": Archive("whitehouse_ict", ("Title",), "발행일", None, "Category", "Link", None, "요약내용"),
+    "trump_2025_summaries.csv": Archive("trump_summaries", ("제목",), "발행일", None, None, "링크", "문서번호", "요약내용"),
+    "Trump_ICT_Policy_Inventory_2025.csv": Archive("trump_ict_inventory", ("Policy_Title",), "Date", None, "Type", "Link", None),
+    "Japan_Digital_2025_Full_Archive.csv": Archive("japan_digital", ("title",), None, None, None, "link", None),
+    "Japan_Digital_Policy_2025.csv": Archive("japan_digital_policy", ("title",), "date", None, None, "link", None),
+    "EU_Policy_2025_Full.csv": Archive("eu_cellar", ("title",), "date", None, None, "link", None),
+    "EU_2025_NEWS_CLEAN.csv": Archive("eu_policy", ("title",), None, None, None, "link", None),
+    "Gartner_Insight_Archive.csv": Archive("gartner", ("title",), "date", None, None, "link", None),
+    "global_ai_policy_monitor.csv": Archive("global_ai_policy", ("제목", "원문"), "발행일", "기관", None, "링크", None),
+    "oecd_ai_intelligence.csv": Archive("oecd", ("제목", "원문"), "발행일", "기관", None, "링크", None),
+    "private_consulting_ai_monitor.csv": Archive("private_ai", ("제목", "원문"), "발행일", "기관", None, "링크", None),
+    "ai_market_intelligence.csv": Archive("mckinsey", ("제목", "원문"), "발행일", "기관", None, "링크", None),
+    "mckinsey_ai_report.csv": Archive("mckinsey_report", ("제목", "원문"), "발행일", "기관", None, "링크", None),
+    "ai_trend_report.csv": Archive("ai_trend", ("제목",), "발행일", "출처", None, "링크", None),
+    "Global_ICT_50_Agencies_*.csv": Archive("ict_policy", ("제목", "원문"), "발행일", "기관", "ICT 분류", "링크", None),
+}
+
+# 한글/가나/한자는 띄어쓰기에 기대지 않고 글자 2-gram으로, 나머지는 단어 단위로
+_CJK = "\u3040-\u30ff\u3130-\u318f\u3400-\u4dbf\u4e00-\u9fff\uac00-\ud7a3\uff66-\uff9f"
+_TOKEN = re.compile(f"([{_CJK}]+)|[^\\W_{_CJK}]+")
+_FR_DOCUMENT = re.compile(r"/documents/\d{4}/\d{2}/\d{2}/([^/]+)/")
+
+
+def tokenize(text):
+    """NFKC + 소문자 후 라틴 계열은 단어, 한·중·일 글자 연속 구간은 2-gram (한 글자 구간은 그대로)"""
+    tokens = []
+    for match in _TOKEN.finditer(unicodedata.normalize("NFKC", text or "").lower()):
+        run = match.group(0)
+        if match.group(1) and len(run) > 1:
+            tokens.extend(run[i:i + 2] for i in range(len(run) - 1))
+        else:
+            tokens.append(run)
+    return tokens
+
+
+def fr_document_number(link):
+    """관보 문서 링크 → 문서번호 (관보 링크가 아니면 None)"""
+    match = _FR_DOCUMENT.search(link or "")
+    return match.group(1) if match else None
+
+
+class FRBodies:
+    """관보 문서 링크 → 본문(초록 + 원문 앞부분) : 수집기가 캐시에 보관해 둔 것만 사용 (네트워크 없음)"""
+
+    def __init__(self):
+        from fr_text_store import RawTextStore
+        self.store = RawTextStore()
+        self.abstracts = {}
+        for listing in glob.glob(os.path.join(self.store.root, "*.json")):
+            try:
+                with open(listing, encoding="utf-8") as f:
+                    for doc in json.load(f):
+                        if isinstance(doc, dict) and doc.get("document_number") and doc.get("abstract"):
+                            self.abstracts[doc["document_number"]] = doc["abstract"]
+            except (ValueError, OSError):
+                continue
+
+    def body(self, link, limit=MAX_BODY_CHARS):
+        number = fr_document_number(link)
+        if not number:
+            return ""
+        raw = self.store.get(number) if self.store.has(number) else None
+        return " ".join(filter(None, [self.abstracts.get(number), (raw or "")[:limit]]))
+
+
+def _row_hash(values):
+    return hashlib.sha1("\x1f".join(values).encode("utf-8")).hexdigest()
+
+
+class SearchIndex:
+    """모든 보관 CSV를 대상으로 한 디스크 역색인 (SQLite) + BM25 검색
+
+    - 문서: 제목(여러 열) + 관보 문서는 보관해 둔 초록/원문까지
+    - refresh(): 파일 크기/수정 시각이 바뀐 파일만 다시 읽음. 끝에 행만 붙은 파일은 붙은 부분만 읽고,
+      다시 쓴 파일은 행 해시를 비교해 바뀐 행만 색인을 갱신 (검색 시 바뀌지 않은 CSV는 열지 않음)
+    - search(): 질의어의 색인 목록만 읽어 BM25 점수 계산, 출처/기관/종류/기간 필터
+    """
+
+    def __init__(self, path=None, archive_dir=None):
+        self.path = path or cache_path("search_index.sqlite3")
+        self.archive_dir = archive_dir or ARCHIVE_DIR
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.path, check_same_thread=False)
+        self._db.executescript("""
+            CREATE TABLE IF NOT EXISTS files (
+                name TEXT PRIMARY KEY, size INTEGER, mtime_ns INTEGER, header TEXT,
+                prefix_sha1 TEXT, indexed_at REAL
+            );
+            CREATE TABLE IF NOT EXISTS docs (
+                id INTEGER PRIMARY KEY, file TEXT NOT NULL, doc_key TEXT NOT NULL, row_hash TEXT,
+                source TEXT, title TEXT, date TEXT, agency TEXT, type TEXT, link TEXT, length INTEGER,
+                UNIQUE (file, doc_key)
+            );
+            CREATE TABLE IF NOT EXISTS postings (
+                term TEXT NOT NULL, doc_id INTEGER NOT NULL, tf INTEGER NOT NULL,
+                PRIMARY KEY (term, doc_id)
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS idx_postings_doc ON postings(doc_id);
+            CREATE INDEX IF NOT EXISTS idx_docs_source_date ON docs(source, date);
+            CREATE INDEX IF NOT EXISTS idx_docs_date ON docs(date);
+        """)
+        self._db.commit()
+        self._extras = None
+        self.stats = {"files_checked": 0, "files_read": 0, "rows_added": 0, "rows_updated": 0,
+                      "rows_removed": 0, "queries": 0}
+
+    # -- 보관 파일 읽기 ---------------------------------------------------------
+
+    def _archive_files(self):
+        for pattern, archive in ARCHIVES.items():
+            for path in sorted(glob.glob(os.path.join(self.archive_dir, pattern))):
+                yield os.path.basename(path), path, archive
+
+    def _fr_extras(self):
+        if self._extras is None:
+            self._extras = FRBodies()
+        return self._extras
+
+    def _document(self, archive, row):
+        """CSV 행 → (키, 행 해시, 필드 dict, 제목 토큰, 본문 토큰)"""
+        titles = [row.get(col) or "" for col in archive.titles]
+        title = " / ".join(dict.fromkeys(t.strip() for t in titles if t and t.strip()))
+        link = (row.get(archive.link) or "").strip() if archive.link else ""
+        key = (row.get(archive.key) or "").strip() if archive.key else ""
+        key = key or link or title
+        raw_date = row.get(archive.date) if archive.date else None
+        date = normalize_date(raw_date, default=None) or normalize_date(title, default=None)
+        fields = {
+            "source": archive.source, "title": title, "date": date, "link": link,
+            "agency": (row.get(archive.agency) or "").strip() if archive.agency else "",
+            "type": (row.get(archive.type) or "").strip() if archive.type else "",
+        }
+
+        body = " ".join(filter(None, [(row.get(archive.body) or "").strip() if archive.body else "",
+                                      self._fr_extras().body(link) if fr_document_number(link) else ""]))
+        values = [title, fields["date"] or "", fields["agency"], fields["type"], link, str(len(body))]
+        return key, _row_hash(values), fields, tokenize(title), tokenize(body)
+
+    # -- 색인 갱신 -------------------------------------------------------------
+
+    def _remove(self, doc_ids):
+        for doc_id in doc_ids:
+            self._db.execute("DELETE FROM postings WHERE doc_id = ?", (doc_id,))
+            self._db.execute("DELETE FROM docs WHERE id = ?", (doc_id,))
+
+    def _upsert(self, name, document):
+        key, row_hash, fields, title_tokens, body_tokens = document
+        existing = self._db.execute("SELECT id, row_hash FROM docs WHERE file = ? AND doc_key = ?",
+                                    (name, key)).fetchone()
+        if existing and existing[1] == row_hash:
+            return None
+        if existing:
+            self._remove([existing[0]])
+        tf = Counter(body_tokens)
+        for token in title_tokens:
+            tf[token] += TITLE_WEIGHT
+        cur = self._db.execute("""
+            INSERT INTO docs (file, doc_key, row_hash, source, title, date, agency, type, link, length)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, (name, key, row_hash, fields["source"], fields["title"], fields["date"], fields["agency"],
+              fields["type"], fields["link"], sum(tf.values())))
+        self._db.executemany("INSERT INTO postings VALUES (?, ?, ?)",
+                             [(term, cur.lastrowid, count) for term, count in tf.items()])
+        return "updated" if existing else "added"
+
+    def _index_file(self, name, path, archive, state, stat):
+        with open(path, "rb") as f:
+            content = f.read()
+        prefix_ok = state and stat.st_size > state[0] and \
+            hashlib.sha1(content[:state[0]]).hexdigest() == state[3]
+        if prefix_ok and state[2]:
+            # 끝에 행만 추가된 경우: 추가된 부분만 색인
+            header = json.loads(state[2])
+            rows = list(csv.DictReader(content[state[0]:].decode("utf-8", errors="replace").splitlines(),
+                                       fieldnames=header))
+            seen = None
+        else:
+            reader = csv.DictReader(content.decode("utf-8-sig", errors="replace").splitlines())
+            rows = list(reader)
+            header = reader.fieldnames or []
+            seen = set()
+
+        for row in rows:
+            document = self._document(archive, row)
+            if seen is not None:
+                if document[0] in seen:
+                    continue
+                seen.add(document[0])
+            result = self._upsert(name, document)
+            if result:
+                self.stats[f"rows_{result}"] += 1
+
+        if seen is not None:
+            stale = [doc_id for doc_id, key in self._db.execute("SELECT id, doc_key FROM docs WHERE file = ?", (name,))
+                     if key not in seen]
+            self._remove(stale)
+            self.stats["rows_removed"] += len(stale)
+        self._db.execute("INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?, ?)",
+                         (name, stat.st_size, stat.st_mtime_ns, json.dumps(header, ensure_ascii=False),
+                          hashlib.sha1(content).hexdigest(), time.time()))
+        self.stats["files_read"] += 1
+
+    def refresh(self, full=False):
+        """바뀐 보관 파일만 색인에 반영 (full=True면 색인을 비우고 전부 다시 읽음)"""
+        with self._lock, self._db:
+            if full:
+                self._db.executescript("DELETE FROM postings; DELETE FROM docs; DELETE FROM files;")
+            present = set()
+            for name, path, archive in self._archive_files():
+                present.add(name)
+                stat = os.stat(path)
+                self.stats["files_checked"] += 1
+                state = self._db.execute("SELECT size, mtime_ns, header, prefix_sha1 FROM files WHERE name = ?",
+                                         (name,)).fetchone()
+                if state and state[0] == stat.st_size and state[1] == stat.st_mtime_ns:
+                    continue
+                self._index_file(name, path, archive, state, stat)
+            # 사라진 파일의 문서 정리
+            for (name,) in self._db.execute("SELECT name FROM files").fetchall():
+                if name not in present:
+                    self._remove([row[0] for row in self._db.execute("SELECT id FROM docs WHERE file = ?", (name,))])
+                    self._db.execute("DELETE FROM files WHERE name = ?", (name,))
+        return self.stats
+
+    # -- 검색 -----------------------------------------------------------------
+
+    def search(self, query, limit=20, source=None, agency=None, doc_type=None, since=None, until=None):
+        """BM25 상위 limit건 → [dict(score, source, title, date, agency, type, link)]"""
+        terms = Counter(tokenize(query))
+        if not terms:
+            return []
+        self.stats["queries"] += 1
+        with self._lock:
+            total, avg_length = self._db.execute("SELECT COUNT(*), AVG(length) FROM docs").fetchone()
+            if not total:
+                return []
+
+            allowed = None
+            conditions, params = [], []
+            if source:
+                conditions.append("source = ?"); params.append(source)
+            if agency:
+                conditions.append("agency LIKE ?"); params.append(f"%{agency}%")
+            if doc_type:
+                conditions.append("type LIKE ?"); params.append(f"%{doc_type}%")
+            if since:
+                conditions.append("date >= ?"); params.append(normalize_date(since, default=since))
+            if until:
+                conditions.append("date <= ?"); params.append(normalize_date(until, default=until))
+            if conditions:
+                allowed = {row[0] for row in self._db.execute(
+                    f"SELECT id FROM docs WHERE {' AND '.join(conditions)}", params)}
+                if not allowed:
+                    return []
+
+            scores = Counter()
+            for term, query_tf in terms.items():
+                postings = self._db.execute("""
+                    SELECT p.doc_id, p.tf, d.length FROM postings p JOIN docs d ON d.id = p.doc_id WHERE p.term = ?
+                """, (term,)).fetchall()
+                if not postings:
+                    continue
+                idf = math.log(1 + (total - len(postings) + 0.5) / (len(postings) + 0.5))
+                for doc_id, tf, length in postings:
+                    if allowed is not None and doc_id not in allowed:
+                        continue
+                    scores[doc_id] += query_tf * idf * tf * (K1 + 1) / (tf + K1 * (1 - B + B * length / avg_length))
+
+            results = []
+            for doc_id, score in scores.most_common(limit):
+                row = self._db.execute("SELECT source, title, date, agency, type, link FROM docs WHERE id = ?",
+                                       (doc_id,)).fetchone()
+                results.append(dict(zip(("source", "title", "date", "agency", "type", "link"), row),
+                                    score=round(score, 3)))
+        return results
+
+    def report(self):
+        s = self.stats
+        docs = self._db.execute("SELECT COUNT(*) FROM docs").fetchone()[0]
+        print(f"🗂️ 검색 색인: 문서 {docs}건 | 파일 확인 {s['files_checked']}개 (다시 읽음 {s['files_read']}개) | "
+              f"추가 {s['rows_added']}건 / 갱신 {s['rows_updated']}건 / 삭제 {s['rows_removed']}건")
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+_shared = None
+_shared_lock = threading.Lock()
+
+def get_search_index():
+    """프로세스 전체에서 하나의 검색 색인을 공유"""
+    global _shared
+    with _shared_lock:
+        if _shared is None:
+            _shared = SearchIndex()
+        return _shared
@@ -0,0 +1,246 @@
+import asyncio
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import namedtuple
+from cache_paths import cache_path
+from http_client import get_http_client
+from instrumentation import stage
+
+MODEL = os.environ.get("SUMMARY_MODEL", "allenai/OLMo-7B-Instruct")
+# 로컬 대역 서버나 자체 추론 서버를 쓸 때는 SUMMARY_API_URL로 주소만 바꾸면 됨 ({model} 자리에 모델명)
+API_URL = os.environ.get("SUMMARY_API_URL", "https://api-inference.huggingface.co/models/{model}")
+MAX_CONCURRENCY = int(os.environ.get("SUMMARY_CONCURRENCY", "4"))   # 동시에 보낼 요청 수
+BATCH_SIZE = int(os.environ.get("SUMMARY_BATCH_SIZE", "4"))         # 요청 1회에 묶을 기사 수
+MAX_NEW_TOKENS = 400
+RETRIES = 3               # 모델 로딩(503)/과부하(429) 시 재시도 횟수
+RETRY_STATUS = (429, 500, 502, 503, 504)
+MAX_WAIT = 30.0           # 503 응답의 estimated_time을 따르되 이보다 오래 기다리지는 않음
+TIMEOUT = (10, 120)
+MAX_ENTRIES = 20000       # 디스크 캐시 최대 보관 건수
+
+# 답변은 JSON 객체 하나로만 받음 (문자열 표식으로 자르지 않음)
+PROMPT_TEMPLATE = (
+    "당신은 ICT 산업 분석가입니다. 다음 영문 뉴스의 제목을 한국어로 번역하고, 핵심 내용을 한국어 3줄로 요약하세요.\n"
+    "반드시 아래 형식의 JSON 객체 하나만 출력하고 다른 말은 쓰지 마세요.\n"
+    '{{"title_ko": "번역한 제목", "summary": ["요약 1", "요약 2", "요약 3"]}}\n\n'
+    "내용: {text}\n"
+)
+TEMPLATE_ID = hashlib.sha1(PROMPT_TEMPLATE.encode("utf-8")).hexdigest()[:12]
+
+Summary = namedtuple("Summary", "title_ko summary")
+
+
+def _key(model, template_id, text):
+    return hashlib.sha1(f"{model}\x1f{template_id}\x1f{text}".encode("utf-8")).hexdigest()
+
+
+def parse_output(text):
+    """모델 답변에서 첫 JSON 객체를 찾아 Summary로 (형식이 어긋나면 None)"""
+    decoder = json.JSONDecoder()
+    start = (text or "").find("{")
+    while start >= 0:
+        try:
+            value, _ = decoder.raw_decode(text, start)
+        except ValueError:
+            start = text.find("{", start + 1)
+            continue
+        if not isinstance(value, dict):
+            return None
+        title = value.get("title_ko")
+        summary = value.get("summary")
+        if isinstance(summary, list):
+            summary = "\n".join(str(line).strip() for line in summary if str(line).strip())
+        if isinstance(title, str) and title.strip() and isinstance(summary, str) and summary.strip():
+            return Summary(title.strip(), summary.strip())
+        return None
+    return None
+
+
+class HFInferenceBackend:
+    """Hugging Face Inference API(text-generation) 호출 - inputs에 프롬프트 목록을 넣어 여러 건을 한 번에 요청"""
+
+    max_batch = BATCH_SIZE
+
+    def __init__(self, model=MODEL, api_url=API_URL, token=None, max_batch=None):
+        self.model = model
+        self.url = api_url.format(model=model)
+        self.token = token if token is not None else os.getenv("HF_TOKEN")
+        if max_batch:
+            self.max_batch = max_batch
+
+    def generate(self, prompts):
+        """프롬프트 목록 → 생성 텍스트 목록 (입력 순서 그대로, 재시도 후에도 실패하면 예외)"""
+        headers = {"Authorization": f"Bearer {self.token}"} if self.token else {}
+        payload = {"inputs": prompts if len(prompts) > 1 else prompts[0],
+                   "parameters": {"max_new_tokens": MAX_NEW_TOKENS, "return_full_text": False},
+                   "options": {"wait_for_model": False}}
+        for attempt in range(RETRIES + 1):
+            res = get_http_client().post(self.url, headers=headers, json=payload, timeout=TIMEOUT)
+            if res.status_code == 200:
+                break
+            if res.status_code not in RETRY_STATUS or attempt == RETRIES:
+                raise ValueError(f"HTTP {res.status_code}: {res.text[:200]}")
+            try:
+                wait = float(res.json().get("estimated_time", 0))
+            except (ValueError, AttributeError):
+                wait = 0.0
+            time.sleep(min(MAX_WAIT, max(wait, 2 ** attempt)))
+        data = res.json()
+        if len(prompts) == 1:
+            data = [data]
+        outputs = []
+        for item in data:
+            # 배치 응답은 프롬프트마다 [{"generated_text": ...}] 또는 {"generated_text": ...}
+            if isinstance(item, list):
+                item = item[0] if item else {}
+            outputs.append(item.get("generated_text", "") if isinstance(item, dict) else "")
+        if len(outputs) != len(prompts):
+            raise ValueError(f"응답 {len(outputs)}건 ≠ 요청 {len(prompts)}건")
+        return outputs
+
+
+class Summarizer:
+    """번역 제목 + 3줄 요약을 만드는 공용 요약기
+
+    - (모델, 프롬프트 템플릿, 입력) 해시로 디스크 캐시 → 같은 기사를 다시 돌리면 원격 호출 0회
+    - 캐시에 없는 기사만 backend.max_batch개씩 묶어, 최대 max_concurrency개 요청을 동시에 보냄
+    - 답변은 JSON 객체로 받아 검증하고, 묶음 중 형식이 어긋난 기사는 한 건씩 다시 요청 (요청 실패는 재요청 안 함)
+    - 실패한 기사는 None (캐시에 남기지 않으므로 다음 실행에서 다시 시도)
+    """
+
+    def __init__(self, backend=None, path=None, max_concurrency=MAX_CONCURRENCY, max_entries=MAX_ENTRIES):
+        self.backend = backend or HFInferenceBackend()
+        self.path = path or cache_path("summaries.sqlite3")
+        self.max_concurrency = max(1, max_concurrency)
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.path, check_same_thread=False)
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS summaries (
+                key TEXT PRIMARY KEY, model TEXT, template TEXT, source_text TEXT,
+                title_ko TEXT, summary TEXT, last_used REAL
+            )
+        """)
+        self._db.execute("CREATE INDEX IF NOT EXISTS idx_summaries_last_used ON summaries(last_used)")
+        self._db.commit()
+        self.stats = {"requested": 0, "cache_hits": 0, "run_duplicates": 0,
+                      "network_calls": 0, "network_texts": 0, "retried_single": 0, "failures": 0}
+
+    def summarize(self, text):
+        return self.summarize_many([text])[0]
+
+    def summarize_many(self, texts):
+        """입력 순서 그대로 Summary(또는 실패 시 None) 리스트 반환 (이미 이벤트 루프 안이면 asummarize_many 사용)"""
+        return asyncio.run(self.asummarize_many(texts))
+
+    async def asummarize_many(self, texts):
+        with stage("summarize"):
+            texts = [(text or "").strip() for text in texts]
+            results, pending = self._lookup(texts)
+            if pending:
+                semaphore = asyncio.Semaphore(self.max_concurrency)
+                size = max(1, getattr(self.backend, "max_batch", 1))
+                batches = [pending[i:i + size] for i in range(0, len(pending), size)]
+                done = await asyncio.gather(*(self._run_batch(batch, semaphore) for batch in batches))
+                self._store([pair for pairs in done for pair in pairs], results)
+                self._evict()
+            return [results.get(text) for text in texts]
+
+    def _lookup(self, texts):
+        results, pending = {}, []
+        with self._lock:
+            self.stats["requested"] += len(texts)
+            now = time.time()
+            for text in texts:
+                if text in results or text in pending:
+                    if text: self.stats["run_duplicates"] += 1
+                    continue
+                if not text:
+                    results[text] = None
+                    continue
+                key = _key(self.backend.model, TEMPLATE_ID, text)
+                row = self._db.execute("SELECT title_ko, summary FROM summaries WHERE key = ?", (key,)).fetchone()
+                if row:
+                    results[text] = Summary(*row)
+                    self.stats["cache_hits"] += 1
+                    self._db.execute("UPDATE summaries SET last_used = ? WHERE key = ?", (now, key))
+                else:
+                    pending.append(text)
+            self._db.commit()
+        return results, pending
+
+    async def _generate(self, batch, semaphore):
+        async with semaphore:
+            self.stats["network_calls"] += 1
+            self.stats["network_texts"] += len(batch)
+            prompts = [PROMPT_TEMPLATE.format(text=text) for text in batch]
+            return await asyncio.to_thread(self.backend.generate, prompts)
+
+    async def _run_batch(self, batch, semaphore):
+        """묶음 1회 요청 → [(원문, Summary 또는 None)], 형식이 어긋난 기사만 개별 재요청
+
+        요청 자체가 실패하면(재시도 후에도 429/503 등) 묶음 전체를 실패로 둠 - 한 건씩 다시 보내면
+        서버 장애 중에 기사마다 재시도·대기를 처음부터 되풀이하게 됨
+        """
+        try:
+            parsed = [parse_output(output) for output in await self._generate(batch, semaphore)]
+        except Exception as e:
+            print(f"   - 요약 요청 실패 ({e}) → {len(batch)}건은 다음 실행에서 다시 시도")
+            return [(text, None) for text in batch]
+        if len(batch) > 1:
+            for i, text in enumerate(batch):
+                if parsed[i] is None:
+                    self.stats["retried_single"] += 1
+                    parsed[i] = (await self._run_batch([text], semaphore))[0][1]
+        return list(zip(batch, parsed))
+
+    def _store(self, pairs, results):
+        with self._lock:
+            now = time.time()
+            for text, summary in pairs:
+                results[text] = summary
+                if summary is None:
+                    self.stats["failures"] += 1
+                    continue
+                self._db.execute("INSERT OR REPLACE INTO summaries VALUES (?, ?, ?, ?, ?, ?, ?)",
+                                 (_key(self.backend.model, TEMPLATE_ID, text), self.backend.model, TEMPLATE_ID,
+                                  text, summary.title_ko, summary.summary, now))
+            self._db.commit()
+
+    def _evict(self):
+        with self._lock:
+            count = self._db.execute("SELECT COUNT(*) FROM summaries").fetchone()[0]
+            if count > self.max_entries:
+                self._db.execute("""
+                    DELETE FROM summaries WHERE key IN (
+                        SELECT key FROM summaries ORDER BY last_used ASC LIMIT ?
+                    )
+                """, (count - self.max_entries,))
+                self._db.commit()
+
+    def report(self):
+        s = self.stats
+        hit_ratio = s["cache_hits"] / s["requested"] if s["requested"] else 0.0
+        print(f"📝 요약 캐시: 요청 {s['requested']}건 | 캐시 적중 {s['cache_hits']}건 ({hit_ratio:.0%}) | "
+              f"원격 호출 {s['network_calls']}회 ({s['network_texts']}건, 개별 재요청 {s['retried_single']}건) | "
+              f"실패 {s['failures']}건")
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+_shared = None
+_shared_lock = threading.Lock()
+
+def get_summarizer():
+    """프로세스 전체에서 하나의 요약기를 공유"""
+    global _shared
+    with _shared_lock:
+        if _shared is None:
+            _shared = Summarizer()
+        return _shared
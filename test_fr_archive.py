@@ -0,0 +1,30 @@
+import os
+import tempfile
+import fr_archive
+from fr_archive import load_archive, split_agencies
+
+TRADE_REPRESENTATIVE = "Trade Representative, Office of United States"
+
+
+def test_split_keeps_comma_agency_whole():
+    assert split_agencies(TRADE_REPRESENTATIVE) == [TRADE_REPRESENTATIVE]
+    assert split_agencies(f"Commerce Department, {TRADE_REPRESENTATIVE}, Commerce Department") == [
+        "Commerce Department", TRADE_REPRESENTATIVE]
+    assert split_agencies("Justice Department, Drug Enforcement Administration") == [
+        "Justice Department", "Drug Enforcement Administration"]
+    assert split_agencies("") == []
+
+
+def test_archive_agencies_and_filter(monkeypatch):
+    with tempfile.TemporaryDirectory() as directory:
+        monkeypatch.setattr(fr_archive, "cache_path", lambda name: os.path.join(directory, name))
+        with open(os.path.join(directory, "fr.csv"), "w", encoding="utf-8-sig") as f:
+            f.write("발행일,발행부처,문서종류,제목(영문)\n"
+                    f'2025-03-01,"{TRADE_REPRESENTATIVE}",Notice,Tariff hearing\n'
+                    f'2025-03-02,"Commerce Department, {TRADE_REPRESENTATIVE}",Rule,Steel\n'
+                    "2025-03-03,Commerce Department,Notice,Census\n")
+        archive = load_archive("fr.csv", directory)
+        assert "Trade Representative" not in archive.agencies
+        assert "Office of United States" not in archive.agencies
+        assert dict(archive.agency_counts()) == {TRADE_REPRESENTATIVE: 2, "Commerce Department": 2}
+        assert archive.filter(agency="Office of United States").num_rows == 2
@@ -0,0 +1,174 @@
+import hashlib
+import sqlite3
+import threading
+import time
+from cache_paths import cache_path
+from instrumentation import stage
+
+MAX_ENTRIES = 50000      # 디스크 캐시 최대 보관 건수 (초과 시 오래 안 쓴 것부터 삭제)
+BATCH_SIZE = 25          # 요청 1회에 묶어 보낼 최대 제목 수
+BATCH_CHARS = 4000       # 요청 1회 최대 글자 수 (구글 번역 5,000자 제한 여유분)
+SEPARATOR = "\n"
+
+
+def _key(text, src, dest):
+    return hashlib.sha1(f"{src}\x1f{dest}\x1f{text}".encode("utf-8")).hexdigest()
+
+
+class TranslationMemory:
+    """googletrans 호출을 디스크 캐시 + 실행 내 중복 제거 + 묶음 요청으로 감싼 공용 번역기"""
+
+    def __init__(self, path=None, max_entries=MAX_ENTRIES, translator=None,
+                 batch_size=BATCH_SIZE, batch_chars=BATCH_CHARS):
+        self.path = path or cache_path("translation_memory.sqlite3")
+        self.max_entries = max_entries
+        self.batch_size = batch_size
+        self.batch_chars = batch_chars
+        self._translator = translator
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.path, check_same_thread=False)
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS translations (
+                key TEXT PRIMARY KEY, src TEXT, dest TEXT,
+                source_text TEXT, translated TEXT, last_used REAL
+            )
+        """)
+        self._db.execute("CREATE INDEX IF NOT EXISTS idx_translations_last_used ON translations(last_used)")
+        self._db.commit()
+        self.stats = {"requested": 0, "cache_hits": 0, "run_duplicates": 0,
+                      "network_calls": 0, "network_texts": 0, "failures": 0}
+
+    @property
+    def translator(self):
+        if self._translator is None:
+            from googletrans import Translator
+            self._translator = Translator()
+        return self._translator
+
+    def translate(self, text, dest="ko", src="auto", pause=0.0):
+        return self.translate_many([text], dest=dest, src=src, pause=pause)[0]
+
+    def translate_many(self, texts, dest="ko", src="auto", pause=0.0):
+        """입력 순서 그대로 번역문 리스트 반환 (실패한 제목은 원문 그대로)
+
+        pause는 실제 네트워크 요청 뒤에만 쉬는 시간이며 캐시 적중 시에는 건너뜁니다.
+        """
+        with stage("translate"):
+            texts = list(texts)
+            results = {}
+            pending, pending_set = [], set()
+            with self._lock:
+                self.stats["requested"] += len(texts)
+                now = time.time()
+                for text in texts:
+                    clean = (text or "").strip()
+                    if clean in results or clean in pending_set:
+                        if clean: self.stats["run_duplicates"] += 1
+                        continue
+                    if not clean:
+                        results[clean] = clean
+                        continue
+                    row = self._db.execute("SELECT translated FROM translations WHERE key = ?",
+                                           (_key(clean, src, dest),)).fetchone()
+                    if row:
+                        results[clean] = row[0]
+                        self.stats["cache_hits"] += 1
+                        self._db.execute("UPDATE translations SET last_used = ? WHERE key = ?",
+                                         (now, _key(clean, src, dest)))
+                    else:
+                        pending.append(clean)
+                        pending_set.add(clean)
+                self._db.commit()
+
+            for batch in self._batches(pending):
+                translated = self._translate_batch(batch, src, dest)
+                if pause: time.sleep(pause) # 번역 API 차단 방지 (네트워크 요청 시에만)
+                with self._lock:
+                    for original, result in zip(batch, translated):
+                        if result is None:
+                            self.stats["failures"] += 1
+                            results[original] = original
+                            continue
+                        results[original] = result
+                        self._db.execute(
+                            "INSERT OR REPLACE INTO translations VALUES (?, ?, ?, ?, ?, ?)",
+                            (_key(original, src, dest), src, dest, original, result, time.time()))
+                    self._db.commit()
+
+            if pending:
+                self._evict()
+            return [results[(text or "").strip()] for text in texts]
+
+    def _batches(self, texts):
+        batch, size = [], 0
+        for text in texts:
+            if batch and (len(batch) >= self.batch_size or size + len(text) > self.batch_chars):
+                yield batch
+                batch, size = [], 0
+            batch.append(text)
+            size += len(text) + len(SEPARATOR)
+        if batch:
+            yield batch
+
+    def _call(self, text, src, dest):
+        self.stats["network_calls"] += 1
+        return self.translator.translate(text, src=src, dest=dest).text
+
+    def _translate_batch(self, batch, src, dest):
+        """여러 제목을 줄바꿈으로 이어 1회 요청, 줄 수가 어긋나면 한 건씩 재시도"""
+        lines = [text.replace("\n", " ") for text in batch]
+        self.stats["network_texts"] += len(lines)
+        if len(lines) > 1:
+            try:
+                parts = self._call(SEPARATOR.join(lines), src, dest).split(SEPARATOR)
+                if len(parts) == len(lines):
+                    return [part.strip() for part in parts]
+            except Exception as e:
+                print(f"   - 묶음 번역 실패, 개별 번역으로 전환 ({e})")
+        results = []
+        for line in lines:
+            try:
+                results.append(self._call(line, src, dest))
+            except Exception as e:
+                print(f"   - 번역 실패 ({e})")
+                results.append(None)
+        return results
+
+    def _evict(self):
+        with self._lock:
+            count = self._db.execute("SELECT COUNT(*) FROM translations").fetchone()[0]
+            if count > self.max_entries:
+                self._db.execute("""
+                    DELETE FROM translations WHERE key IN (
+                        SELECT key FROM translations ORDER BY last_used ASC LIMIT ?
+                    )
+                """, (count - self.max_entries,))
+                self._db.commit()
+
+    def summary(self):
+        """캐시 적중률과 절약한 네트워크 요청 수"""
+        s = dict(self.stats)
+        s["hit_ratio"] = s["cache_hits"] / s["requested"] if s["requested"] else 0.0
+        s["network_calls_saved"] = s["requested"] - s["network_calls"]
+        return s
+
+    def report(self):
+        s = self.summary()
+        print(f"🈂️ 번역 메모리: 요청 {s['requested']}건 | 캐시 적중 {s['cache_hits']}건 ({s['hit_ratio']:.0%}) | "
+              f"실행 내 중복 {s['run_duplicates']}건 | 네트워크 {s['network_calls']}회 (절약 {s['network_calls_saved']}회)")
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+_shared = None
+_shared_lock = threading.Lock()
+
+def get_translation_memory():
+    """프로세스 전체에서 하나의 번역 메모리를 공유"""
+    global _shared
+    with _shared_lock:
+        if _shared is None:
+            _shared = TranslationMemory()
+        return _shared
@@ -1,85 +1,132 @@
-import requests
-import csv
-import time
+import argparse
+import json
+import os
+from datetime import date, timedelta
+from article_store import get_article_store
+from cache_paths import cache_path
+from fr_backfill import BackfillIncomplete, FederalRegisterBackfill
+from http_client import get_http_client
+from instrumentation import add_profile_arg, collector_run, stage
 
-def fetch_us_data():
-    results = []
-    # 중복 수집을 방지하기 위한 장치
-    seen_documents = set()
-    
-    # 관심 있는 문서 유형: 대통령 문서, 규칙, 규칙예고, 공고
-    doc_types = ["PRESDOCU", "RULE", "PRORULE", "NOTICE"]
-    
-    print("🇺🇸 [미국 관보 2025] 데이터 전수 조사 재시작...")
+# 관심 있는 문서 유형: 대통령 문서, 규칙, 규칙예고, 공고
+DOC_TYPES = ["PRESDOCU", "RULE", "PRORULE", "NOTICE"]
+FIELDS = ["title", "publication_date", "type", "agency_names", "html_url", "document_number"]
 
-    # 1월부터 12월까지 순차적으로 접근 (API 부하 분산)
-    for month in range(1, 13):
-        start_date = f"2025-{month:02d}-01"
-        if month == 12:
-            end_date = "2025-12-31"
-        else:
-            end_date = f"2025-{month+1:02d}-01"
-            
-        print(f"\n📅 분석 구간: {start_date} ~ {end_date}")
-        
-        page = 1
-        while True:
-            api_url = "https://www.federalregister.gov/api/v1/documents.json"
-            params = {
-                "conditions[publication_date][gte]": start_date,
-                "conditions[publication_date][lt]": end_date,
-                "conditions[type][]": doc_types,
-                "per_page": 100,  # 한 번에 100개씩 안전하게
-                "page": page,
-                "fields[]": ["title", "publication_date", "type", "agency_names", "html_url", "document_number"]
-            }
+FILE_NAME = 'Federal_Register_2025_Master.csv'
+SOURCE = "Federal Register"
+# CSV 열 이름 → 기사 저장소 필드 (CSV는 저장소에서 만들어지는 내보내기 파일)
+EXPORT_COLUMNS = {"발행일": "published", "부처": "부처", "종류": "종류", "제목": "title",
+                  "원문링크": "link", "문서번호": "문서번호"}
+YEAR_START, YEAR_END = "2025-01-01", "2026-01-01"   # 수집 구간 [시작, 끝)
+OVERLAP_DAYS = 3   # 늦게 올라오는 정정/추가 문서를 잡기 위해 워터마크 이전 며칠을 다시 조회
+STATE_FILE = "fr_master_2025_state.json"
 
-            try:
-                # 15초 안에 응답 없으면 다시 시도하도록 설정
-                response = requests.get(api_url, params=params, timeout=15)
-                
-                if response.status_code != 200:
-                    print(f"⚠️ {page}페이지 응답 오류 (코드: {response.status_code})")
-                    break
-                
-                data = response.json()
-                docs = data.get('results', [])
-                
-                if not docs: # 해당 월의 데이터가 끝났으면 다음 달로
-                    break
+def to_article(doc):
+    agencies = doc.get('agency_names', [])
+    return {
+        "source": SOURCE,
+        "published": doc.get('publication_date'),
+        "부처": ", ".join(agencies) if agencies else "White House",
+        "종류": doc.get('type'),
+        "title": doc.get('title'),
+        "link": doc.get('html_url'),
+        "문서번호": doc.get('document_number')
+    }
 
-                # 진행 상황 실시간 출력 (대표님이 로그에서 보실 내용)
-                print(f"📥 {month}월 수집 중... ({page}페이지 / 누적: {len(results)}건)", end="\r", flush=True)
+def document_number_of(article):
+    """문서번호 열이 없던 예전 파일은 원문링크(/documents/yyyy/mm/dd/<번호>/...)에서 복원"""
+    if article.get("문서번호"):
+        return article["문서번호"]
+    parts = (article.get("link") or "").split("/documents/")[-1].split("/")
+    return parts[3] if len(parts) > 3 else None
 
-                for doc in docs:
-                    doc_id = doc.get('document_number')
-                    if doc_id not in seen_documents:
-                        seen_documents.add(doc_id)
-                        agencies = doc.get('agency_names', [])
-                        results.append({
-                            "발행일": doc.get('publication_date'),
-                            "부처": ", ".join(agencies) if agencies else "White House",
-                            "종류": doc.get('type'),
-                            "제목": doc.get('title'),
-                            "원문링크": doc.get('html_url')
-                        })
-                
-                page += 1
-                time.sleep(0.2) # 미국 서버가 화내지 않게 잠깐씩 쉬어줌
-                
-            except Exception as e:
-                print(f"\n❌ 통신 중 에러 발생: {e}")
-                time.sleep(5) # 에러 시 잠시 대기 후 다음 단계 시도
-                break
-                
-    # 파일 저장
-    if results:
-        file_name = 'Federal_Register_2025_Master.csv'
-        with open(file_name, 'w', newline='', encoding='utf-8-sig') as f:
-            writer = csv.DictWriter(f, fieldnames=["발행일", "부처", "종류", "제목", "원문링크"])
-            writer.writeheader()
-            writer.writerows(results)
-        print(f"\n\n✅ 수집 완료! 총 {len(results)}건의 데이터를 '{file_name}'에 담았습니다.")
+def _with_document_number(article):
+    article["문서번호"] = document_number_of(article)
+    return article if article["문서번호"] else None
+
+def open_archive(file_name=FILE_NAME):
+    """기사 저장소 (CSV에만 있는 행은 먼저 가져옴: 캐시가 비었거나 다른 실행이 CSV를 갱신한 경우)"""
+    store = get_article_store()
+    with stage("load"):
+        imported = store.import_csv(file_name, EXPORT_COLUMNS, SOURCE, transform=_with_document_number)
+    if imported:
+        print(f"   - 기존 CSV {imported}건을 저장소로 옮겼습니다.")
+    return store
+
+def save_archive(store, file_name=FILE_NAME):
+    # 최신 발행일이 위로 오도록 (다른 관보 아카이브와 동일)
+    with stage("write"):
+        return store.export_file(file_name, EXPORT_COLUMNS, source=SOURCE)
+
+def load_watermark(store):
+    """저장된 워터마크 (없으면 저장소의 최신 발행일/문서번호로 대체)"""
+    path = cache_path(STATE_FILE)
+    if os.path.exists(path):
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    latest = store.latest(SOURCE)
+    if latest:
+        return {"publication_date": latest["published"], "document_number": latest.get("문서번호")}
+    return None
+
+def save_watermark(store, failed=()):
+    """저장소의 최신 발행일/문서번호를 워터마크로 저장 (실패 구간이 있으면 그 가장 이른 시작일을 넘지 않음)"""
+    latest = store.latest(SOURCE)
+    if not latest:
+        return
+    mark = {"publication_date": latest["published"], "document_number": latest.get("문서번호")}
+    if failed:
+        earliest = min(start for start, _ in failed)
+        if earliest <= (mark["publication_date"] or ""):
+            # 다음 증분 실행이 실패 구간부터 다시 받도록 워터마크를 그 시작일로 되돌림
+            mark = {"publication_date": earliest, "document_number": None}
+    with open(cache_path(STATE_FILE), 'w', encoding='utf-8') as f:
+        json.dump(mark, f)
+
+def fetch_between(start_date, end_date):
+    """구간 자동 분할 + 동시 요청 백필 엔진으로 [start_date, end_date) 수집 → (문서 목록, 실패 구간 목록)"""
+    engine = FederalRegisterBackfill({"conditions[type][]": DOC_TYPES}, fields=FIELDS)
+    try:
+        return engine.run(start_date, end_date), []
+    except BackfillIncomplete as e:
+        return e.docs, e.failed
+
+def fetch_us_data(full=False):
+    store = open_archive()
+    before = store.count(SOURCE)
+    watermark = None if full or not before else load_watermark(store)
+
+    if watermark:
+        # 🔁 증분 모드: 워터마크 이후(겹침 구간 포함)만 요청
+        since = date.fromisoformat(watermark["publication_date"]) - timedelta(days=OVERLAP_DAYS)
+        start_date = max(since.isoformat(), YEAR_START)
+        print(f"🇺🇸 [미국 관보 2025] 증분 수집: {start_date} 이후 (워터마크 {watermark['publication_date']} / {watermark['document_number']})")
+        docs, failed = fetch_between(start_date, YEAR_END)
+    else:
+        print("🇺🇸 [미국 관보 2025] 데이터 전수 조사 재시작...")
+        docs, failed = fetch_between(YEAR_START, YEAR_END)
+
+    # 원문링크 기준 저장 (같은 문서는 최신 응답으로 갱신, 바뀐 것이 없으면 건드리지 않음)
+    with stage("merge"):
+        added, updated = store.upsert_many(to_article(doc) for doc in docs if doc.get('document_number'))
+
+    # 파일 저장 (저장소에서 다시 내보냄 - 바뀐 것이 있을 때만)
+    total = store.count(SOURCE)
+    if total:
+        if added or updated or not os.path.exists(FILE_NAME):
+            save_archive(store)
+        save_watermark(store, failed)
+        print(f"\n\n✅ 수집 완료! 신규 {added}건, 갱신 {updated}건 → 총 {total}건을 '{FILE_NAME}'에 담았습니다.")
+    get_http_client().report()
+    if failed:
+        # 받은 문서는 저장했지만 빈 구간이 남았으므로 실행은 실패로 보고 (newsbot/워크플로가 알 수 있게)
+        raise SystemExit(f"❌ 받지 못한 구간 {len(failed)}개 (다음 실행에서 {failed[0][0]}부터 다시 수집): "
+                         + ", ".join(f"{s}~{e}" for s, e in failed))
 
 if __name__ == "__main__":
-    fetch_us_data()
+    parser = argparse.ArgumentParser(description="미국 관보 2025 아카이브 동기화")
+    parser.add_argument("--full", action="store_true", help="워터마크를 무시하고 전체 재수집")
+    add_profile_arg(parser)
+    args = parser.parse_args()
+    with collector_run("federal_register"):
+        fetch_us_data(full=args.full)